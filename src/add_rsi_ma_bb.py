@@ -1,6 +1,7 @@
 import pandas as pd
 
 from calculate_rsi import calculate_rsi
+from rolling_time_mean import rolling_time_mean
 
 
 def add_rsi_ma_bb(
@@ -10,6 +11,7 @@ def add_rsi_ma_bb(
     ma_days: list,
     bb_window: int,
     bb_num_std: float,
+    ma_time_based: bool = False,
 ) -> pd.DataFrame:
     """
     Adds RSI, moving averages,and Bollinger bands for each crypto asset.
@@ -24,6 +26,9 @@ def add_rsi_ma_bb(
         RSI lookback period.
     ma_days : list
         List of moving average durations in days.
+    ma_time_based : bool, optional
+        If True, each moving average covers the last N days by time (see
+        rolling_time_mean) instead of the last 1440 * N bars (default is False).
 
     Returns
     -------
@@ -49,10 +54,15 @@ def add_rsi_ma_bb(
 
         # Calc moving averages and shift by 1 row
         for day in ma_days:
-            window = 1440 * day  # 1440 minutes in a day
-            df[f"{ticker}_MA_{day}d"] = (
-                df[f"{ticker}_close"].rolling(window=window, min_periods=1).mean()
-            )
+            if ma_time_based == True:
+                df[f"{ticker}_MA_{day}d"] = rolling_time_mean(
+                    df, [f"{ticker}_close"], f"{day}D"
+                )[f"{ticker}_close"]
+            else:
+                window = 1440 * day  # 1440 minutes in a day
+                df[f"{ticker}_MA_{day}d"] = (
+                    df[f"{ticker}_close"].rolling(window=window, min_periods=1).mean()
+                )
             df[f"{ticker}_MA_{day}d_prev"] = df[f"{ticker}_MA_{day}d"].shift(1)
 
         # ----- Bollinger Bands -----
@@ -0,0 +1,114 @@
+import numpy as np
+import pandas as pd
+
+from rolling_time_mean import rolling_time_mean
+
+
+def add_rsi_ma_bb_vectorized(
+    tickers: list,
+    data: pd.DataFrame,
+    rsi_period: int,
+    ma_days: list,
+    bb_window: int,
+    bb_num_std: float,
+    ma_time_based: bool = False,
+) -> pd.DataFrame:
+    """
+    Adds RSI, moving averages, and Bollinger bands for all crypto assets at once.
+
+    Same output as add_rsi_ma_bb, but the indicators are computed on a 2-D
+    (time x ticker) close matrix, so each RSI, moving average and Bollinger band
+    calculation is a single batched pass over all tickers. The new columns are
+    assembled into one block and joined to the data once instead of being
+    inserted one at a time.
+
+    Parameters
+    ----------
+    tickers : list
+        List of crypto tickers, e.g., ["BTC-USD", "ETH-USD", "SOL-USD"].
+    data : pd.DataFrame
+        DataFrame containing merged price data for all tickers.
+    rsi_period : int
+        RSI lookback period.
+    ma_days : list
+        List of moving average durations in days.
+    bb_window : int
+        Bollinger band lookback window in rows.
+    bb_num_std : float
+        Number of standard deviations for the upper and lower bands.
+    ma_time_based : bool, optional
+        If True, each moving average covers the last N days by time (see
+        rolling_time_mean) instead of the last 1440 * N bars (default is False).
+
+    Returns
+    -------
+    pd.DataFrame
+        DataFrame containing merged data for all tickers with RSI, moving averages,
+        and bollinger bands, with the same columns in the same order as add_rsi_ma_bb.
+    """
+
+    # Close matrix (time x ticker)
+    close_columns = [f"{ticker}_close" for ticker in tickers]
+    close = data[close_columns].set_axis(tickers, axis=1)
+    close_prev = close.shift(1)
+
+    # ----- RSI -----
+    # Same calculation as calculate_rsi, applied to every ticker at once
+    delta = close.diff()
+    gain = delta.clip(lower=0)
+    loss = -delta.clip(upper=0)
+    avg_gain = gain.ewm(alpha=1/rsi_period, adjust=False).mean()
+    avg_loss = loss.ewm(alpha=1/rsi_period, adjust=False).mean()
+    rsi = 100 - (100 / (1 + avg_gain / avg_loss))
+    rsi_prev = rsi.shift(1)
+
+    # ----- Moving Averages -----
+    ma = {}
+    ma_prev = {}
+    for day in ma_days:
+        if ma_time_based == True:
+            ma[day] = rolling_time_mean(data, close_columns, f"{day}D").set_axis(tickers, axis=1)
+        else:
+            window = 1440 * day  # 1440 minutes in a day
+            ma[day] = close.rolling(window=window, min_periods=1).mean()
+        ma_prev[day] = ma[day].shift(1)
+
+    # ----- Bollinger Bands -----
+    rolling = close_prev.rolling(window=bb_window, min_periods=bb_window)
+    bb_mid = rolling.mean()
+    bb_std = rolling.std()
+    bb_upper = bb_mid + (bb_num_std * bb_std)
+    bb_lower = bb_mid - (bb_num_std * bb_std)
+    bb_z = (close_prev - bb_mid) / bb_std
+
+    # Fill one preallocated (column x time) block in the same column order as
+    # add_rsi_ma_bb, so that each column is contiguous and no copy is needed
+    names = []
+    arrays = []
+    for ticker in tickers:
+        names += [f"{ticker}_close_prev", f"{ticker}_RSI", f"{ticker}_RSI_prev"]
+        arrays += [close_prev[ticker], rsi[ticker], rsi_prev[ticker]]
+        for day in ma_days:
+            names += [f"{ticker}_MA_{day}d", f"{ticker}_MA_{day}d_prev"]
+            arrays += [ma[day][ticker], ma_prev[day][ticker]]
+        names += [
+            f"{ticker}_BB_MID_prev", f"{ticker}_BB_STD_prev", f"{ticker}_BB_UPPER_prev",
+            f"{ticker}_BB_LOWER_prev", f"{ticker}_BB_Z_prev",
+        ]
+        arrays += [bb_mid[ticker], bb_std[ticker], bb_upper[ticker], bb_lower[ticker], bb_z[ticker]]
+
+    values = np.empty((len(names), len(data)), dtype="float64")
+    for row, array in enumerate(arrays):
+        values[row] = array.to_numpy()
+
+    indicators = pd.DataFrame(values.T, index=data.index, columns=names, copy=False)
+
+    # Columns that already exist are replaced in place, as in add_rsi_ma_bb
+    existing = [column for column in indicators.columns if column in data.columns]
+    if existing:
+        df = data.copy()
+        df[existing] = indicators[existing]
+        indicators = indicators.drop(columns=existing)
+        return pd.concat([df, indicators], axis=1)
+
+    return pd.concat([data, indicators], axis=1)
@@ -1,14 +1,21 @@
 import pandas as pd
 
+from trade_buffer import TradeBuffer
 
 def analyze_trades(
-    trades_df: pd.DataFrame,
+    trades_df: pd.DataFrame | TradeBuffer,
     daily_perf_df: pd.DataFrame,
     print_summary: bool,
 ) -> tuple[int, float, float, float, float, float, float, float, float, float, float]:
 
-    # Filter trades to only those that traded an actual position
-    filtered_trades = trades_df[trades_df["quantity"] > 0.01]
+    # Views of the trade buffer, without copying the trades
+    if isinstance(trades_df, TradeBuffer):
+        trades_df = trades_df.to_frame()
+    else:
+        pass
+
+    # Filter trades to only those that traded an actual position (only the columns used below)
+    filtered_trades = trades_df.loc[trades_df["quantity"] > 0.01, ["return", "pnl"]]
 
     total_trades = len(filtered_trades)
     win_rate = len(filtered_trades[filtered_trades["return"] > 0]) / len(
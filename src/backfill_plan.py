@@ -0,0 +1,149 @@
+import numpy as np
+import pandas as pd
+
+# Maximum number of bars returned by one request to each API
+BACKFILL_MAX_BARS = {
+    "coinbase": 300,
+    "polygon": 5000,
+}
+
+def backfill_plan(
+    missing_ranges: dict,
+    granularity: int,
+    max_bars: int,
+    requests_per_second: float,
+    include_checked: bool = False,
+    max_requests: int = None,
+    verbose: bool = True,
+) -> pd.DataFrame:
+
+    """
+    Plan the requests needed to refetch the missing bars of one or more tickers.
+
+    The runs of missing bars of each ticker are coalesced into windows of at most
+    max_bars bars, so nearby holes share one request and a long hole is split
+    into as few requests as possible. The windows are ordered from the most recent
+    to the oldest across all tickers, so if the plan is cut at max_requests the
+    recent gaps are repaired first. The cost of the full repair is reported before
+    anything is fetched.
+
+    Parameters:
+    -----------
+    missing_ranges : dict
+        Dictionary of ticker to its runs of missing bars, either a DataFrame with the
+        columns 'start' and 'end' (and optionally 'checked'), e.g., from gap_index_read,
+        or a list of (start, end) tuples. Both ends of a run are inclusive.
+    granularity : int
+        Length of a bar in seconds (e.g., 60 for minute bars, 3600 for hourly bars).
+    max_bars : int
+        Maximum number of bars per request, e.g., BACKFILL_MAX_BARS["coinbase"] (300)
+        or BACKFILL_MAX_BARS["polygon"] (5000).
+    requests_per_second : float
+        Sustained request rate of the API, used to estimate the time of the repair.
+    include_checked : bool, optional
+        If True, also plan the runs that were already refetched and not available
+        from the source (default is False).
+    max_requests : int, optional
+        Maximum number of requests to plan. The most recent windows are kept (default
+        is None, for no limit).
+    verbose : bool, optional
+        If True, print the cost of the repair (default is True).
+
+    Returns:
+    --------
+    pd.DataFrame
+        DataFrame with one row per request and the columns 'ticker', 'start', 'end' and
+        'missing_count', from the most recent window to the oldest. The cost of the full
+        repair and of the plan is in attrs["summary"].
+    """
+
+    step = np.int64(granularity) * 1_000_000_000  # nanoseconds
+    window_length = (max_bars - 1) * step
+
+    plans = []
+    total_runs = 0
+    for ticker, runs in missing_ranges.items():
+        if not isinstance(runs, pd.DataFrame):
+            runs = pd.DataFrame(list(runs), columns=["start", "end"])
+        if include_checked == False and "checked" in runs.columns:
+            runs = runs[~runs["checked"]]
+        if runs.empty:
+            continue
+
+        runs = runs.sort_values(by="start", kind="mergesort")
+        starts = pd.DatetimeIndex(runs["start"]).as_unit("ns").asi8
+        ends = pd.DatetimeIndex(runs["end"]).as_unit("ns").asi8
+        total_runs += len(runs)
+
+        # Greedily fill each window from its first missing bar with the runs that start inside it;
+        # a run that does not fit is continued in the next window
+        window_starts = []
+        window_ends = []
+        run_number = 0
+        position = starts[0]
+        while run_number < len(starts):
+            window_start = max(position, starts[run_number])
+            window_limit = window_start + window_length
+            last_run = np.searchsorted(starts, window_limit, side="right") - 1
+            window_starts.append(window_start)
+            window_ends.append(min(ends[last_run], window_limit))
+            if ends[last_run] > window_limit:
+                run_number = last_run
+                position = window_limit + step
+            else:
+                run_number = last_run + 1
+
+        # Missing bars in each window, from the missing bars before each timestamp
+        run_lengths = (ends - starts) // step + 1
+        cumulative_missing = np.concatenate([[0], np.cumsum(run_lengths)])
+
+        def missing_before(timestamps):
+            run_numbers = np.searchsorted(starts, timestamps, side="left") - 1
+            after = np.clip((ends[np.maximum(run_numbers, 0)] - timestamps) // step + 1, 0, None)
+            return cumulative_missing[run_numbers + 1] - np.where(run_numbers >= 0, after, 0)
+
+        window_starts = np.array(window_starts, dtype="int64")
+        window_ends = np.array(window_ends, dtype="int64")
+        plans.append(pd.DataFrame({
+            "ticker": ticker,
+            "start": window_starts.view("datetime64[ns]"),
+            "end": window_ends.view("datetime64[ns]"),
+            "missing_count": missing_before(window_ends + step) - missing_before(window_starts),
+        }))
+
+    if plans:
+        plan = pd.concat(plans, ignore_index=True)
+    else:
+        plan = pd.DataFrame({
+            "ticker": pd.Series(dtype="object"),
+            "start": pd.Series(dtype="datetime64[ns]"),
+            "end": pd.Series(dtype="datetime64[ns]"),
+            "missing_count": pd.Series(dtype="int64"),
+        })
+
+    # Most recent gaps first
+    plan = plan.sort_values(by=["end", "ticker"], ascending=[False, True], kind="mergesort").reset_index(drop=True)
+    total_requests = len(plan)
+    total_missing = int(plan["missing_count"].sum())
+    if max_requests is not None:
+        plan = plan.iloc[:max_requests]
+
+    plan.attrs["summary"] = {
+        "tickers": plan["ticker"].nunique(),
+        "runs": total_runs,
+        "missing_bars": total_missing,
+        "requests": total_requests,
+        "planned_requests": len(plan),
+        "planned_missing_bars": int(plan["missing_count"].sum()),
+        "estimated_seconds": len(plan) / requests_per_second,
+    }
+
+    if verbose == True:
+        summary = plan.attrs["summary"]
+        print(f"Full repair: {summary['missing_bars']} missing bars in {summary['runs']} runs, {summary['requests']} requests of up to {max_bars} bars.")
+        print(f"Planned: {summary['planned_requests']} requests for {summary['planned_missing_bars']} missing bars in {summary['tickers']} tickers, "
+              f"about {summary['estimated_seconds']:,.0f} seconds at {requests_per_second:g} requests per second.")
+    else:
+        pass
+
+    return plan
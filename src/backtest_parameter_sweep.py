@@ -0,0 +1,360 @@
+import itertools
+import numpy as np
+import os
+import pandas as pd
+import time
+
+from analyze_trades import analyze_trades
+from backtest_rsi_multi_asset_strategy import backtest_rsi_multi_asset_strategy
+from calculate_rsi import calculate_rsi
+from compute_daily_performance import compute_daily_performance
+from concurrent.futures import ProcessPoolExecutor
+from create_signals_vectorized import create_signals_vectorized
+from multiprocessing import shared_memory
+
+# Default value for each parameter that is not part of the grid or the fixed parameters
+SWEEP_DEFAULTS = {
+    "rsi_period": 14,
+    "rsi_threshold": 30,
+    "trailing_stop_pct": 0.02,
+    "ma_days": [7, 30],
+    "bb_window": 20,
+    "bb_num_std": 2.0,
+    "use_rsi": True,
+    "use_ma": True,
+    "use_bbands": False,
+    "bb_rule": "touch_lower",
+    "order_entry": "market",
+    "trading_fees": False,
+    "trade_taker_fee": 0.0,
+    "trade_maker_fee": 0.0,
+}
+
+# Names of the analyze_trades metrics, in the order they are returned
+SWEEP_METRICS = [
+    "total_trades",
+    "win_rate",
+    "total_return",
+    "average_return_per_trade",
+    "max_trade_gain_return",
+    "max_trade_loss_return",
+    "total_pnl",
+    "average_pnl_per_trade",
+    "max_trade_gain_pnl",
+    "max_trade_loss_pnl",
+    "max_drawdown",
+]
+
+# Indicator arrays attached in each worker process
+_shared = {}
+
+def backtest_parameter_sweep(
+    tickers: list,
+    data: pd.DataFrame,
+    param_grid: dict,
+    initial_capital: float,
+    fixed_params: dict = None,
+    search: str = "grid",
+    n_samples: int = None,
+    random_seed: int = None,
+    max_workers: int = None,
+    chunksize: int = 4,
+    report_performance: bool = False,
+) -> pd.DataFrame:
+
+    """
+    Run backtest_rsi_multi_asset_strategy over a grid or random sample of parameters in a process pool.
+
+    The indicators for every RSI period, moving average length, and Bollinger
+    band window and width in the grid are computed once (with the same
+    calculations as add_rsi_ma_bb) and placed in shared memory together with the
+    prices. Each worker process attaches to the shared arrays without copying
+    them, builds the indicator columns for a parameter set, and runs
+    create_signals_vectorized (which reads the shared arrays without copying
+    them), backtest_rsi_multi_asset_strategy, compute_daily_performance, and
+    analyze_trades. The metrics for all of the parameter sets are collected
+    into one table.
+
+    Parameters:
+    -----------
+    tickers : list
+        List of crypto tickers, e.g., ["BTC-USD", "ETH-USD", "SOL-USD"].
+    data : pd.DataFrame
+        DataFrame containing merged price data for all tickers with a 'Date'
+        column and the open, high, low, and close columns for each ticker.
+    param_grid : dict
+        Dictionary of parameter name to the list of values to try, e.g.,
+        {'rsi_threshold': [25, 30, 35], 'ma_days': [[7], [7, 30]]}. Any key of
+        SWEEP_DEFAULTS can be swept.
+    initial_capital : float
+        Initial capital for the portfolio.
+    fixed_params : dict, optional
+        Parameters used for every run that override SWEEP_DEFAULTS, e.g.,
+        {'trading_fees': True, 'trade_taker_fee': 0.006} (default is None).
+    search : str, optional
+        'grid' to run every combination or 'random' to run a random sample of
+        the combinations (default is 'grid').
+    n_samples : int, optional
+        Number of combinations to run for a random search (default is None).
+    random_seed : int, optional
+        Seed for the random search (default is None).
+    max_workers : int, optional
+        Number of worker processes. If None, the number of CPUs is used. If 1,
+        the runs are done in this process (default is None).
+    chunksize : int, optional
+        Number of parameter sets sent to a worker at a time (default is 4).
+    report_performance : bool, optional
+        If True, print the number of parameter sets run per second (default is False).
+
+    Returns:
+    --------
+    pd.DataFrame
+        DataFrame with one row per parameter set containing the parameters and
+        the analyze_trades metrics (total_trades is 0 and the other metrics are
+        NaN if no trades were made).
+    """
+
+    if search not in ["grid", "random"]:
+        raise Exception(f"Invalid search: {search}. Acceptable searches are: ['grid', 'random'].")
+
+    for name in param_grid:
+        if name not in SWEEP_DEFAULTS:
+            raise Exception(f"Invalid parameter: {name}. Acceptable parameters are: {list(SWEEP_DEFAULTS.keys())}.")
+
+    # Build the parameter sets
+    names = list(param_grid.keys())
+    combinations = list(itertools.product(*[param_grid[name] for name in names]))
+
+    if search == "random":
+        if n_samples is None:
+            raise Exception("n_samples is required for a random search.")
+        rng = np.random.default_rng(random_seed)
+        picks = rng.choice(len(combinations), size=min(n_samples, len(combinations)), replace=False)
+        combinations = [combinations[pick] for pick in sorted(picks)]
+    else:
+        pass
+
+    base_params = {**SWEEP_DEFAULTS, **(fixed_params or {})}
+    param_sets = [{**base_params, **dict(zip(names, combination))} for combination in combinations]
+
+    # Compute every indicator needed by the parameter sets once
+    arrays, dates = _compute_indicators(tickers, data, param_sets)
+
+    # Copy the arrays to shared memory as one (column x time) block
+    columns = {name: row for row, name in enumerate(arrays)}
+    values_shm = shared_memory.SharedMemory(create=True, size=max(len(columns) * len(dates) * 8, 1))
+    dates_shm = shared_memory.SharedMemory(create=True, size=max(len(dates) * 8, 1))
+
+    try:
+        values = np.ndarray((len(columns), len(dates)), dtype="float64", buffer=values_shm.buf)
+        for name, row in columns.items():
+            values[row] = arrays[name]
+        np.ndarray(len(dates), dtype="int64", buffer=dates_shm.buf)[:] = dates.view("int64")
+        del values, arrays
+
+        layout = (values_shm.name, dates_shm.name, columns, len(dates), tickers, initial_capital)
+
+        start = time.perf_counter()
+
+        if max_workers == 1:
+            _attach_shared(*layout)
+            try:
+                results = [_run_param_set(params) for params in param_sets]
+            finally:
+                _detach_shared()
+        else:
+            with ProcessPoolExecutor(
+                max_workers=max_workers or os.cpu_count(),
+                initializer=_attach_shared,
+                initargs=layout,
+            ) as executor:
+                results = list(executor.map(_run_param_set, param_sets, chunksize=chunksize))
+
+        if report_performance == True:
+            elapsed = time.perf_counter() - start
+            print(f"Ran {len(param_sets)} parameter sets in {elapsed:.1f} seconds ({len(param_sets) / max(elapsed, 1e-9):.1f} per second).")
+        else:
+            pass
+
+    finally:
+        values_shm.close()
+        values_shm.unlink()
+        dates_shm.close()
+        dates_shm.unlink()
+
+    results_df = pd.DataFrame(results, columns=names + [name for name in base_params if name not in names] + SWEEP_METRICS)
+
+    return results_df
+
+def _compute_indicators(
+    tickers: list,
+    data: pd.DataFrame,
+    param_sets: list,
+) -> tuple[dict, np.ndarray]:
+    # Same calculations as add_rsi_ma_bb, once for each distinct parameter
+    df = data.sort_values(by="Date", kind="mergesort").reset_index(drop=True)
+
+    rsi_periods = list(dict.fromkeys(params["rsi_period"] for params in param_sets))
+    days = list(dict.fromkeys(day for params in param_sets for day in params["ma_days"]))
+    bb_windows = list(dict.fromkeys(params["bb_window"] for params in param_sets))
+    bb_bands = list(dict.fromkeys((params["bb_window"], params["bb_num_std"]) for params in param_sets))
+
+    arrays = {}
+    for ticker in tickers:
+        close = df[f"{ticker}_close"]
+        close_prev = close.shift(1)
+
+        for column in ["open", "high", "low", "close"]:
+            arrays[f"{ticker}_{column}"] = df[f"{ticker}_{column}"].to_numpy(dtype="float64")
+        arrays[f"{ticker}_close_prev"] = close_prev.to_numpy(dtype="float64")
+
+        for rsi_period in rsi_periods:
+            rsi = calculate_rsi(close, period=rsi_period)
+            arrays[f"{ticker}_RSI_prev|{rsi_period}"] = rsi.shift(1).to_numpy(dtype="float64")
+
+        for day in days:
+            window = 1440 * day  # 1440 minutes in a day
+            ma = close.rolling(window=window, min_periods=1).mean()
+            arrays[f"{ticker}_MA_{day}d_prev"] = ma.shift(1).to_numpy(dtype="float64")
+
+        rolling_stats = {}
+        for bb_window in bb_windows:
+            rolling = close_prev.rolling(window=bb_window, min_periods=bb_window)
+            rolling_stats[bb_window] = (rolling.mean(), rolling.std())
+
+        for bb_window, bb_num_std in bb_bands:
+            bb_mid, bb_std = rolling_stats[bb_window]
+            key = f"{bb_window}|{bb_num_std}"
+            arrays[f"{ticker}_BB_MID_prev|{key}"] = bb_mid.to_numpy(dtype="float64")
+            arrays[f"{ticker}_BB_UPPER_prev|{key}"] = (bb_mid + (bb_num_std * bb_std)).to_numpy(dtype="float64")
+            arrays[f"{ticker}_BB_LOWER_prev|{key}"] = (bb_mid - (bb_num_std * bb_std)).to_numpy(dtype="float64")
+            arrays[f"{ticker}_BB_Z_prev|{key}"] = ((close_prev - bb_mid) / bb_std).to_numpy(dtype="float64")
+
+    dates = df["Date"].to_numpy(dtype="datetime64[ns]")
+
+    return arrays, dates
+
+def _attach_shared(
+    values_name: str,
+    dates_name: str,
+    columns: dict,
+    n_rows: int,
+    tickers: list,
+    initial_capital: float,
+) -> None:
+    values_shm = shared_memory.SharedMemory(name=values_name)
+    dates_shm = shared_memory.SharedMemory(name=dates_name)
+
+    _shared["shm"] = (values_shm, dates_shm)
+    _shared["values"] = np.ndarray((len(columns), n_rows), dtype="float64", buffer=values_shm.buf)
+    _shared["dates"] = np.ndarray(n_rows, dtype="int64", buffer=dates_shm.buf).view("datetime64[ns]")
+    _shared["columns"] = columns
+    _shared["tickers"] = tickers
+    _shared["initial_capital"] = initial_capital
+
+def _detach_shared() -> None:
+    shms = _shared.get("shm", ())
+    _shared.clear()
+    for shm in shms:
+        shm.close()
+
+def _run_param_set(
+    params: dict,
+) -> dict:
+    values = _shared["values"]
+    columns = _shared["columns"]
+    tickers = _shared["tickers"]
+    initial_capital = _shared["initial_capital"]
+
+    # Build the columns of add_rsi_ma_bb for this parameter set from views of the shared arrays
+    bb_key = f"{params['bb_window']}|{params['bb_num_std']}"
+    frame = {"Date": _shared["dates"]}
+    for ticker in tickers:
+        for column in ["open", "high", "low", "close", "close_prev"]:
+            frame[f"{ticker}_{column}"] = values[columns[f"{ticker}_{column}"]]
+        frame[f"{ticker}_RSI_prev"] = values[columns[f"{ticker}_RSI_prev|{params['rsi_period']}"]]
+        for day in params["ma_days"]:
+            frame[f"{ticker}_MA_{day}d_prev"] = values[columns[f"{ticker}_MA_{day}d_prev"]]
+        for band in ["MID", "UPPER", "LOWER", "Z"]:
+            frame[f"{ticker}_BB_{band}_prev"] = values[columns[f"{ticker}_BB_{band}_prev|{bb_key}"]]
+    df = pd.DataFrame(frame, copy=False)
+
+    signals = create_signals_vectorized(
+        tickers=tickers,
+        data=df,
+        use_rsi=params["use_rsi"],
+        rsi_threshold=params["rsi_threshold"],
+        use_ma=params["use_ma"],
+        ma_days=params["ma_days"],
+        use_bbands=params["use_bbands"],
+        bb_rule=params["bb_rule"],
+    )
+
+    trades = backtest_rsi_multi_asset_strategy(
+        tickers=tickers,
+        prices=df,
+        signals=signals,
+        initial_capital=initial_capital,
+        rsi_threshold=params["rsi_threshold"],
+        trailing_stop_pct=params["trailing_stop_pct"],
+        ma_days=params["ma_days"],
+        order_entry=params["order_entry"],
+        trading_fees=params["trading_fees"],
+        trade_taker_fee=params["trade_taker_fee"],
+        trade_maker_fee=params["trade_maker_fee"],
+        exit_engine="numba",
+        return_buffer=True,
+    )
+
+    # No trades or no trades with an actual position
+    if trades.empty or (trades["quantity"] > 0.01).sum() == 0:
+        metrics = [0] + [np.nan] * (len(SWEEP_METRICS) - 1)
+        return {**params, **dict(zip(SWEEP_METRICS, metrics))}
+
+    daily_perf = compute_daily_performance(
+        tickers=tickers,
+        data=df,
+        trades=trades,
+        initial_capital=initial_capital,
+    )
+
+    metrics = analyze_trades(
+        trades_df=trades,
+        daily_perf_df=daily_perf,
+        print_summary=False,
+    )
+
+    return {**params, **dict(zip(SWEEP_METRICS, metrics))}
+
+if __name__ == "__main__":
+
+    from load_crypto_data import load_crypto_data
+    from settings import config
+
+    # Get the environment variable for where data is stored
+    DATA_DIR = config("DATA_DIR")
+
+    tickers = ["BTC-USD", "ETH-USD", "SOL-USD"]
+
+    data = load_crypto_data(
+        tickers=tickers,
+        base_directory=DATA_DIR,
+        start_date="2025-01-01",
+        end_date=None,
+    )
+
+    # Example usage
+    results = backtest_parameter_sweep(
+        tickers=tickers,
+        data=data,
+        param_grid={
+            "rsi_threshold": [20, 25, 30, 35],
+            "trailing_stop_pct": [0.01, 0.02, 0.03, 0.05],
+            "ma_days": [[7], [7, 30], [30, 90]],
+            "order_entry": ["market", "limit"],
+        },
+        initial_capital=10000,
+        fixed_params={"trading_fees": True, "trade_taker_fee": 0.006, "trade_maker_fee": 0.004},
+        report_performance=True,
+    )
+    print(results.sort_values(by="total_return", ascending=False).head(10))
@@ -0,0 +1,311 @@
+import numpy as np
+import pandas as pd
+import time
+
+from find_trailing_stop_exit import find_trailing_stop_exit
+from trade_buffer import TradeBuffer
+
+
+def backtest_rsi_multi_asset_portfolio(
+    tickers: list,
+    prices: pd.DataFrame,
+    signals: pd.DataFrame,
+    initial_capital: float,
+    rsi_threshold: float,          # kept for signature compatibility (unused here)
+    trailing_stop_pct: float,
+    ma_days: list,                 # kept for signature compatibility (unused here)
+    order_entry: str,
+    trading_fees: bool,
+    trade_taker_fee: float, # market order fee
+    trade_maker_fee: float, # limit order fee
+    use_numba: bool = False,
+    report_performance: bool = False,
+) -> pd.DataFrame:
+    """
+    Portfolio backtest with simultaneous positions in each ticker and shared cash.
+
+    Same entry, fee, and trailing stop exit rules as backtest_rsi_multi_asset_strategy,
+    but each ticker can hold its own position while the other tickers are in trades
+    (backtest_rsi_multi_asset_strategy holds one trade at a time across all tickers).
+
+    - A ticker's signals are skipped while it holds a position (signals at or before
+      the exit timestamp).
+    - At each timestamp, entries are processed first (in signal order) and then exits
+      (in ticker order), so a signal on the exit bar does not re-enter.
+    - Each entry uses cash / len(tickers) * allocation_pct of the cash at that time.
+    - If no exit is found to the end of data, cash is NOT refunded and the trade
+      remains open (same legacy behavior as backtest_rsi_multi_asset_strategy).
+    - Bars where a ticker has no prices (NaN rows in the merged prices) are skipped
+      by that ticker's exit search, so a missing bar does not keep a position open.
+
+    The exits only depend on each ticker's prices, so the trades are found per ticker
+    with find_trailing_stop_exit (without looping over the bars), and the entry and
+    exit events are then replayed in time order to update the shared cash.
+
+    Parameters:
+    -----------
+    tickers : list
+        List of crypto tickers, e.g., ["BTC-USD", "ETH-USD", "SOL-USD"].
+    prices : pd.DataFrame
+        DataFrame containing merged price data for all tickers.
+    signals : pd.DataFrame
+        DataFrame of entry signals from create_signals.
+    initial_capital : float
+        Starting cash.
+    trailing_stop_pct : float
+        Trailing stop percentage as a decimal (e.g., 0.02).
+    order_entry : str
+        'market' to enter at the open or 'limit' to enter at the previous close.
+    trading_fees : bool
+        If True, apply the trading fees.
+    trade_taker_fee : float
+        Market order fee as a decimal.
+    trade_maker_fee : float
+        Limit order fee as a decimal.
+    use_numba : bool, optional
+        If True, use the numba kernel for the exit search when numba is installed
+        (default is False).
+    report_performance : bool, optional
+        If True, print the number of trades and the throughput in bars/sec
+        (default is False).
+
+    Returns:
+    --------
+    pd.DataFrame
+        DataFrame of all trades across assets in the order they were closed, with
+        the same columns as backtest_rsi_multi_asset_strategy.
+    """
+
+    start_time = time.perf_counter()
+
+    # Stable sort; shallow (meta-only) copy to avoid duplicating data
+    prices_df = prices.copy(deep=False).sort_values(by="Date", kind="mergesort")
+    date_idx = prices_df["Date"].to_numpy()
+    n_bars = len(date_idx)
+
+    # Chronological signals as columns
+    signals_sorted_df = signals.copy(deep=False).sort_values(by="Date", kind="mergesort")
+    signal_dates = signals_sorted_df["Date"].to_numpy().astype(date_idx.dtype)
+    signal_assets = signals_sorted_df["asset"].to_numpy()
+    signal_allocation = signals_sorted_df["allocation_pct"].to_numpy(dtype="float64")
+    signal_starts = np.searchsorted(date_idx, signal_dates, side="left")
+
+    if order_entry == "market":
+        signal_entry_prices = signals_sorted_df["open"].to_numpy(dtype="float64")
+        signal_fills = np.ones(len(signals_sorted_df), dtype=bool)
+    elif order_entry == "limit":
+        # Limit order set at previous candle close, filled if the bar trades through it
+        signal_entry_prices = signals_sorted_df["close_prev"].to_numpy(dtype="float64")
+        signal_fills = (
+            (signal_entry_prices >= signals_sorted_df["low"].to_numpy(dtype="float64"))
+            & (signal_entry_prices <= signals_sorted_df["high"].to_numpy(dtype="float64"))
+        )
+    else:
+        raise Exception(f"Invalid order entry: {order_entry}. Acceptable order entries are: ['market', 'limit'].")
+
+    # Trading fee percentages
+    trade_entry_fee_dec = 0.0
+    trade_exit_fee_dec = 0.0
+    if trading_fees:
+        trade_entry_fee_dec = trade_taker_fee if order_entry == "market" else trade_maker_fee
+        trade_exit_fee_dec = trade_taker_fee
+
+    # -------- Per-ticker positions --------
+
+    # Events sorted by (bar, entries before exits, signal order for entries / ticker order for exits)
+    events = []
+    positions = []
+
+    for ticker_number, ticker in enumerate(tickers):
+        open_nparray = prices_df[f"{ticker}_open"].to_numpy(dtype="float64")
+        high_nparray = prices_df[f"{ticker}_high"].to_numpy(dtype="float64")
+        low_nparray = prices_df[f"{ticker}_low"].to_numpy(dtype="float64")
+
+        # Bars where the ticker has prices. The merged prices have a row for every timestamp
+        # of any ticker, and a NaN high would stop the exit search for good, so the exits are
+        # searched over the ticker's own bars only.
+        valid_bars = np.flatnonzero(~(np.isnan(open_nparray) | np.isnan(high_nparray) | np.isnan(low_nparray)))
+        if len(valid_bars) < n_bars:
+            open_nparray = open_nparray[valid_bars]
+            high_nparray = high_nparray[valid_bars]
+            low_nparray = low_nparray[valid_bars]
+        else:
+            pass
+
+        # Filled signals for this ticker, in signal order, and the first valid bar at or after each signal
+        rows = np.flatnonzero((signal_assets == ticker) & signal_fills)
+        row_starts = np.searchsorted(valid_bars, signal_starts[rows], side="left")
+
+        k = 0
+        while k < len(rows):
+            row = rows[k]
+            start = int(row_starts[k])
+            entry_price = signal_entry_prices[row]
+
+            position = len(positions)
+            positions.append({
+                "asset": ticker,
+                "entry_time": signals_sorted_df["Date"].iloc[row],
+                "entry_price": entry_price,
+                "allocation_pct": signal_allocation[row],
+            })
+            events.append((int(signal_starts[row]), 0, row, position))
+
+            if start >= len(valid_bars):
+                # No bars remain; legacy behavior: keep cash debited, position stays open
+                break
+
+            exit_found = find_trailing_stop_exit(
+                open_nparray, high_nparray, low_nparray, start, entry_price, trailing_stop_pct,
+                use_numba=use_numba,
+            )
+
+            if exit_found is None:
+                # ---- LEGACY QUIRK: no exit to end of data -> keep cash debited, stay open
+                break
+
+            i, exit_price, order_exit, _ = exit_found
+            exit_bar = int(valid_bars[i])
+            positions[position]["exit_time"] = pd.Timestamp(date_idx[exit_bar].astype("datetime64[ns]"))
+            positions[position]["exit_type"] = order_exit
+            positions[position]["exit_price"] = exit_price
+            events.append((exit_bar, 1, ticker_number, position))
+
+            # Skip the signals until after the exit bar
+            k = int(np.searchsorted(row_starts, i, side="right"))
+
+    events.sort()
+
+    # -------- Shared cash --------
+
+    cash = initial_capital
+    trades = TradeBuffer(assets=tickers)
+
+    for _, event_type, _, position in events:
+        trade = positions[position]
+
+        if event_type == 0:
+            # -------- ENTRY --------
+
+            # Calc capital based on number of assets and allocation_pct
+            capital_to_use = cash / len(tickers) * trade["allocation_pct"]
+
+            # Calc entry value and entry fee
+            entry_value = capital_to_use / (1.0 + trade_entry_fee_dec)
+            entry_fee = capital_to_use - entry_value
+
+            # Calc quantity to buy
+            quantity = entry_value / trade["entry_price"]
+
+            # Update cash position based on entry
+            cash -= entry_value
+            cash -= entry_fee
+
+            trade["capital_to_use"] = capital_to_use
+            trade["entry_value"] = entry_value
+            trade["entry_fee"] = entry_fee
+            trade["quantity"] = quantity
+
+        else:
+            # -------- EXIT --------
+
+            # Calc exit value and exit fee
+            exit_value = trade["quantity"] * trade["exit_price"]
+            exit_fee = exit_value * trade_exit_fee_dec
+
+            # Update cash position based on exit
+            cash += exit_value
+            cash -= exit_fee
+
+            # Calc pnl, return
+            pnl = (exit_value - exit_fee) - (trade["entry_value"] + trade["entry_fee"])
+            return_dec = pnl / trade["capital_to_use"]
+
+            # Add to trades buffer
+            trades.append(
+                asset=trade["asset"],
+                entry_time=trade["entry_time"],
+                entry_type=order_entry,
+                entry_price=trade["entry_price"],
+                exit_time=trade["exit_time"],
+                exit_type=trade["exit_type"],
+                exit_price=trade["exit_price"],
+                quantity=trade["quantity"],
+                allocation_pct=trade["allocation_pct"],
+                pnl=pnl,
+                return_dec=return_dec,
+                cash=cash,
+                entry_fee=trade["entry_fee"],
+                exit_fee=exit_fee,
+            )
+
+    if report_performance == True:
+        elapsed = time.perf_counter() - start_time
+        print(f"Portfolio backtest: {len(trades)} trades, {len(positions) - len(trades)} still open, {n_bars:,} bars x {len(tickers)} tickers in {elapsed:.2f} seconds.")
+        print(f"Throughput: {n_bars * len(tickers) / max(elapsed, 1e-9):,.0f} bars/sec")
+
+    # Create new dataframe for trades, with cumulative pnl, equity, cumulative return
+    trades_df = trades.to_frame(initial_capital=initial_capital)
+
+    return trades_df
+
+if __name__ == "__main__":
+
+    # Example usage with generated minute data, with 2% of the bars missing for each ticker
+    # (like the merged prices from load_crypto_data when a ticker has no candle for a minute)
+    rng = np.random.default_rng(0)
+    n_bars = 100_000
+    tickers = ["BTC-USD", "ETH-USD", "SOL-USD"]
+
+    prices = {"Date": pd.date_range("2025-01-01", periods=n_bars, freq="min")}
+    signals = []
+    for ticker in tickers:
+        close = 100 * np.exp(np.cumsum(rng.normal(0, 0.001, n_bars)))
+        open_ = np.concatenate(([close[0]], close[:-1]))
+        high = np.maximum(open_, close) * (1 + np.abs(rng.normal(0, 0.0005, n_bars)))
+        low = np.minimum(open_, close) * (1 - np.abs(rng.normal(0, 0.0005, n_bars)))
+
+        missing = rng.random(n_bars) < 0.02
+        for column, values in zip(["open", "high", "low", "close"], [open_, high, low, close]):
+            values[missing] = np.nan
+            prices[f"{ticker}_{column}"] = values
+
+        # Entry signal every 500 bars where the ticker has prices
+        bars = np.arange(1, n_bars, 500)
+        bars = bars[~missing[bars]]
+        signals.append(pd.DataFrame({
+            "Date": prices["Date"][bars],
+            "open": open_[bars],
+            "high": high[bars],
+            "low": low[bars],
+            "close_prev": np.where(missing[bars - 1], open_[bars], close[bars - 1]),
+            "asset": ticker,
+            "allocation_pct": 1.0,
+        }))
+
+    prices = pd.DataFrame(prices)
+    signals = pd.concat(signals, ignore_index=True)
+
+    trades = backtest_rsi_multi_asset_portfolio(
+        tickers=tickers,
+        prices=prices,
+        signals=signals,
+        initial_capital=10_000,
+        rsi_threshold=30,
+        trailing_stop_pct=0.01,
+        ma_days=[],
+        order_entry="market",
+        trading_fees=True,
+        trade_taker_fee=0.006,
+        trade_maker_fee=0.004,
+        report_performance=True,
+    )
+    print(trades)
+
+    # The missing bars must not stop a ticker from trading for the rest of the data
+    for ticker in tickers:
+        last_exit = trades.loc[trades["asset"] == ticker, "exit_time"].max()
+        if pd.isna(last_exit) or last_exit < prices["Date"].iloc[int(n_bars * 0.9)]:
+            raise Exception(f"Invalid trades for {ticker}: last exit at {last_exit}. The missing bars stopped the exit search.")
+        else:
+            pass
@@ -319,6 +319,10 @@
 
 import numpy as np
 import pandas as pd
+import time
+
+from find_trailing_stop_exit import find_trailing_stop_exit
+from trade_buffer import TradeBuffer
 
 
 def backtest_rsi_multi_asset_strategy(
@@ -333,14 +337,33 @@ def backtest_rsi_multi_asset_strategy(
     trading_fees: bool,
     trade_taker_fee: float, # market order fee
     trade_maker_fee: float, # limit order fee
-) -> pd.DataFrame:
+    exit_engine: str = "suffix",
+    report_performance: bool = False,
+    return_buffer: bool = False,
+) -> pd.DataFrame | TradeBuffer:
     """
     Optimized backtest with legacy 'no-exit leaves cash stuck' behavior:
     - If no exit is found from entry to the end of data, cash is NOT refunded and the
       trade remains open (matching your original implementation).
     - Avoids copying prices_df inside the loop; uses NumPy views for speed.
+    - exit_engine selects the trailing stop exit search:
+        * "suffix": running peak and breach scans over every bar from entry to the end of data (default)
+        * "chunked": find_trailing_stop_exit, which scans in growing chunks and stops at the exit
+        * "numba": find_trailing_stop_exit with the compiled kernel, which stops at the exit bar
+          (falls back to "chunked" if numba is not installed)
+      All produce identical trades.
+    - report_performance prints the bars scanned by the exit searches and the throughput in bars/sec.
+    - Trades are written to a columnar TradeBuffer instead of a dict per trade, and the trades
+      DataFrame is built from views of it. return_buffer=True returns the TradeBuffer itself,
+      which compute_daily_performance and analyze_trades accept directly.
     """
 
+    if exit_engine not in ["suffix", "chunked", "numba"]:
+        raise Exception(f"Invalid exit engine: {exit_engine}. Acceptable exit engines are: ['suffix', 'chunked', 'numba'].")
+
+    start_time = time.perf_counter()
+    bars_scanned = 0
+
     # Stable sort; shallow (meta-only) copy to avoid duplicating data
     prices_df = prices.copy(deep=False).sort_values(by="Date", kind="mergesort")
     date_idx = prices_df["Date"].to_numpy()
@@ -365,8 +388,8 @@ def backtest_rsi_multi_asset_strategy(
     trade_entry_fee_dec = 0.0
     trade_exit_fee_dec = 0.0
 
-    # Create list for trades
-    trades = []
+    # Create columnar buffer for trades
+    trades = TradeBuffer(assets=tickers)
 
     # Start with the first timestamp
     next_timestamp = prices_df['Date'].iloc[0]
@@ -441,41 +464,58 @@ def backtest_rsi_multi_asset_strategy(
                 # No bars remain; legacy behavior: keep cash debited, position stays open
                 continue
 
-            # Slices from the price numpy arrays
-            o_sub = open_nparray[start:]
-            h_sub = high_nparray[start:]
-            l_sub = low_nparray[start:]
-            d_sub = date_idx[start:]
+            if exit_engine in ["chunked", "numba"]:
+                exit_found = find_trailing_stop_exit(
+                    open_nparray, high_nparray, low_nparray, start, entry_price, trailing_stop_pct,
+                    use_numba=(exit_engine == "numba"),
+                )
 
-            # Running peak (never below entry price)
-            peak_price = np.maximum.accumulate(np.maximum(h_sub, entry_price))
-            stop_price = peak_price * (1.0 - trailing_stop_pct)
+                if exit_found is None:
+                    # ---- LEGACY QUIRK: no exit to end of data -> keep cash debited, stay open
+                    bars_scanned += len(date_idx) - start
+                    continue
 
-            # Gap-breach first: open <= stop and low <= stop -> exit at open
-            gap_idx = np.flatnonzero((l_sub <= stop_price) & (o_sub <= stop_price))
+                i, exit_price, order_exit, scanned = exit_found
+                bars_scanned += scanned
+                exit_timestamp = pd.Timestamp(date_idx[i].astype("datetime64[ns]"))
 
-            # Regular breach: low <= stop -> exit at stop price
-            br_idx = np.flatnonzero(l_sub <= stop_price)
+            else:
+                # Slices from the price numpy arrays
+                o_sub = open_nparray[start:]
+                h_sub = high_nparray[start:]
+                l_sub = low_nparray[start:]
+                d_sub = date_idx[start:]
+                bars_scanned += len(d_sub)
 
-            i_gap = int(gap_idx[0]) if gap_idx.size else np.inf
-            i_br  = int(br_idx[0])  if br_idx.size  else np.inf
+                # Running peak (never below entry price)
+                peak_price = np.maximum.accumulate(np.maximum(h_sub, entry_price))
+                stop_price = peak_price * (1.0 - trailing_stop_pct)
 
-            if np.isinf(min(i_gap, i_br)):
-                # ---- LEGACY QUIRK: no exit to end of data -> keep cash debited, stay open
-                continue
+                # Gap-breach first: open <= stop and low <= stop -> exit at open
+                gap_idx = np.flatnonzero((l_sub <= stop_price) & (o_sub <= stop_price))
 
-            if i_gap <= i_br:
-                # Gap-breach is earlier (or same bar) -> exit at open
-                i = i_gap
-                exit_timestamp = pd.Timestamp(d_sub[i].astype("datetime64[ns]"))
-                exit_price = float(o_sub[i])
-                order_exit = "exit at open (gap)"
-            else:
-                # Regular breach is earlier -> exit at stop level of that bar
-                i = i_br
-                exit_timestamp = pd.Timestamp(d_sub[i].astype("datetime64[ns]"))
-                exit_price = float(stop_price[i])
-                order_exit = "trailing stop"
+                # Regular breach: low <= stop -> exit at stop price
+                br_idx = np.flatnonzero(l_sub <= stop_price)
+
+                i_gap = int(gap_idx[0]) if gap_idx.size else np.inf
+                i_br  = int(br_idx[0])  if br_idx.size  else np.inf
+
+                if np.isinf(min(i_gap, i_br)):
+                    # ---- LEGACY QUIRK: no exit to end of data -> keep cash debited, stay open
+                    continue
+
+                if i_gap <= i_br:
+                    # Gap-breach is earlier (or same bar) -> exit at open
+                    i = i_gap
+                    exit_timestamp = pd.Timestamp(d_sub[i].astype("datetime64[ns]"))
+                    exit_price = float(o_sub[i])
+                    order_exit = "exit at open (gap)"
+                else:
+                    # Regular breach is earlier -> exit at stop level of that bar
+                    i = i_br
+                    exit_timestamp = pd.Timestamp(d_sub[i].astype("datetime64[ns]"))
+                    exit_price = float(stop_price[i])
+                    order_exit = "trailing stop"
 
             # Get trade exit fee percentage
             if trading_fees:
@@ -493,36 +533,36 @@ def backtest_rsi_multi_asset_strategy(
             pnl = (exit_value - exit_fee) - (entry_value + entry_fee)
             return_dec = pnl / capital_to_use
             
-            # Add to trades list
+            # Add to trades buffer
             trades.append(
-                {
-                    "asset": ticker,
-                    "entry_time": entry_timestamp,
-                    "entry_type": order_entry,
-                    "entry_price": entry_price,
-                    "exit_time": exit_timestamp,
-                    "exit_type": order_exit,
-                    "exit_price": exit_price,
-                    "quantity": quantity,
-                    "allocation_pct": allocation_pct,
-                    "pnl": pnl,
-                    "return": return_dec,
-                    "cash": cash,
-                    "entry_fee": entry_fee,
-                    "exit_fee": exit_fee,
-                }
+                asset=ticker,
+                entry_time=entry_timestamp,
+                entry_type=order_entry,
+                entry_price=entry_price,
+                exit_time=exit_timestamp,
+                exit_type=order_exit,
+                exit_price=exit_price,
+                quantity=quantity,
+                allocation_pct=allocation_pct,
+                pnl=pnl,
+                return_dec=return_dec,
+                cash=cash,
+                entry_fee=entry_fee,
+                exit_fee=exit_fee,
             )
 
             # Update next_timestamp
             next_timestamp = exit_timestamp
 
-    # Create new dataframe for trades
-    trades_df = pd.DataFrame(trades)
+    if report_performance == True:
+        elapsed = time.perf_counter() - start_time
+        print(f"Backtest with {exit_engine} exit engine: {len(trades)} trades, {bars_scanned:,} bars scanned in {elapsed:.2f} seconds.")
+        print(f"Throughput: {bars_scanned / max(elapsed, 1e-9):,.0f} bars/sec scanned, {len(date_idx) / max(elapsed, 1e-9):,.0f} bars/sec of price data")
+
+    if return_buffer == True:
+        return trades
 
-    # If there are entries, calc cumulative pnl, equity, cumulative return
-    if not trades_df.empty:
-        trades_df["cumulative_pnl"] = trades_df["pnl"].cumsum()
-        trades_df["equity"] = trades_df["cumulative_pnl"] + initial_capital
-        trades_df["cumulative_return"] = trades_df["equity"] / initial_capital - 1
+    # Create new dataframe for trades from views of the buffer, with cumulative pnl, equity, cumulative return
+    trades_df = trades.to_frame(initial_capital=initial_capital)
 
     return trades_df
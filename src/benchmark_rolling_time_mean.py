@@ -0,0 +1,139 @@
+import numpy as np
+import pandas as pd
+import time
+
+from rolling_time_mean import rolling_time_mean
+
+def benchmark_rolling_time_mean(
+    data: pd.DataFrame = None,
+    tickers: list = None,
+    ma_days: list = None,
+    n_bars: int = 525_600,
+    n_tickers: int = 3,
+    gap_pct: float = 0.05,
+    seed: int = 0,
+) -> pd.DataFrame:
+
+    """
+    Benchmark the time-based moving averages against the bar count moving averages.
+
+    Runs the 1440 * days bar count rolling mean used by add_rsi_ma_bb, the pandas
+    time-based rolling mean on a Date index, and rolling_time_mean on the close
+    columns, checks that rolling_time_mean matches the Date index version, and reports
+    the time for each engine along with how far the bar count windows stretch
+    past the requested number of days because of missing bars.
+
+    Parameters:
+    -----------
+    data : pd.DataFrame, optional
+        DataFrame containing merged price data with the 'Date' and '{ticker}_close'
+        columns, e.g., from load_crypto_data. If None, random walks of minute bars
+        with missing bars are generated (default is None).
+    tickers : list, optional
+        Tickers to use from the data (default is None).
+    ma_days : list, optional
+        Moving average durations in days (default is None, for [7, 30]).
+    n_bars : int, optional
+        Number of minutes to generate if no data is given (default is 525,600, one year).
+    n_tickers : int, optional
+        Number of tickers to generate if no data is given (default is 3).
+    gap_pct : float, optional
+        Fraction of the generated minutes that are missing (default is 0.05).
+    seed : int, optional
+        Seed for the generated data (default is 0).
+
+    Returns:
+    --------
+    pd.DataFrame
+        DataFrame with the engine, MA days, seconds, rows per second, speedup over the
+        pandas time-based rolling mean, and the max and mean span of the bar count
+        windows in days.
+    """
+
+    if ma_days is None:
+        ma_days = [7, 30]
+
+    rng = np.random.default_rng(seed)
+
+    if data is None:
+        # Random walks of minute bars, with random minutes missing for all tickers or for one ticker
+        dates = pd.date_range("2024-01-01", periods=n_bars, freq="min")
+        dates = dates[rng.random(n_bars) >= gap_pct]
+        tickers = [f"T{number}-USD" for number in range(n_tickers)]
+        data = pd.DataFrame({"Date": dates})
+        for ticker in tickers:
+            close = 100 * np.exp(np.cumsum(rng.normal(0, 0.001, len(dates))))
+            close[rng.random(len(dates)) < gap_pct] = np.nan  # bars missing for this ticker only
+            data[f"{ticker}_close"] = close
+    else:
+        data = data.sort_values(by="Date", kind="mergesort").reset_index(drop=True)
+
+    close_columns = [f"{ticker}_close" for ticker in tickers]
+    close = data[close_columns]
+    close_by_date = close.set_axis(pd.DatetimeIndex(data["Date"]), axis=0)  # Date index for pandas
+    dates = data["Date"].to_numpy()
+
+    results = []
+    for day in ma_days:
+        window = 1440 * day  # 1440 minutes in a day
+
+        # Bar count rolling mean (add_rsi_ma_bb)
+        start = time.perf_counter()
+        close.rolling(window=window, min_periods=1).mean()
+        bar_seconds = time.perf_counter() - start
+
+        # Time span of the bar count windows, in days
+        first_bar = np.maximum(np.arange(len(dates)) - window + 1, 0)
+        span_days = (dates - dates[first_bar]) / np.timedelta64(1, "D")
+
+        # pandas time-based rolling mean on a Date index
+        start = time.perf_counter()
+        pandas_ma = close_by_date.rolling(f"{day}D", min_periods=1).mean()
+        pandas_seconds = time.perf_counter() - start
+
+        # Time-based rolling mean on the Date column of the wide frame
+        start = time.perf_counter()
+        time_ma = rolling_time_mean(data, close_columns, f"{day}D")
+        time_seconds = time.perf_counter() - start
+
+        if not np.array_equal(time_ma.to_numpy(), pandas_ma.to_numpy(), equal_nan=True):
+            raise Exception(f"rolling_time_mean does not match the pandas time-based rolling mean for {day} days.")
+
+        for engine, seconds, max_span, mean_span in [
+            ("bar count", bar_seconds, span_days.max(), span_days.mean()),
+            ("pandas time-based", pandas_seconds, np.nan, np.nan),
+            ("rolling_time_mean", time_seconds, np.nan, np.nan),
+        ]:
+            results.append({
+                "engine": engine,
+                "ma_days": day,
+                "seconds": seconds,
+                "rows_per_sec": len(data) * len(tickers) / max(seconds, 1e-9),
+                "speedup": pandas_seconds / max(seconds, 1e-9),
+                "max_span_days": max_span,
+                "mean_span_days": mean_span,
+            })
+
+    return pd.DataFrame(results)
+
+if __name__ == "__main__":
+
+    # Example usage with generated minute data
+    print(benchmark_rolling_time_mean())
+
+    # Example usage with stored minute data
+    from load_crypto_data import load_crypto_data
+    from settings import config
+
+    # Get the environment variable for where data is stored
+    DATA_DIR = config("DATA_DIR")
+
+    tickers = ["BTC-USD", "ETH-USD", "SOL-USD"]
+
+    data = load_crypto_data(
+        tickers=tickers,
+        base_directory=DATA_DIR,
+        start_date="2024-01-01",
+        end_date=None,
+    )
+    print(benchmark_rolling_time_mean(data=data, tickers=tickers))
@@ -0,0 +1,163 @@
+import numpy as np
+import pandas as pd
+import time
+
+from find_trailing_stop_exit import NUMBA_AVAILABLE, find_trailing_stop_exit
+
+def benchmark_trailing_stop_exit(
+    data: pd.DataFrame = None,
+    ticker: str = None,
+    n_bars: int = 525_600,
+    n_entries: int = 1_000,
+    trailing_stop_pct: float = 0.02,
+    seed: int = 0,
+) -> pd.DataFrame:
+
+    """
+    Benchmark the trailing stop exit search engines on minute data.
+
+    Runs the same random entries through the whole-suffix NumPy search used by
+    backtest_rsi_multi_asset_strategy, the chunked NumPy search, and the numba
+    kernel (if numba is installed), checks that all of the engines find the same
+    exits, and reports the time for each engine. The numba compile time is
+    excluded from the timing and reported separately.
+
+    Parameters:
+    -----------
+    data : pd.DataFrame, optional
+        DataFrame containing merged price data with the '{ticker}_open',
+        '{ticker}_high', and '{ticker}_low' columns, e.g., from load_crypto_data.
+        If None, a random walk of minute bars is generated (default is None).
+    ticker : str, optional
+        Ticker to use from the data (default is None).
+    n_bars : int, optional
+        Number of minute bars to generate if no data is given (default is 525,600,
+        one year).
+    n_entries : int, optional
+        Number of random entries to search exits for (default is 1,000).
+    trailing_stop_pct : float, optional
+        Trailing stop percentage as a decimal (default is 0.02).
+    seed : int, optional
+        Seed for the generated data and entries (default is 0).
+
+    Returns:
+    --------
+    pd.DataFrame
+        DataFrame with the engine, seconds, entries per second, bars scanned, and
+        bars scanned per second.
+    """
+
+    rng = np.random.default_rng(seed)
+
+    if data is None:
+        # Random walk of minute bars
+        close = 100 * np.exp(np.cumsum(rng.normal(0, 0.001, n_bars)))
+        open_nparray = np.concatenate(([close[0]], close[:-1]))
+        high_nparray = np.maximum(open_nparray, close) * (1 + np.abs(rng.normal(0, 0.0005, n_bars)))
+        low_nparray = np.minimum(open_nparray, close) * (1 - np.abs(rng.normal(0, 0.0005, n_bars)))
+    else:
+        data = data.sort_values(by="Date", kind="mergesort")
+        open_nparray = data[f"{ticker}_open"].to_numpy(dtype="float64")
+        high_nparray = data[f"{ticker}_high"].to_numpy(dtype="float64")
+        low_nparray = data[f"{ticker}_low"].to_numpy(dtype="float64")
+
+    # Random entries at the open of valid bars
+    valid = np.flatnonzero(~np.isnan(open_nparray))
+    starts = np.sort(rng.choice(valid, size=min(n_entries, len(valid)), replace=False))
+    entries = [(int(start), float(open_nparray[start])) for start in starts]
+
+    def suffix_exit(start, entry_price):
+        # Same search as the "suffix" exit engine in backtest_rsi_multi_asset_strategy
+        o_sub = open_nparray[start:]
+        h_sub = high_nparray[start:]
+        l_sub = low_nparray[start:]
+
+        peak_price = np.maximum.accumulate(np.maximum(h_sub, entry_price))
+        stop_price = peak_price * (1.0 - trailing_stop_pct)
+
+        gap_idx = np.flatnonzero((l_sub <= stop_price) & (o_sub <= stop_price))
+        br_idx = np.flatnonzero(l_sub <= stop_price)
+
+        i_gap = int(gap_idx[0]) if gap_idx.size else np.inf
+        i_br = int(br_idx[0]) if br_idx.size else np.inf
+
+        if np.isinf(min(i_gap, i_br)):
+            return None, len(l_sub)
+        elif i_gap <= i_br:
+            return (start + i_gap, float(o_sub[i_gap]), "exit at open (gap)"), len(l_sub)
+        else:
+            return (start + i_br, float(stop_price[i_br]), "trailing stop"), len(l_sub)
+
+    def search_exit(start, entry_price, use_numba):
+        exit_found = find_trailing_stop_exit(
+            open_nparray, high_nparray, low_nparray, start, entry_price, trailing_stop_pct,
+            use_numba=use_numba,
+        )
+        if exit_found is None:
+            return None, len(low_nparray) - start
+        return exit_found[:3], exit_found[3]
+
+    engines = {
+        "suffix": suffix_exit,
+        "chunked": lambda start, entry_price: search_exit(start, entry_price, use_numba=False),
+    }
+
+    if NUMBA_AVAILABLE == True:
+        # Compile the kernel before timing it
+        compile_start = time.perf_counter()
+        search_exit(entries[0][0], entries[0][1], use_numba=True)
+        print(f"numba compile time: {time.perf_counter() - compile_start:.2f} seconds")
+        engines["numba"] = lambda start, entry_price: search_exit(start, entry_price, use_numba=True)
+    else:
+        print("numba is not installed...skipping the numba kernel.")
+
+    results = []
+    reference = None
+    for engine, function in engines.items():
+        exits = []
+        bars_scanned = 0
+        engine_start = time.perf_counter()
+        for start, entry_price in entries:
+            exit_found, scanned = function(start, entry_price)
+            exits.append(exit_found)
+            bars_scanned += scanned
+        elapsed = time.perf_counter() - engine_start
+
+        # Every engine must find the same exits
+        if reference is None:
+            reference = exits
+        elif exits != reference:
+            raise Exception(f"The {engine} engine found different exits than the suffix engine.")
+
+        results.append({
+            "engine": engine,
+            "seconds": elapsed,
+            "entries_per_sec": len(entries) / max(elapsed, 1e-9),
+            "bars_scanned": bars_scanned,
+            "bars_per_sec": bars_scanned / max(elapsed, 1e-9),
+        })
+
+    results_df = pd.DataFrame(results)
+    results_df["speedup"] = results_df["seconds"].iloc[0] / results_df["seconds"]
+
+    return results_df
+
+if __name__ == "__main__":
+
+    # Example usage with generated minute data
+    print(benchmark_trailing_stop_exit())
+
+    # Example usage with stored minute data
+    from load_crypto_data import load_crypto_data
+    from settings import config
+
+    # Get the environment variable for where data is stored
+    DATA_DIR = config("DATA_DIR")
+
+    data = load_crypto_data(
+        tickers=["BTC-USD"],
+        base_directory=DATA_DIR,
+        start_date="2025-01-01",
+        end_date=None,
+    )
+    print(benchmark_trailing_stop_exit(data=data, ticker="BTC-USD"))
@@ -1,75 +1,138 @@
+import numpy as np
 import pandas as pd
 
+from gap_index_update import gap_index_update
 from load_data import load_data
 from settings import config
 
 # Get the data directory from the configuration
 DATA_DIR = config("DATA_DIR")
 
-# This script checks for missing timestamps in a DataFrame loaded from a pickle file.
-
-# Load the pickle file
-df = load_data(
-    base_directory=DATA_DIR,
-    ticker="BTC-USD",
-    source="Coinbase",
-    asset_class="Cryptocurrencies",
-    timeframe="Minute",
-    file_format="pickle",
-)
-
-print(f"Full data: {df}")
-
-# Reset the index
-df = df.reset_index(drop=False)
-
-# Ensure the timestamp is datetime type
-df['Date'] = pd.to_datetime(df['Date'])
-
-# Sort by time (important for detecting gaps)
-df = df.sort_values(by='Date', ascending=True)
-
-# Set expected frequency (adjust as needed:
-# 'min' for minute
-# 'h' for hourly
-# 'D' for daily
-expected_freq = 'min'
-
-# Create a complete range
-full_range = pd.date_range(start=df['Date'].min(), end=df['Date'].max(), freq=expected_freq)
-
-# Detect missing timestamps
-missing = full_range.difference(df['Date'])
-
-# Summary
-print(f"\nTotal expected timestamps: {len(full_range)}")
-print(f"Total actual timestamps: {df.shape[0]}")
-print(f"Missing timestamps: {len(missing)}")
-
-# Convert to DataFrame for grouping
-missing_df = pd.DataFrame({'missing_timestamp': missing})
-missing_df['year'] = missing_df['missing_timestamp'].dt.year
-missing_df['month'] = missing_df['missing_timestamp'].dt.month
-
-print(f"Missing data: {missing_df}")
-
-# Count missing timestamps by year and month
-missing_by_year_month = (
-    missing_df.groupby(['year', 'month'])
-    .size()
-    .reset_index(name='missing_count')
-)
-
-# Generate all year-month combinations in your date range
-years = range(df['Date'].min().year, df['Date'].max().year + 1)
-months = range(1, 13)
-all_combinations = pd.MultiIndex.from_product([years, months], names=['year', 'month'])
-
-# Reindex to force inclusion
-missing_by_year_month = missing_by_year_month.set_index(['year', 'month']).reindex(
-    all_combinations, fill_value=0
-).reset_index()
-
-# Pivot for nicer display
-pivot_table = missing_by_year_month.pivot(index='year', columns='month', values='missing_count').fillna(0).astype(int)
-print(pivot_table)
\ No newline at end of file
+def check_for_missing_data(
+    base_directory,
+    ticker: str,
+    source: str,
+    asset_class: str,
+    timeframe: str,
+    granularity: int,
+    file_format: str = "pickle",
+    output_confirmation: bool = True,
+) -> pd.DataFrame:
+
+    """
+    Check the stored data of a ticker for missing timestamps using its gap index.
+
+    The gap index is updated with the stored data (only the runs that changed are
+    rebuilt) and the missing timestamps are counted from the runs, so no full date
+    range with one timestamp per bar since inception is built. The count of missing
+    timestamps by year and month is printed as a pivot table.
+
+    Parameters:
+    -----------
+    base_directory
+        Root path where the data is stored.
+    ticker : str
+        Ticker symbol of the data (e.g., 'BTC-USD').
+    source : str
+        Name of the data source (e.g., 'Coinbase').
+    asset_class : str
+        Asset class name (e.g., 'Cryptocurrencies').
+    timeframe : str
+        Timeframe for the data (e.g., 'Minute', 'Hourly', 'Daily').
+    granularity : int
+        Length of a bar in seconds (e.g., 60 for minute bars, 3600 for hourly bars).
+    file_format : str, optional
+        Format of the stored data ('pickle', 'parquet', 'csv', or 'excel') (default is 'pickle').
+    output_confirmation : bool, optional
+        If True, print the summary and the pivot table of missing timestamps (default is True).
+
+    Returns:
+    --------
+    pd.DataFrame
+        The gap index, with one row per run of missing timestamps and the columns
+        'start', 'end', 'checked' and 'missing_count'.
+    """
+
+    # Only the dates are needed
+    df = load_data(
+        base_directory=base_directory,
+        ticker=ticker,
+        source=source,
+        asset_class=asset_class,
+        timeframe=timeframe,
+        file_format=file_format,
+        columns=[],
+    )
+    if "Date" in df.columns:
+        df = df.set_index("Date")
+    df = pd.DataFrame(index=pd.to_datetime(df.index).rename("Date"))
+
+    gaps_df = gap_index_update(base_directory, df, ticker, source, asset_class, timeframe, granularity)
+
+    # Number of missing timestamps in each run and in total
+    step = np.int64(granularity) * 1_000_000_000  # nanoseconds
+    starts = gaps_df["start"].to_numpy().astype("int64")
+    ends = gaps_df["end"].to_numpy().astype("int64")
+    gaps_df["missing_count"] = (ends - starts) // step + 1
+
+    first, last = gaps_df.attrs["first"], gaps_df.attrs["last"]
+    if first is None:
+        print(f"No data found for {timeframe} {ticker}.")
+        return gaps_df
+
+    if output_confirmation == True:
+        total_missing = int(gaps_df["missing_count"].sum())
+        print(f"Total expected timestamps: {(last.value - first.value) // step + 1}")
+        print(f"Total actual timestamps: {df.index.nunique()}")
+        print(f"Missing timestamps: {total_missing} in {len(gaps_df)} runs ({int(gaps_df['missing_count'][gaps_df['checked']].sum())} not available from the source)")
+        print(f"Missing data: {gaps_df}")
+
+        # Missing timestamps before each month boundary, from the cumulative count of
+        # the runs that start before the boundary minus the part of the last run after it
+        months = pd.period_range(first, last, freq="M")
+        boundaries = months.to_timestamp().as_unit("ns").asi8[1:]
+        run_numbers = np.searchsorted(starts, boundaries, side="left") - 1
+        cumulative_missing = np.concatenate([[0], np.cumsum(gaps_df["missing_count"].to_numpy())])
+        missing_before = cumulative_missing[run_numbers + 1]
+        after_boundary = np.where(
+            run_numbers >= 0,
+            np.clip((ends[np.maximum(run_numbers, 0)] - boundaries) // step + 1, 0, None),
+            0,
+        )
+        missing_before = np.concatenate([[0], missing_before - after_boundary, [cumulative_missing[-1]]])
+
+        missing_by_year_month = pd.DataFrame({
+            "year": months.year,
+            "month": months.month,
+            "missing_count": np.diff(missing_before),
+        })
+
+        # Generate all year-month combinations in the date range
+        years = range(first.year, last.year + 1)
+        all_combinations = pd.MultiIndex.from_product([years, range(1, 13)], names=["year", "month"])
+
+        # Pivot for nicer display
+        pivot_table = (
+            missing_by_year_month.set_index(["year", "month"])
+            .reindex(all_combinations, fill_value=0)["missing_count"]
+            .unstack("month")
+            .astype(int)
+        )
+        print(pivot_table)
+    else:
+        pass
+
+    return gaps_df
+
+if __name__ == "__main__":
+
+    # Example usage - minute data for BTC-USD
+    gaps_df = check_for_missing_data(
+        base_directory=DATA_DIR,
+        ticker="BTC-USD",
+        source="Coinbase",
+        asset_class="Cryptocurrencies",
+        timeframe="Minute",
+        granularity=60,
+        file_format="pickle",
+    )
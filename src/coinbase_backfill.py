@@ -0,0 +1,223 @@
+import pandas as pd
+
+from backfill_plan import BACKFILL_MAX_BARS, backfill_plan
+from coinbase_fetch_historical_candles import coinbase_fetch_historical_candles
+from coinbase_http_session import coinbase_http_session
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timedelta
+from export_data import export_data
+from gap_index_update import gap_index_update
+from load_data import load_data
+from parquet_write_data import parquet_write_data
+from pathlib import Path
+from settings import config
+from token_bucket import TokenBucket
+
+# Get the data directory from the configuration
+DATA_DIR = config("DATA_DIR")
+
+def coinbase_backfill(
+    base_directory,
+    product_ids: list,
+    source: str,
+    asset_class: str,
+    timeframe: str,
+    granularity: int,
+    start_date: datetime,
+    end_date: datetime,
+    segment_export: bool = False,
+    max_requests: int = None,
+    dry_run: bool = False,
+    max_workers: int = 8,
+    requests_per_second: float = 10,
+    burst: int = 15,
+    verbose: bool = False,
+) -> pd.DataFrame:
+
+    """
+    Refetch only the missing candles of the stored data of many products from Coinbase Exchange API.
+
+    The gap index of each product is brought up to date with its stored data, and
+    the missing runs between start_date and end_date are coalesced by backfill_plan
+    into windows of at most 300 candles (one request each). The cost of the repair
+    is printed before anything is fetched. The windows are fetched concurrently from
+    the most recent to the oldest with one shared token bucket, the candles are
+    merged into the stored data, and the windows that are still missing afterwards
+    are marked as checked in the gap index so they are not planned again.
+
+    Parameters:
+    -----------
+    base_directory
+        Root path where the data is stored.
+    product_ids : list
+        List of products (e.g., ['BTC-USD', 'ETH-USD']). Products without stored data are skipped.
+    source : str
+        Name of the data source (e.g., 'Coinbase').
+    asset_class : str
+        Asset class name (e.g., 'Cryptocurrencies').
+    timeframe : str
+        Timeframe for the data (e.g., 'Minute', 'Hourly', 'Daily').
+    granularity : int
+        Time slice in seconds (e.g., 60 for minute candles, 3600 for hourly candles).
+    start_date : datetime
+        Start of the range to repair in UTC.
+    end_date : datetime
+        End of the range to repair in UTC.
+    segment_export : bool, optional
+        If True, the data is read from and merged into the Parquet store; otherwise the
+        pickle files are used (default is False).
+    max_requests : int, optional
+        Maximum number of requests to make, most recent gaps first (default is None, for no limit).
+    dry_run : bool, optional
+        If True, only plan and report the cost of the repair (default is False).
+    max_workers : int, optional
+        Number of concurrent requests in flight (default is 8).
+    requests_per_second : float, optional
+        Sustained request rate shared by all workers (default is 10).
+    burst : int, optional
+        Maximum burst of requests (default is 15).
+    verbose : bool, optional
+        If True, print progress information (default is False).
+
+    Returns:
+    --------
+    pd.DataFrame
+        The plan (see backfill_plan) with the number of candles fetched for each window
+        in the 'rows' column (-1 for windows that failed).
+    """
+
+    # ----- Bring the gap index of each product up to date -----
+    missing_ranges = {}
+    for product_id in product_ids:
+        try:
+            if segment_export == True:
+                stored_df = load_data(base_directory, product_id, source, asset_class, timeframe, "parquet", columns=[])
+            else:
+                stored_df = load_data(base_directory, product_id, source, asset_class, timeframe, "pickle")
+        except FileNotFoundError:
+            continue
+
+        gaps_df = gap_index_update(base_directory, stored_df, product_id, source, asset_class, timeframe, granularity)
+
+        # Keep the runs between start_date and end_date
+        gaps_df = gaps_df[(gaps_df["end"] >= pd.Timestamp(start_date)) & (gaps_df["start"] <= pd.Timestamp(end_date))]
+        missing_ranges[product_id] = gaps_df.assign(
+            start=gaps_df["start"].clip(lower=pd.Timestamp(start_date)),
+            end=gaps_df["end"].clip(upper=pd.Timestamp(end_date)),
+        )
+
+    # ----- Plan and report the cost -----
+    plan = backfill_plan(
+        missing_ranges=missing_ranges,
+        granularity=granularity,
+        max_bars=BACKFILL_MAX_BARS["coinbase"],
+        requests_per_second=requests_per_second,
+        max_requests=max_requests,
+        verbose=True,
+    )
+    plan["rows"] = 0
+
+    if dry_run == True or plan.empty:
+        return plan
+
+    # ----- Fetch the windows, most recent first -----
+    rate_limiter = TokenBucket(rate=requests_per_second, capacity=burst)
+
+    # Keep one pooled keep-alive connection per worker
+    coinbase_http_session(pool_size=max_workers)
+
+    # The end of a window is its last missing candle, so each request runs one candle past it
+    # (the same span as the 300 candle windows of coinbase_fetch_full_history)
+    results = {}
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {
+            executor.submit(
+                coinbase_fetch_historical_candles,
+                window.ticker,
+                window.start.to_pydatetime(),
+                window.end.to_pydatetime() + timedelta(seconds=granularity),
+                granularity,
+                rate_limiter,
+            ): window_number
+            for window_number, window in plan.iterrows()
+        }
+
+        for future in as_completed(futures):
+            window_number = futures[future]
+            try:
+                results[window_number] = future.result()
+                plan.loc[window_number, "rows"] = len(results[window_number])
+            except Exception as e:
+                print(f"Failed to fetch window {plan.at[window_number, 'start']} thru {plan.at[window_number, 'end']} for {plan.at[window_number, 'ticker']}: {e}")
+                plan.loc[window_number, "rows"] = -1
+
+    # ----- Merge the candles into the stored data and update the gap index -----
+    for product_id, product_plan in plan.groupby("ticker", sort=False):
+        fetched = product_plan[product_plan["rows"] >= 0]
+        frames = [results[window_number] for window_number in fetched.index if not results[window_number].empty]
+
+        if frames:
+            new_data = pd.concat(frames)
+            new_data = new_data.rename(columns={'time':'Date'})
+            new_data['Date'] = new_data['Date'].dt.tz_localize(None)
+            new_data = new_data.drop_duplicates(subset="Date", keep="last").sort_values(by="Date").set_index("Date")
+
+            if segment_export == True:
+                # Only the months with new candles are rewritten
+                parquet_write_data(base_directory, new_data, product_id, source, asset_class, timeframe)
+            else:
+                directory = Path(base_directory) / source / asset_class / timeframe
+                ex_data = pd.read_pickle(directory / f"{product_id}.pkl")
+                full_history_df = pd.concat([ex_data, new_data[~new_data.index.isin(ex_data.index)]]).sort_index()
+                export_data(
+                    df=full_history_df,
+                    directory=str(directory),
+                    file_name=f"{product_id}",
+                    excel_export=False,
+                    pickle_export=True,
+                )
+        else:
+            new_data = pd.DataFrame(index=pd.DatetimeIndex([], name="Date"))
+
+        # Windows that were fetched and are still missing are not available from Coinbase
+        gap_index_update(
+            base_directory=base_directory,
+            df=new_data,
+            ticker=product_id,
+            source=source,
+            asset_class=asset_class,
+            timeframe=timeframe,
+            granularity=granularity,
+            checked_ranges=list(zip(fetched["start"], fetched["end"])),
+        )
+
+        if verbose == True:
+            print(f"Fetched {len(new_data)} candles for {timeframe} {product_id} in {len(product_plan)} requests.")
+        else:
+            pass
+
+    if verbose == True:
+        print(f"Time spent waiting on the rate limiter: {rate_limiter.total_wait:.1f} seconds")
+    else:
+        pass
+
+    return plan
+
+if __name__ == "__main__":
+
+    # Example usage - report the cost of repairing the minute data, then repair the most recent gaps
+    for dry_run, max_requests in [(True, None), (False, 1_000)]:
+        plan = coinbase_backfill(
+            base_directory=DATA_DIR,
+            product_ids=["BTC-USD", "ETH-USD", "SOL-USD"],
+            source="Coinbase",
+            asset_class="Cryptocurrencies",
+            timeframe="Minute",
+            granularity=60,
+            start_date=datetime(2020, 1, 1),
+            end_date=datetime.now() - timedelta(days=1),
+            max_requests=max_requests,
+            dry_run=dry_run,
+            verbose=True,
+        )
+        print(plan)
@@ -1,6 +1,8 @@
 import pandas as pd
 import requests
 
+from coinbase_http_session import coinbase_http_get
+
 def coinbase_fetch_available_products(
     base_currency: str,
     quote_currency: str,
@@ -27,7 +29,7 @@ def coinbase_fetch_available_products(
 
     url = 'https://api.exchange.coinbase.com/products'
     try:
-        response = requests.get(url, timeout=10)
+        response = coinbase_http_get(url, timeout=10)
         response.raise_for_status()
         products = response.json()
 
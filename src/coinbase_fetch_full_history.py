@@ -9,10 +9,15 @@ def coinbase_fetch_full_history(
     start: datetime,
     end: datetime,
     granularity: int,
+    missing_ranges: list = None,
 ) -> pd.DataFrame:
     
     """
     Fetch full historical data for a given product from Coinbase Exchange API.
+
+    If missing_ranges is given (e.g., the unchecked runs of the gap index), only
+    those ranges are fetched, so a history with a few holes is repaired without
+    pulling the rest of the data again.
     
     Parameters:
     -----------
@@ -24,6 +29,9 @@ def coinbase_fetch_full_history(
         End time in UTC.
     granularity : int
         Time slice in seconds (e.g., 3600 for hourly candles).
+    missing_ranges : list, optional
+        List of (start, end) tuples to fetch instead of the whole of start thru end.
+        Only the parts of the ranges between start and end are fetched (default is None).
 
     Returns:
     --------
@@ -32,19 +40,39 @@ def coinbase_fetch_full_history(
     """
     
     all_data = []
-    current_start = start
 
-    while current_start < end:
-        current_end = min(current_start + timedelta(seconds=granularity * 300), end)  # Fetch max 300 candles per request
-        df = coinbase_fetch_historical_candles(product_id, current_start, current_end, granularity)
-        if df.empty:
-            break
-        all_data.append(df)
-        current_start = df['time'].iloc[-1] + timedelta(seconds=granularity)
-        time.sleep(0.2)  # Small delay to respect rate limits
+    if missing_ranges is None:
+        fetch_ranges = [(start, end)]
+    else:
+        # Missing ranges include their last candle, so each range is extended by one candle,
+        # and only the parts of the ranges between start and end are kept
+        fetch_ranges = [
+            (max(pd.Timestamp(range_start).to_pydatetime(), start), min(pd.Timestamp(range_end).to_pydatetime() + timedelta(seconds=granularity), end))
+            for range_start, range_end in sorted(missing_ranges)
+        ]
+
+    for range_start, range_end in fetch_ranges:
+        current_start = range_start
+
+        while current_start < range_end:
+            current_end = min(current_start + timedelta(seconds=granularity * 300), range_end)  # Fetch max 300 candles per request
+            df = coinbase_fetch_historical_candles(product_id, current_start, current_end, granularity)
+            if df.empty:
+                # A window inside a missing range can be empty (e.g., an exchange outage)
+                if missing_ranges is not None:
+                    current_start = current_end
+                    time.sleep(0.2)
+                    continue
+                else:
+                    break
+            all_data.append(df)
+            current_start = df['time'].iloc[-1] + timedelta(seconds=granularity)
+            time.sleep(0.2)  # Small delay to respect rate limits
 
     if all_data:
         full_df = pd.concat(all_data).reset_index(drop=True)
+        if missing_ranges is not None:
+            full_df = full_df.drop_duplicates(subset="time", keep="last").sort_values(by="time").reset_index(drop=True)
         return full_df
     else:
         return pd.DataFrame()
@@ -0,0 +1,135 @@
+import pandas as pd
+
+from coinbase_fetch_historical_candles import coinbase_fetch_historical_candles
+from coinbase_http_session import coinbase_http_session, coinbase_http_timings
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timedelta
+from token_bucket import TokenBucket
+
+def coinbase_fetch_full_history_concurrent(
+    product_ranges: dict,
+    granularity: int,
+    max_workers: int = 8,
+    requests_per_second: float = 10,
+    burst: int = 15,
+    verbose: bool = False,
+) -> dict:
+
+    """
+    Fetch full historical data for many products concurrently from Coinbase Exchange API.
+
+    Every (product, 300-candle window) request is scheduled up front on a thread
+    pool. All requests share one token bucket so the combined request rate stays
+    within Coinbase's public rate limit (10 requests per second per IP with bursts
+    of up to 15), and a 429 response pauses every worker. Windows are reassembled
+    in time order for each product.
+
+    Parameters:
+    -----------
+    product_ranges : dict
+        Dictionary of product id (e.g., 'BTC-USD') to a (start, end) tuple of datetimes in UTC.
+    granularity : int
+        Time slice in seconds (e.g., 60 for minute candles, 3600 for hourly candles).
+    max_workers : int, optional
+        Number of concurrent requests in flight (default is 8).
+    requests_per_second : float, optional
+        Sustained request rate shared by all workers (default is 10).
+    burst : int, optional
+        Maximum burst of requests (default is 15).
+    verbose : bool, optional
+        If True, print progress information (default is False).
+
+    Returns:
+    --------
+    dict
+        Dictionary of product id to a DataFrame containing time, low, high, open, close, volume.
+        Products with any window that failed after retries are left out so that an
+        incomplete history is never returned.
+    """
+
+    rate_limiter = TokenBucket(rate=requests_per_second, capacity=burst)
+
+    # Keep one pooled keep-alive connection per worker
+    coinbase_http_session(pool_size=max_workers)
+
+    # Precompute the windows for every product (max 300 candles per request)
+    window_length = timedelta(seconds=granularity * 300)
+    windows = []
+    for product_id, (start, end) in product_ranges.items():
+        window_start = start
+        window_number = 0
+        while window_start < end:
+            window_end = min(window_start + window_length, end)
+            windows.append((product_id, window_number, window_start, window_end))
+            window_start = window_start + window_length
+            window_number += 1
+
+    if verbose == True:
+        print(f"Fetching {len(windows)} windows for {len(product_ranges)} products with {max_workers} workers...")
+
+    results = {product_id: {} for product_id in product_ranges}
+    failed_products = set()
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {
+            executor.submit(
+                coinbase_fetch_historical_candles,
+                product_id,
+                window_start,
+                window_end,
+                granularity,
+                rate_limiter,
+            ): (product_id, window_number)
+            for product_id, window_number, window_start, window_end in windows
+        }
+
+        for future in as_completed(futures):
+            product_id, window_number = futures[future]
+            try:
+                results[product_id][window_number] = future.result()
+            except Exception as e:
+                print(f"Failed to fetch window {window_number} for {product_id}: {e}")
+                failed_products.add(product_id)
+
+    # Reassemble the windows in order for each product
+    full_history = {}
+    for product_id, product_windows in results.items():
+        if product_id in failed_products:
+            continue
+        frames = [product_windows[number] for number in sorted(product_windows) if not product_windows[number].empty]
+        if frames:
+            full_df = pd.concat(frames)
+            full_df = full_df.drop_duplicates(subset="time", keep="last")
+            full_df = full_df.sort_values(by="time").reset_index(drop=True)
+            full_history[product_id] = full_df
+        else:
+            full_history[product_id] = pd.DataFrame()
+
+    if verbose == True:
+        print(f"Time spent waiting on the rate limiter: {rate_limiter.total_wait:.1f} seconds")
+        timings = coinbase_http_timings().attrs["summary"]
+        print(f"HTTP requests: {timings['requests']}, new connections: {timings['new_connections']}, "
+              f"estimated handshake overhead: {timings['estimated_handshake_overhead']:.1f} seconds")
+
+    return full_history
+
+if __name__ == "__main__":
+
+    # Example usage
+    start = datetime(2025, 1, 1)
+    end = datetime(2025, 1, 31)
+
+    data = coinbase_fetch_full_history_concurrent(
+        product_ranges={
+            "BTC-USD": (start, end),
+            "ETH-USD": (start, end),
+            "SOL-USD": (start, end),
+        },
+        granularity=3_600,
+        max_workers=8,
+        verbose=True,
+    )
+
+    for product_id, df in data.items():
+        print(product_id)
+        print(df)
@@ -2,6 +2,7 @@ import pandas as pd
 import requests
 import time
 
+from coinbase_http_session import coinbase_http_get, coinbase_http_timings
 from datetime import datetime
 
 def coinbase_fetch_historical_candles(
@@ -9,6 +10,7 @@ def coinbase_fetch_historical_candles(
     start: datetime,
     end: datetime,
     granularity: int,
+    rate_limiter=None,
 ) -> pd.DataFrame:
 
     """
@@ -24,6 +26,9 @@ def coinbase_fetch_historical_candles(
         End time in UTC.
     granularity : int
         Time slice in seconds (e.g., 60 for minute candles, 3600 for hourly candles, 86,400 for daily candles).
+    rate_limiter : TokenBucket, optional
+        Shared rate limiter to take a token from before each request. On a rate limit
+        error the limiter is paused for all threads that share it.
 
     Returns:
     --------
@@ -43,7 +48,10 @@ def coinbase_fetch_historical_candles(
 
     for attempt in range(max_retries):
         try:
-            response = requests.get(url, params=params, timeout=10)
+            if rate_limiter is not None:
+                rate_limiter.acquire()
+
+            response = coinbase_http_get(url, params=params, timeout=10)
             response.raise_for_status()
             data = response.json()
 
@@ -58,6 +66,8 @@ def coinbase_fetch_historical_candles(
         except requests.exceptions.HTTPError as errh:
             if response.status_code == 429:
                 print(f"Rate limit exceeded. Retrying in {retry_delay} seconds...")
+                if rate_limiter is not None:
+                    rate_limiter.backoff(retry_delay)
                 time.sleep(retry_delay)
                 retry_delay *= 2  # Exponential backoff
             else:
@@ -90,4 +100,7 @@ if __name__ == "__main__":
     if df is not None:
         print(df)
     else:
-        print("No data returned.")
\ No newline at end of file
+        print("No data returned.")
+
+    # Request latency timings
+    print(coinbase_http_timings().attrs["summary"])
\ No newline at end of file
@@ -0,0 +1,156 @@
+import pandas as pd
+import requests
+import threading
+import time
+
+from requests.adapters import HTTPAdapter
+
+# Shared session and per-request timings for all Coinbase Exchange API calls
+_session = None
+_session_pool_size = None
+_session_lock = threading.Lock()
+_timings = []
+_timings_lock = threading.Lock()
+
+def coinbase_http_session(
+    pool_size: int = None,
+) -> requests.Session:
+
+    """
+    Return the shared keep-alive HTTP session for the Coinbase Exchange API.
+
+    The session is created on first use and reused by every caller afterward, so
+    TCP and TLS handshakes happen once per pooled connection instead of once per
+    request. Responses are requested gzip-compressed.
+
+    Parameters:
+    -----------
+    pool_size : int, optional
+        Maximum number of pooled connections kept alive. Should be at least the
+        number of concurrent workers. If None, the current size is kept (10 when
+        the session is first created).
+
+    Returns:
+    --------
+    requests.Session
+        Shared session with connection pooling.
+    """
+
+    global _session, _session_pool_size
+
+    with _session_lock:
+        if _session is None:
+            _session = requests.Session()
+            _session.headers.update({
+                "Accept": "application/json",
+                "Accept-Encoding": "gzip",
+                "Connection": "keep-alive",
+            })
+
+        # Mount a new adapter when the session is created or the pool size changes
+        if _session_pool_size is None or (pool_size is not None and pool_size != _session_pool_size):
+            _session_pool_size = pool_size if pool_size is not None else 10
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=_session_pool_size, pool_block=True)
+            _session.mount("https://", adapter)
+
+    return _session
+
+def coinbase_http_get(
+    url: str,
+    params: dict = None,
+    timeout: float = 10,
+) -> requests.Response:
+
+    """
+    Send a GET request through the shared session and record its latency.
+
+    Each request records the wall-clock latency, the server response time, and
+    whether a new connection had to be opened (i.e., a TCP and TLS handshake was
+    paid). With many concurrent requests the new connection flag is approximate.
+    The timings are available from coinbase_http_timings.
+
+    Parameters:
+    -----------
+    url : str
+        Request URL.
+    params : dict, optional
+        Query string parameters.
+    timeout : float, optional
+        Timeout in seconds (default is 10).
+
+    Returns:
+    --------
+    requests.Response
+        Response object. Errors are left for the caller to handle with raise_for_status.
+    """
+
+    session = coinbase_http_session()
+    pools = session.get_adapter(url).poolmanager.pools
+
+    # Count the connections opened so far across the adapter's connection pools
+    connections_before = sum(pools[key].num_connections for key in pools.keys())
+    start = time.perf_counter()
+    response = session.get(url, params=params, timeout=timeout)
+    latency = time.perf_counter() - start
+    new_connection = sum(pools[key].num_connections for key in pools.keys()) > connections_before
+
+    with _timings_lock:
+        _timings.append({
+            "url": url,
+            "status_code": response.status_code,
+            "latency": latency,
+            "elapsed": response.elapsed.total_seconds(),
+            "new_connection": new_connection,
+            "bytes": len(response.content),
+        })
+
+    return response
+
+def coinbase_http_timings(
+    reset: bool = False,
+) -> pd.DataFrame:
+
+    """
+    Return the latency timings recorded by coinbase_http_get.
+
+    The estimated handshake overhead is the extra mean latency of requests that
+    opened a new connection over requests that reused a pooled connection,
+    multiplied by the number of new connections.
+
+    Parameters:
+    -----------
+    reset : bool, optional
+        If True, clear the recorded timings after returning them (default is False).
+
+    Returns:
+    --------
+    pd.DataFrame
+        DataFrame with one row per request: url, status_code, latency, elapsed,
+        new_connection, bytes. The attrs dictionary holds a summary with the
+        total latency and the estimated handshake overhead in seconds.
+    """
+
+    with _timings_lock:
+        df = pd.DataFrame(_timings, columns=["url", "status_code", "latency", "elapsed", "new_connection", "bytes"])
+        if reset:
+            _timings.clear()
+
+    new_connection = df["new_connection"].astype(bool)
+    new_latency = df.loc[new_connection, "latency"]
+    reused_latency = df.loc[~new_connection, "latency"]
+
+    if not new_latency.empty and not reused_latency.empty:
+        handshake_overhead = max(0.0, (new_latency.mean() - reused_latency.mean()) * len(new_latency))
+    else:
+        handshake_overhead = float("nan")
+
+    df.attrs["summary"] = {
+        "requests": len(df),
+        "new_connections": int(len(new_latency)),
+        "total_latency": float(df["latency"].sum()),
+        "mean_latency_new_connection": float(new_latency.mean()) if not new_latency.empty else float("nan"),
+        "mean_latency_reused_connection": float(reused_latency.mean()) if not reused_latency.empty else float("nan"),
+        "estimated_handshake_overhead": float(handshake_overhead),
+    }
+
+    return df
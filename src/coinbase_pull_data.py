@@ -1,10 +1,18 @@
 import calendar
 import os
 import pandas as pd
+import threading
 
+from coinbase_backfill import coinbase_backfill
 from coinbase_fetch_available_products import coinbase_fetch_available_products
 from coinbase_fetch_full_history import coinbase_fetch_full_history
+from coinbase_fetch_full_history_concurrent import coinbase_fetch_full_history_concurrent
 from datetime import datetime, timedelta
+from export_data import export_data
+from gap_index_update import gap_index_update
+from parquet_append_segment import parquet_append_segment
+from parquet_compact_segments import parquet_compact_segments
+from parquet_read_manifest import parquet_read_manifest
 from settings import config
 
 # Get the data directory from the configuration
@@ -23,6 +31,13 @@ def coinbase_pull_data(
     status: str='online', # default status is 'online'
     start_date: datetime=datetime(2025, 1, 1), # default start date
     end_date: datetime=datetime.now() - timedelta(days=1), # updates data through 1 day ago due to lag in data availability
+    segment_export: bool=False,
+    compaction_threshold: int=24,
+    concurrent_fetch: bool=False,
+    max_workers: int=8,
+    update_gap_index: bool=False,
+    force_existing_check: bool=False,
+    max_backfill_requests: int=None,
 ) -> pd.DataFrame:
     
     """
@@ -54,6 +69,27 @@ def coinbase_pull_data(
         Start date in UTC (ISO format).
     end_date : str, optional
         End date in UTC (ISO format).
+    segment_export : bool, optional
+        If True, append only the candles after the last stored timestamp to the Parquet
+        store as a small segment file instead of rewriting the full history (default is False).
+    compaction_threshold : int, optional
+        Number of segment files per product that triggers a background compaction into
+        the monthly Parquet partitions (default is 24).
+    concurrent_fetch : bool, optional
+        If True, fetch the updates for all products with existing data concurrently,
+        sharing one rate limiter, before processing them (default is False).
+    max_workers : int, optional
+        Number of concurrent requests when concurrent_fetch is True (default is 8).
+    update_gap_index : bool, optional
+        If True, update the gap index (the runs of missing candles) of each product with
+        the candles that were stored (default is False).
+    force_existing_check : bool, optional
+        If True, refetch only the missing candles of the stored data between start_date and
+        end_date before updating (see coinbase_backfill). The number of requests is printed
+        before they are made (default is False).
+    max_backfill_requests : int, optional
+        Maximum number of requests for the missing candles when force_existing_check is True,
+        most recent gaps first (default is None, for no limit).
 
     Returns:
     --------
@@ -77,6 +113,48 @@ def coinbase_pull_data(
     omitted_data = []
     num_products = len(filtered_products_list)
     counter = 0
+    compaction_threads = []
+    prefetched_data = {}
+
+    # Refetch only the missing candles of the stored data
+    if force_existing_check == True:
+        print("Forcing check of existing data...")
+        backfill_time_length = {60: "Minute", 3600: "Hourly", 86400: "Daily"}.get(granularity)
+        coinbase_backfill(
+            base_directory=base_directory,
+            product_ids=filtered_products_list,
+            source=source,
+            asset_class=asset_class,
+            timeframe=backfill_time_length,
+            granularity=granularity,
+            start_date=start_date,
+            end_date=end_date,
+            segment_export=segment_export,
+            max_requests=max_backfill_requests,
+            max_workers=max_workers,
+            verbose=output_confirmation,
+        )
+    else:
+        pass
+
+    # Fetch the updates for all products with existing data concurrently
+    if concurrent_fetch == True:
+        prefetch_time_length = {60: "Minute", 3600: "Hourly", 86400: "Daily"}.get(granularity)
+        manifest = parquet_read_manifest(base_directory, source, asset_class, prefetch_time_length) if segment_export == True else {}
+
+        product_ranges = {}
+        for product in filtered_products_list:
+            if product in manifest:
+                product_ranges[product] = (manifest[product].to_pydatetime() + timedelta(seconds=granularity), end_date)
+            elif os.path.exists(f"{base_directory}/{source}/{asset_class}/{prefetch_time_length}/{product}.pkl"):
+                product_ranges[product] = (start_date, end_date)
+
+        prefetched_data = coinbase_fetch_full_history_concurrent(
+            product_ranges=product_ranges,
+            granularity=granularity,
+            max_workers=max_workers,
+            verbose=output_confirmation,
+        )
 
     # Loop for updates
     for product in filtered_products_list:
@@ -96,6 +174,67 @@ def coinbase_pull_data(
 
         # Set file location based on parameters
         file_location = f"{base_directory}/{source}/{asset_class}/{time_length}/{product}.pkl"
+
+        # Append-only update of the Parquet store for products that already have data there
+        if segment_export == True:
+            manifest = parquet_read_manifest(base_directory, source, asset_class, time_length)
+
+            if product in manifest:
+                try:
+                    print(f"Manifest entry found...appending the {product} data after {manifest[product]}")
+
+                    # Pull only the candles after the last stored timestamp
+                    fetch_start = manifest[product].to_pydatetime() + timedelta(seconds=granularity)
+                    if product in prefetched_data:
+                        new_data = prefetched_data.pop(product)
+                    else:
+                        new_data = coinbase_fetch_full_history(product, fetch_start, end_date, granularity)
+
+                    if new_data.empty:
+                        print(f"No new data for {time_length} {product}.")
+                        continue
+
+                    new_data = new_data.rename(columns={'time':'Date'})
+                    new_data['Date'] = new_data['Date'].dt.tz_localize(None)
+                    full_history_df = new_data.set_index('Date')
+
+                    # Write the new candles as a segment
+                    rows_appended = parquet_append_segment(base_directory, full_history_df, product, source, asset_class, time_length)
+
+                    # Extend the gap index with the appended candles
+                    if update_gap_index == True:
+                        gap_index_update(base_directory, full_history_df, product, source, asset_class, time_length, granularity)
+                    else:
+                        pass
+
+                    # Compact the segments in the background once enough have accumulated
+                    compaction_thread = threading.Thread(
+                        target=parquet_compact_segments,
+                        kwargs={
+                            "base_directory": base_directory,
+                            "ticker": product,
+                            "source": source,
+                            "asset_class": asset_class,
+                            "timeframe": time_length,
+                            "min_segments": compaction_threshold,
+                            "output_confirmation": output_confirmation,
+                        },
+                    )
+                    compaction_thread.start()
+                    compaction_threads.append(compaction_thread)
+
+                    # Output confirmation
+                    if output_confirmation == True:
+                        print(f"Appended {rows_appended} rows for {time_length} {product}.")
+                        print("--------------------")
+                    else:
+                        pass
+
+                    continue
+
+                except Exception as e:
+                    print(f"Failed to append {time_length} {product} data: {e}")
+                    continue
     
         try:
             # Attempt to read existing pickle data file
@@ -106,7 +245,10 @@ def coinbase_pull_data(
             print(ex_data)
 
             # Pull recent data
-            new_data = coinbase_fetch_full_history(product, start_date, end_date, granularity)
+            if product in prefetched_data:
+                new_data = prefetched_data.pop(product)
+            else:
+                new_data = coinbase_fetch_full_history(product, start_date, end_date, granularity)
             new_data = new_data.rename(columns={'time':'Date'})
             new_data['Date'] = new_data['Date'].dt.tz_localize(None)
             print("New data:")
@@ -125,15 +267,25 @@ def coinbase_pull_data(
             directory = f"{base_directory}/{source}/{asset_class}/{time_length}"
             os.makedirs(directory, exist_ok=True)
 
-            # Export to excel
-            if excel_export == True:
-                full_history_df.to_excel(f"{directory}/{product}.xlsx", sheet_name="data")
+            # Export to pickle and queue the export to excel in the background
+            export_data(
+                df=full_history_df,
+                directory=directory,
+                file_name=f"{product}",
+                excel_export=excel_export,
+                pickle_export=pickle_export,
+            )
+
+            # Seed the Parquet store with the full history
+            if segment_export == True:
+                parquet_append_segment(base_directory, full_history_df, product, source, asset_class, time_length)
+                parquet_compact_segments(base_directory, product, source, asset_class, time_length, 1, output_confirmation)
             else:
                 pass
 
-            # Export to pickle
-            if pickle_export == True:
-                full_history_df.to_pickle(f"{directory}/{product}.pkl")
+            # Update the gap index with the stored candles
+            if update_gap_index == True:
+                gap_index_update(base_directory, full_history_df, product, source, asset_class, time_length, granularity)
             else:
                 pass
 
@@ -210,15 +362,25 @@ def coinbase_pull_data(
                 directory = f"{base_directory}/{source}/{asset_class}/{time_length}"
                 os.makedirs(directory, exist_ok=True)
 
-                # Export to excel
-                if excel_export == True:
-                    full_history_df.to_excel(f"{directory}/{product}.xlsx", sheet_name="data")
+                # Export to pickle and queue the export to excel in the background
+                export_data(
+                    df=full_history_df,
+                    directory=directory,
+                    file_name=f"{product}",
+                    excel_export=excel_export,
+                    pickle_export=pickle_export,
+                )
+
+                # Seed the Parquet store with the full history
+                if segment_export == True:
+                    parquet_append_segment(base_directory, full_history_df, product, source, asset_class, time_length)
+                    parquet_compact_segments(base_directory, product, source, asset_class, time_length, 1, output_confirmation)
                 else:
                     pass
 
-                # Export to pickle
-                if pickle_export == True:
-                    full_history_df.to_pickle(f"{directory}/{product}.pkl")
+                # Build the gap index from the full history
+                if update_gap_index == True:
+                    gap_index_update(base_directory, full_history_df, product, source, asset_class, time_length, granularity)
                 else:
                     pass
 
@@ -235,6 +397,10 @@ def coinbase_pull_data(
         except Exception as e:
             print(str(e))
 
+    # Wait for any background compactions to finish
+    for compaction_thread in compaction_threads:
+        compaction_thread.join()
+
     # Remove the cryptocurrencies with missing data from the final list
     missing_data = sorted(missing_data)
     print(f"Data missing for: {missing_data}")
@@ -1,61 +1,75 @@
+import numpy as np
 import pandas as pd
 
+from trade_buffer import TradeBuffer
+
 def compute_daily_performance(
     tickers: list,
     data: pd.DataFrame,
-    trades: pd.DataFrame,
+    trades: pd.DataFrame | TradeBuffer,
     initial_capital: int,
+    freq: str | None = "D",
 ) -> pd.DataFrame:
     
     """
     Computes daily portfolio equity, return, etc. from trades dataframe.
 
+    The trades are turned into step functions of the quantity held per asset and
+    the cash, which only change at the trade event dates. The step functions and
+    the close prices are evaluated at the last bar of each output period, so the
+    equity is never built at the minute level unless freq=None is passed.
+
     Parameters:
     -----------
     tickers : list
         List of crypto tickers, e.g., ["BTC-USD", "ETH-USD", "SOL-USD"].
     data : pd.DataFrame
         DataFrame containing merged price data for all tickers.
-    trades : pd.DataFrame
-        DataFrame of trades from backtest_rsi_multi_asset_strategy.
+    trades : pd.DataFrame | TradeBuffer
+        DataFrame (or TradeBuffer) of trades from backtest_rsi_multi_asset_strategy.
     initial_capital : int
         Initial capital for the portfolio.
+    freq : str | None, optional
+        Output frequency as a pandas offset alias, e.g., "D", "h", "W". If None,
+        the ledger is returned for every bar (default is "D").
 
     Returns:
     --------
     pd.DataFrame
-        DataFrame containing daily data for the portfolio with equity, cash, 
-        returns, positions, drawdowns, and prices.
+        DataFrame containing daily data (or data at the given frequency) for the
+        portfolio with equity, cash, returns, positions, drawdowns, and prices.
     """
 
-    # Copy the data dataframe
-    df = data.copy().set_index("Date")
+    # Views of the trade buffer, without copying the trades
+    if isinstance(trades, TradeBuffer):
+        trades = trades.to_frame()
+    else:
+        pass
 
-    # Filter the entry trades
-    entry_trades_df = trades.copy()
-    entry_trades_df = entry_trades_df[['asset', 'entry_time', 'entry_price', 'quantity', 'entry_fee']]
-    entry_trades_df['cash'] = (entry_trades_df['entry_price'] * entry_trades_df['quantity'] * -1) - entry_trades_df['entry_fee']
-    entry_trades_df['crypto_value'] = entry_trades_df['quantity'] * entry_trades_df['entry_price']
-    entry_trades_df.rename(columns={'entry_time': 'Date'}, inplace=True)
+    # Filter the entry trades (column selection only, no copy of the trades dataframe)
+    entry_trades_df = trades[['asset', 'entry_time', 'entry_price', 'quantity', 'entry_fee']]
+    entry_trades_df = entry_trades_df.assign(
+        cash=(entry_trades_df['entry_price'] * entry_trades_df['quantity'] * -1) - entry_trades_df['entry_fee'],
+    ).rename(columns={'entry_time': 'Date'})
 
     # Filter the exit trades
-    exit_trades_df = trades.copy()
-    exit_trades_df = exit_trades_df[['asset', 'exit_time', 'exit_price', 'quantity', 'exit_fee']]
-    exit_trades_df['cash'] = (exit_trades_df['exit_price'] * exit_trades_df['quantity']) - exit_trades_df['exit_fee']
-    exit_trades_df['quantity'] = exit_trades_df['quantity'] * -1  # Convert quantity to negative for exit
-    exit_trades_df['crypto_value'] = exit_trades_df['quantity'] * exit_trades_df['exit_price']
-    exit_trades_df.rename(columns={'exit_time': 'Date'}, inplace=True)
+    exit_trades_df = trades[['asset', 'exit_time', 'exit_price', 'quantity', 'exit_fee']]
+    exit_trades_df = exit_trades_df.assign(
+        cash=(exit_trades_df['exit_price'] * exit_trades_df['quantity']) - exit_trades_df['exit_fee'],
+        quantity=exit_trades_df['quantity'] * -1,  # Convert quantity to negative for exit
+    ).rename(columns={'exit_time': 'Date'})
 
     # Combine entry and exit trades into a single DataFrame
     ledger_events_df = pd.concat([entry_trades_df, exit_trades_df], ignore_index=True)
     ledger_events_df = ledger_events_df.sort_values('Date')
 
-    # Create pivot table for quantity held by date per asset
+    # Create pivot table for quantity traded by date per asset
     quantity_df = ledger_events_df.pivot_table(
         index='Date',
         columns='asset',
         values='quantity',
         aggfunc='sum',
+        observed=True,
     ).fillna(0)
 
     quantity_df.columns = [f"{col}_qty" for col in quantity_df.columns]
@@ -63,36 +77,52 @@ def compute_daily_performance(
     # Cash flow dataframe
     cash_df = ledger_events_df.groupby('Date')['cash'].sum().to_frame()
 
-    # Combine quantity and cash dataframes into the ledger
+    # Combine quantity and cash dataframes into the ledger (one row per trade event date)
     ledger_qtys_df = pd.concat([quantity_df, cash_df], axis=1).fillna(0)
     ledger_qtys_df = ledger_qtys_df.sort_index()
 
-    # Isolate the daily close prices for each asset
-    price_cols = [f"{ticker}_close" for ticker in tickers]
-    price_df = df[price_cols].copy()
+    # Step functions: cumulative quantities and cash after each event date
+    ledger_steps = ledger_qtys_df.cumsum().to_numpy()
+    event_dates = ledger_qtys_df.index
+    quantity_cols = list(quantity_df.columns)
 
-    # Merge the daily close prices DataFrame into the ledger
-    ledger_qtys_prices_df = ledger_qtys_df.join(price_df, how="outer")
+    # Timeline of the price bars and the trade event dates
+    price_index = pd.DatetimeIndex(data["Date"])
+    bar_index = price_index.union(event_dates)
+    bar_index.name = "Date"
 
-    # Replace all NaN values with 0
-    ledger_qtys_prices_df.fillna(0, inplace=True)
+    # Last bar of each output period (NaN for periods without any bars)
+    bar_numbers = pd.Series(np.arange(len(bar_index)), index=bar_index)
+    if freq is None:
+        period_bars = bar_numbers
+    else:
+        period_bars = bar_numbers.resample(freq).last()
 
-    # Add columns for each asset's cumulative quantity
-    quantity_cols = [col for col in ledger_qtys_prices_df.columns if col.endswith("_qty")]
-    for col in quantity_cols:
-        ledger_qtys_prices_df[col] = ledger_qtys_prices_df[col].cumsum()
+    valid_periods = period_bars.notna().to_numpy()
+    period_dates = bar_index[period_bars[valid_periods].to_numpy(dtype="int64")]
 
-    # Cumulative cash column
-    ledger_qtys_prices_df['cash'] = ledger_qtys_prices_df['cash'].cumsum()
+    # Evaluate the step functions at the last bar of each period
+    event_rows = event_dates.searchsorted(period_dates, side="right") - 1
+    period_steps = np.where((event_rows >= 0)[:, None], ledger_steps[np.maximum(event_rows, 0)], 0.0)
+
+    ledger_qtys_prices_pos = {col: period_steps[:, j] for j, col in enumerate(quantity_cols)}
 
     # Add initial capital amount to cash to represent initial capital
-    ledger_qtys_prices_df['cash'] += initial_capital
+    ledger_qtys_prices_pos['cash'] = period_steps[:, -1] + initial_capital
+
+    # Close prices at the last bar of each period (0 if the price is missing)
+    price_rows = price_index.get_indexer(period_dates)
+    for ticker in tickers:
+        close_nparray = data[f"{ticker}_close"].to_numpy(dtype="float64")
+        period_close = np.where(price_rows >= 0, close_nparray[np.maximum(price_rows, 0)], np.nan)
+        ledger_qtys_prices_pos[f"{ticker}_close"] = np.where(np.isnan(period_close), 0.0, period_close)
 
     # Establish position columns for each asset
-    ledger_qtys_prices_pos_df = ledger_qtys_prices_df.copy()
     for col in quantity_cols:
         asset_symbol = col.replace("_qty", "")
-        ledger_qtys_prices_pos_df[f"{asset_symbol}_position"] = ledger_qtys_prices_pos_df[col] * ledger_qtys_prices_pos_df[f"{asset_symbol}_close"]
+        ledger_qtys_prices_pos[f"{asset_symbol}_position"] = ledger_qtys_prices_pos[col] * ledger_qtys_prices_pos[f"{asset_symbol}_close"]
+
+    ledger_qtys_prices_pos_df = pd.DataFrame(ledger_qtys_prices_pos, index=period_bars.index[valid_periods])
 
     # Re-arrange the columns to have date, cash, then quantities, prices, positions grouped by asset
     asset_symbols = []
@@ -106,9 +136,8 @@ def compute_daily_performance(
     # Calculate total portfolio value
     ledger_qtys_prices_pos_df['equity'] = ledger_qtys_prices_pos_df['cash'] + ledger_qtys_prices_pos_df[[col for col in ledger_qtys_prices_pos_df.columns if col.endswith('_position')]].sum(axis=1)
 
-    # Reindex ledger to daily using last price for the day
-    daily_ledger_qtys_prices_pos_df = ledger_qtys_prices_pos_df.copy()
-    daily_ledger_qtys_prices_pos_df = daily_ledger_qtys_prices_pos_df.resample("D").last()
+    # Periods without any bars are left empty
+    daily_ledger_qtys_prices_pos_df = ledger_qtys_prices_pos_df.reindex(period_bars.index)
 
     # Drop the columns where any of the crypto asset prices = 0
     price_cols = [col for col in daily_ledger_qtys_prices_pos_df.columns if col.endswith("_close")]
@@ -0,0 +1,133 @@
+import numpy as np
+import pandas as pd
+
+def create_signals_vectorized(
+    tickers: list,
+    data: pd.DataFrame,
+    # --- RSI settings ---
+    use_rsi: bool,
+    rsi_threshold: int,
+    # --- MA settings ---
+    use_ma: bool,
+    ma_days: list,
+    # --- Bollinger settings ---
+    use_bbands: bool,
+    bb_rule: str = "touch_lower",  # {"touch_lower", "cross_up_from_below", "below_lower"}
+) -> pd.DataFrame:
+    """
+    Generate entry signals combining RSI, optional MA filter, and optional Bollinger Bands, for all tickers at once.
+
+    Same rules as create_signals, evaluated on NumPy arrays of the indicator columns
+    (the data frame is not copied). The rules fill one (time x ticker) mask, and the
+    signal rows are gathered from its nonzero entries, so the table comes out sorted
+    by time (and by ticker order within a timestamp) without a sort.
+
+    Notes:
+    - Same columns as create_signals, with 'asset' as a categorical of the tickers
+      (asset.cat.codes is the position of the ticker in tickers).
+    - The Bollinger band values are NaN (instead of pd.NA) when use_bbands is False.
+    - use_ma=False means no MA filter (ma_passes = 0, allocation_pct = 1.0).
+    - BB rules:
+        * "touch_lower": close_prev <= lower_prev  (default)
+        * "below_lower": close_prev  < lower_prev  (strict)
+        * "cross_up_from_below": close_prev crosses from < lower_prev to >= lower_prev (uses previous bar of prev-close)
+    """
+
+    n = len(data)
+
+    # (time x ticker) entry mask and MA passes
+    mask = np.zeros((n, len(tickers)), dtype=bool)
+    ma_passes = np.zeros((n, len(tickers)), dtype="int64")
+
+    for ticker_number, ticker in enumerate(tickers):
+        # --- RSI mask ---
+        if use_rsi:
+            rsi_col = f"{ticker}_RSI_prev"
+            if rsi_col not in data.columns:
+                # No RSI -> this ticker yields no signals
+                continue
+            ticker_mask = data[rsi_col].to_numpy(dtype="float64") < rsi_threshold
+        else:
+            ticker_mask = np.ones(n, dtype=bool)
+
+        # --- MA mask ---
+        if use_ma and ma_days:
+            ma_cols = [f"{ticker}_MA_{day}d_prev" for day in ma_days if f"{ticker}_MA_{day}d_prev" in data.columns]
+            if not ma_cols:
+                # MA periods requested but none present → this ticker yields no signals
+                continue
+
+            close = data[f"{ticker}_close"].to_numpy(dtype="float64")
+            for col in ma_cols:
+                ma_passes[:, ticker_number] += close > data[col].to_numpy(dtype="float64")
+            ticker_mask &= ma_passes[:, ticker_number] >= 1
+        else:
+            pass
+
+        # --- Bollinger Bands mask ---
+        if use_bbands:
+            close_prev = data[f"{ticker}_close_prev"].to_numpy(dtype="float64")
+            low_prev = data[f"{ticker}_BB_LOWER_prev"].to_numpy(dtype="float64")
+
+            # Choose BB rule
+            if bb_rule == "below_lower":
+                ticker_mask &= close_prev < low_prev
+            elif bb_rule == "cross_up_from_below":
+                prev_below = np.zeros(n, dtype=bool)
+                prev_below[1:] = close_prev[:-1] < low_prev[:-1]
+                ticker_mask &= prev_below & (close_prev >= low_prev)
+            else:  # "touch_lower"
+                ticker_mask &= close_prev <= low_prev
+        else:
+            pass
+
+        mask[:, ticker_number] = ticker_mask
+
+    # Signal rows in time order, then ticker order
+    rows, ticker_numbers = np.nonzero(mask)
+
+    signals = {"Date": data["Date"].to_numpy()[rows]}
+
+    # Gather the price columns for each ticker's signal rows
+    for column in ["open", "high", "low", "close", "close_prev"]:
+        if not all(f"{ticker}_{column}" in data.columns for ticker in tickers):
+            continue
+        values = np.empty(len(rows), dtype="float64")
+        for ticker_number, ticker in enumerate(tickers):
+            selected = ticker_numbers == ticker_number
+            values[selected] = data[f"{ticker}_{column}"].to_numpy(dtype="float64")[rows[selected]]
+        signals[column] = values
+
+    signals["asset"] = pd.Categorical.from_codes(ticker_numbers, categories=tickers)
+    signals["ma_passes"] = ma_passes[rows, ticker_numbers]
+    if use_ma and ma_days:
+        signals["allocation_pct"] = signals["ma_passes"] / len(ma_days)
+    else:
+        signals["allocation_pct"] = np.ones(len(rows))  # full allocation if no MAs
+    signals["bb_rule"] = bb_rule if use_bbands else pd.NA
+
+    # Band values at the signal rows (negative z means below mid; ~-2 at/below lower band)
+    for band, column in [("MID", "bb_mid_prev"), ("UPPER", "bb_up_prev"), ("LOWER", "bb_low_prev"), ("Z", "bb_z_prev")]:
+        values = np.full(len(rows), np.nan)
+        if use_bbands:
+            for ticker_number, ticker in enumerate(tickers):
+                selected = ticker_numbers == ticker_number
+                values[selected] = data[f"{ticker}_BB_{band}_prev"].to_numpy(dtype="float64")[rows[selected]]
+        signals[column] = values
+
+    signals_df = pd.DataFrame(signals)
+
+    # De-dup (1 per asset per timestamp) for repeated timestamps in the data
+    if not signals_df.empty:
+        signals_df = signals_df[~signals_df.duplicated(subset=["Date", "asset"])].reset_index(drop=True)
+
+    # Same column order as create_signals
+    signals_df = signals_df[[
+        col for col in [
+            "Date", "open", "high", "low", "close", "close_prev", "asset",
+            "ma_passes", "allocation_pct",
+            "bb_rule", "bb_mid_prev", "bb_up_prev", "bb_low_prev", "bb_z_prev",
+        ] if col in signals_df.columns
+    ]]
+
+    return signals_df
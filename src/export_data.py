@@ -0,0 +1,156 @@
+import atexit
+import pandas as pd
+import threading
+
+from concurrent.futures import ThreadPoolExecutor
+from settings import config
+
+# Maximum number of rows in an Excel worksheet
+EXCEL_MAX_ROWS = 1_048_576
+
+# Background workers and pending exports for Excel and CSV files
+_executor = None
+_executor_lock = threading.Lock()
+_pending = []
+_pending_lock = threading.Lock()
+
+def export_data(
+    df: pd.DataFrame,
+    directory: str,
+    file_name: str,
+    excel_export: bool,
+    pickle_export: bool,
+    csv_export: bool = False,
+    background: bool = True,
+) -> None:
+
+    """
+    Export data to Pickle now and to Excel and CSV in the background.
+
+    The Pickle file is written before returning. Excel and CSV exports are slow
+    and only meant for reading the data, so they are queued to a background
+    thread pool (use export_data_wait to wait for them). DataFrames longer than
+    the Excel row limit are split across the sheets 'data', 'data_2', 'data_3',
+    etc. Excel and CSV exports are skipped entirely if SKIP_TEXT_EXPORTS is set
+    to True in the environment (e.g., for batch runs).
+
+    The DataFrame must not be modified in place after it is passed to this
+    function.
+
+    Parameters:
+    -----------
+    df : pd.DataFrame
+        DataFrame to export.
+    directory : str
+        Directory to write the files to.
+    file_name : str
+        File name without extension (e.g., 'AAPL' or 'AAPL_ME').
+    excel_export : bool
+        If True, export data to Excel format.
+    pickle_export : bool
+        If True, export data to Pickle format.
+    csv_export : bool, optional
+        If True, export data to CSV format (default is False).
+    background : bool, optional
+        If True, write the Excel and CSV files in the background (default is True).
+
+    Returns:
+    --------
+    None
+    """
+
+    # Export to pickle
+    if pickle_export == True:
+        df.to_pickle(f"{directory}/{file_name}.pkl")
+    else:
+        pass
+
+    # Skip human-readable exports for batch runs
+    if config("SKIP_TEXT_EXPORTS", default=False, cast=bool) == True:
+        return
+
+    tasks = []
+
+    # Export to excel
+    if excel_export == True:
+        tasks.append((_export_excel, df, f"{directory}/{file_name}.xlsx"))
+    else:
+        pass
+
+    # Export to csv
+    if csv_export == True:
+        tasks.append((_export_csv, df, f"{directory}/{file_name}.csv"))
+    else:
+        pass
+
+    for function, task_df, location in tasks:
+        if background == True:
+            future = _get_executor().submit(function, task_df, location)
+            with _pending_lock:
+                _pending.append((location, future))
+        else:
+            function(task_df, location)
+
+def export_data_wait() -> int:
+
+    """
+    Wait for all queued Excel and CSV exports to finish.
+
+    Returns:
+    --------
+    int
+        Number of exports completed.
+
+    Raises:
+    -------
+    Exception
+        If any export failed, after waiting for all of the exports.
+    """
+
+    with _pending_lock:
+        pending = _pending.copy()
+        _pending.clear()
+
+    errors = []
+    for location, future in pending:
+        try:
+            future.result()
+        except Exception as e:
+            errors.append(f"{location}: {e}")
+
+    if errors:
+        raise Exception(f"Failed to export {len(errors)} file(s): " + "; ".join(errors))
+
+    return len(pending)
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="export_data")
+    return _executor
+
+def _export_excel(df: pd.DataFrame, location: str) -> None:
+    # Leave a row for the header in each sheet
+    rows_per_sheet = EXCEL_MAX_ROWS - 1
+
+    if len(df) <= rows_per_sheet:
+        df.to_excel(location, sheet_name="data")
+        return
+
+    with pd.ExcelWriter(location) as writer:
+        for sheet_number, start in enumerate(range(0, len(df), rows_per_sheet), start=1):
+            sheet_name = "data" if sheet_number == 1 else f"data_{sheet_number}"
+            df.iloc[start:start + rows_per_sheet].to_excel(writer, sheet_name=sheet_name)
+
+def _export_csv(df: pd.DataFrame, location: str) -> None:
+    df.to_csv(location)
+
+def _export_data_exit() -> None:
+    # Do not lose queued exports when a script finishes
+    try:
+        export_data_wait()
+    except Exception as e:
+        print(e)
+
+atexit.register(_export_data_exit)
@@ -0,0 +1,142 @@
+import numpy as np
+
+# Optional compiled kernel (pip install numba); the NumPy chunked scan is used without it
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+def _trailing_stop_exit_loop(
+    open_nparray: np.ndarray,
+    high_nparray: np.ndarray,
+    low_nparray: np.ndarray,
+    start: int,
+    entry_price: float,
+    trailing_stop_pct: float,
+) -> tuple[int, float, bool]:
+    # Sequential scan that stops at the first breach, compiled with numba when available
+    stop_factor = 1.0 - trailing_stop_pct
+    peak_price = entry_price
+    for i in range(start, len(low_nparray)):
+        # Running peak; a missing high makes the peak NaN from here on, like np.maximum.accumulate
+        high = high_nparray[i]
+        if high != high or peak_price != peak_price:
+            peak_price = np.nan
+        elif high > peak_price:
+            peak_price = high
+        stop_price = peak_price * stop_factor
+
+        # Breach: low <= stop; gap-breach on the same bar -> exit at open
+        if low_nparray[i] <= stop_price:
+            if open_nparray[i] <= stop_price:
+                return i, open_nparray[i], True
+            return i, stop_price, False
+
+    return -1, np.nan, False
+
+if NUMBA_AVAILABLE == True:
+    _trailing_stop_exit_kernel = njit(cache=True, nogil=True)(_trailing_stop_exit_loop)
+else:
+    _trailing_stop_exit_kernel = None
+
+def find_trailing_stop_exit(
+    open_nparray: np.ndarray,
+    high_nparray: np.ndarray,
+    low_nparray: np.ndarray,
+    start: int,
+    entry_price: float,
+    trailing_stop_pct: float,
+    chunk_size: int = 256,
+    max_chunk_size: int = 65536,
+    use_numba: bool = False,
+) -> tuple[int, float, str, int] | None:
+
+    """
+    Find the first trailing stop exit after an entry, scanning the bars in chunks.
+
+    Same result as the whole-suffix search in backtest_rsi_multi_asset_strategy
+    (running peak never below the entry price, stop = peak * (1 - trailing_stop_pct),
+    exit at the open if the bar gaps through the stop and at the stop price
+    otherwise), but the scan stops at the chunk containing the exit instead of
+    processing every bar to the end of the data. The running peak is carried from
+    one chunk to the next, and the chunk size doubles after each chunk without an
+    exit. With use_numba, a compiled sequential loop checks one bar at a time and
+    returns at the first breach; if numba is not installed, the NumPy chunked
+    scan is used instead.
+
+    Parameters:
+    -----------
+    open_nparray : np.ndarray
+        Open prices for the ticker.
+    high_nparray : np.ndarray
+        High prices for the ticker.
+    low_nparray : np.ndarray
+        Low prices for the ticker.
+    start : int
+        Index of the entry bar.
+    entry_price : float
+        Entry price of the position.
+    trailing_stop_pct : float
+        Trailing stop percentage as a decimal (e.g., 0.02).
+    chunk_size : int, optional
+        Number of bars in the first chunk (default is 256).
+    max_chunk_size : int, optional
+        Maximum number of bars in a chunk (default is 65536).
+    use_numba : bool, optional
+        If True, use the numba compiled kernel when numba is installed (default
+        is False).
+
+    Returns:
+    --------
+    tuple[int, float, str, int] | None
+        Index of the exit bar, exit price, exit type ('exit at open (gap)' or
+        'trailing stop'), and number of bars scanned, or None if there is no exit
+        before the end of the data.
+    """
+
+    if use_numba == True and NUMBA_AVAILABLE == True:
+        i, exit_price, gap = _trailing_stop_exit_kernel(
+            open_nparray, high_nparray, low_nparray, start, float(entry_price), float(trailing_stop_pct)
+        )
+        if i < 0:
+            return None
+        elif gap == True:
+            return i, float(exit_price), "exit at open (gap)", i - start + 1
+        else:
+            return i, float(exit_price), "trailing stop", i - start + 1
+    else:
+        pass
+
+    n = len(low_nparray)
+    position = start
+    peak_price = entry_price
+
+    while position < n:
+        end = min(position + chunk_size, n)
+
+        o_sub = open_nparray[position:end]
+        h_sub = high_nparray[position:end]
+        l_sub = low_nparray[position:end]
+
+        # Running peak (never below entry price), continued from the previous chunk
+        peak = np.maximum.accumulate(np.maximum(h_sub, peak_price))
+        stop_price = peak * (1.0 - trailing_stop_pct)
+
+        # First breach in the chunk: low <= stop
+        br_idx = np.flatnonzero(l_sub <= stop_price)
+
+        if br_idx.size:
+            i = int(br_idx[0])
+
+            # Gap-breach on the same bar takes precedence -> exit at open
+            if o_sub[i] <= stop_price[i]:
+                return position + i, float(o_sub[i]), "exit at open (gap)", end - start
+            else:
+                return position + i, float(stop_price[i]), "trailing stop", end - start
+
+        peak_price = peak[-1]
+        position = end
+        chunk_size = min(chunk_size * 2, max_chunk_size)
+
+    return None
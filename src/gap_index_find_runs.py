@@ -0,0 +1,63 @@
+import numpy as np
+import pandas as pd
+
+def gap_index_find_runs(
+    dates,
+    granularity: int,
+    start=None,
+    end=None,
+) -> pd.DataFrame:
+
+    """
+    Find the runs of missing bars in a series of timestamps.
+
+    The runs are found from the differences between consecutive timestamps, so the
+    cost grows with the number of bars that are present rather than with the number
+    of bars that should be present (no full date range is built). A run is recorded
+    wherever two consecutive timestamps are at least two bars apart, i.e., at least
+    one whole bar is missing. Timestamps that are not exactly on the bar grid (e.g.,
+    daily bars that move by an hour with daylight saving time) do not create runs.
+
+    Parameters:
+    -----------
+    dates : array-like
+        Timestamps of the bars that are present (any order, duplicates are allowed).
+    granularity : int
+        Length of a bar in seconds (e.g., 60 for minute bars, 3600 for hourly bars).
+    start : datetime, optional
+        First timestamp that should be present. If given, the bars missing between
+        start and the first timestamp are included, and earlier timestamps are ignored.
+    end : datetime, optional
+        Last timestamp that should be present. If given, the bars missing between the
+        last timestamp and end are included, and later timestamps are ignored.
+
+    Returns:
+    --------
+    pd.DataFrame
+        DataFrame with one row per run and the columns 'start' and 'end' (the first and
+        last missing timestamps of the run, inclusive), sorted by start.
+    """
+
+    step = np.int64(granularity) * 1_000_000_000  # nanoseconds
+
+    # Sorted, unique, timezone naive timestamps in nanoseconds
+    dates = pd.DatetimeIndex(dates)
+    if dates.tz is not None:
+        dates = dates.tz_localize(None)
+    points = np.unique(dates.as_unit("ns").asi8)
+
+    # The bars just outside the bounds count as present
+    if start is not None:
+        start = pd.Timestamp(start).value
+        points = np.concatenate([[start - step], points[points >= start]])
+    if end is not None:
+        end = pd.Timestamp(end).value
+        points = np.concatenate([points[points <= end], [end + step]])
+
+    # At least one whole bar is missing between consecutive timestamps
+    gap = np.diff(points) >= 2 * step
+
+    return pd.DataFrame({
+        "start": (points[:-1][gap] + step).view("datetime64[ns]"),
+        "end": (points[1:][gap] - step).view("datetime64[ns]"),
+    })
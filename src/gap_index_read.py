@@ -0,0 +1,62 @@
+import json
+import pandas as pd
+
+from pathlib import Path
+
+def gap_index_read(
+    base_directory,
+    ticker: str,
+    source: str,
+    asset_class: str,
+    timeframe: str,
+) -> pd.DataFrame:
+
+    """
+    Read the gap index of a ticker, i.e., the runs of missing bars in its stored data.
+
+    The gap index is kept at {base_directory}/{source}/{asset_class}/{timeframe}/_gaps/{ticker}.json
+    and is updated by gap_index_update.
+
+    Parameters:
+    -----------
+    base_directory
+        Root path where the data is stored.
+    ticker : str
+        Ticker symbol of the data.
+    source : str
+        Name of the data source (e.g., 'Coinbase').
+    asset_class : str
+        Asset class name (e.g., 'Cryptocurrencies').
+    timeframe : str
+        Timeframe for the data (e.g., 'Minute', 'Daily').
+
+    Returns:
+    --------
+    pd.DataFrame
+        DataFrame with one row per run and the columns 'start', 'end' (the first and last
+        missing timestamps, inclusive) and 'checked' (True if the range was refetched
+        and the source had no data for it). The first and last indexed timestamps and
+        the bar length in seconds are in attrs["first"], attrs["last"] and
+        attrs["granularity"], which are None if there is no gap index yet.
+    """
+
+    gaps_file = Path(base_directory) / source / asset_class / timeframe / "_gaps" / f"{ticker}.json"
+
+    try:
+        with open(gaps_file, "r") as f:
+            gap_index = json.load(f)
+    except FileNotFoundError:
+        gap_index = {"first": None, "last": None, "granularity": None, "gaps": []}
+
+    runs = gap_index["gaps"]
+    gaps_df = pd.DataFrame({
+        "start": pd.to_datetime([run[0] for run in runs]).as_unit("ns"),
+        "end": pd.to_datetime([run[1] for run in runs]).as_unit("ns"),
+        "checked": pd.Series([run[2] for run in runs], dtype="bool"),
+    })
+
+    gaps_df.attrs["first"] = pd.Timestamp(gap_index["first"]) if gap_index["first"] is not None else None
+    gaps_df.attrs["last"] = pd.Timestamp(gap_index["last"]) if gap_index["last"] is not None else None
+    gaps_df.attrs["granularity"] = gap_index["granularity"]
+
+    return gaps_df
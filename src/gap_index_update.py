@@ -0,0 +1,168 @@
+import numpy as np
+import pandas as pd
+
+from gap_index_find_runs import gap_index_find_runs
+from gap_index_read import gap_index_read
+from gap_index_write import gap_index_write
+
+def gap_index_update(
+    base_directory,
+    df: pd.DataFrame,
+    ticker: str,
+    source: str,
+    asset_class: str,
+    timeframe: str,
+    granularity: int,
+    checked_ranges: list = None,
+) -> pd.DataFrame:
+
+    """
+    Update the gap index of a ticker with newly stored bars.
+
+    Only the new bars are scanned. Bars before the first or after the last indexed
+    timestamp extend the index with the runs found between them and the indexed
+    span. Bars inside the indexed span fill existing runs, and only the runs that
+    received bars are split again (in one vectorised pass over their bars); all
+    other runs are kept as they are. The first call for a ticker builds the index
+    from all of the bars given.
+
+    Parameters:
+    -----------
+    base_directory
+        Root path where the data is stored.
+    df : pd.DataFrame
+        DataFrame containing the new (or all) stored bars with 'Date' as the index or as a column.
+    ticker : str
+        Ticker symbol of the data.
+    source : str
+        Name of the data source (e.g., 'Coinbase').
+    asset_class : str
+        Asset class name (e.g., 'Cryptocurrencies').
+    timeframe : str
+        Timeframe for the data (e.g., 'Minute', 'Daily').
+    granularity : int
+        Length of a bar in seconds (e.g., 60 for minute bars, 3600 for hourly bars).
+    checked_ranges : list, optional
+        List of (start, end) tuples that were just refetched. Runs inside these ranges
+        that are still missing are marked as checked, because the source has no data
+        for them (e.g., exchange outages, or nights and weekends for equities). A range
+        that starts before the first indexed timestamp extends the index back to its start.
+
+    Returns:
+    --------
+    pd.DataFrame
+        The updated gap index (see gap_index_read).
+    """
+
+    # Move 'Date' to a column if it is the index
+    if "Date" not in df.columns:
+        df = df.reset_index()
+        if "Date" not in df.columns:
+            raise ValueError("❌ DataFrame must have a 'Date' index or column.")
+
+    dates = pd.DatetimeIndex(df["Date"])
+    if dates.tz is not None:
+        dates = dates.tz_localize(None)
+    dates = np.unique(dates.as_unit("ns").asi8)
+
+    gaps_df = gap_index_read(base_directory, ticker, source, asset_class, timeframe)
+
+    if gaps_df.attrs["granularity"] is not None and gaps_df.attrs["granularity"] != granularity:
+        raise Exception(f"Invalid granularity: {granularity}. The gap index for {timeframe} {ticker} uses {gaps_df.attrs['granularity']}.")
+
+    if len(dates) == 0 and gaps_df.attrs["first"] is None:
+        return gaps_df
+
+    if gaps_df.attrs["first"] is None:
+        # Build the index from all of the bars
+        runs = gap_index_find_runs(dates, granularity)
+        runs["checked"] = False
+        first, last = dates[0], dates[-1]
+
+    else:
+        first, last = gaps_df.attrs["first"].value, gaps_df.attrs["last"].value
+        starts = gaps_df["start"].to_numpy().astype("int64")
+        ends = gaps_df["end"].to_numpy().astype("int64")
+
+        # Find the run (if any) that each bar inside the indexed span falls in
+        inside = dates[(dates > first) & (dates < last)]
+        run_numbers = np.searchsorted(starts, inside, side="right") - 1
+        in_run = run_numbers >= 0
+        in_run[in_run] = inside[in_run] <= ends[run_numbers[in_run]]
+        inside, run_numbers = inside[in_run], run_numbers[in_run]
+
+        # Split only the runs that received bars, all in one pass: the bars of each filled run
+        # are placed between the bars just outside the run (which count as present)
+        filled_runs, first_bars, bar_counts = np.unique(run_numbers, return_index=True, return_counts=True)
+        step = np.int64(granularity) * 1_000_000_000  # nanoseconds
+        run_offsets = first_bars + 2 * np.arange(len(filled_runs))
+        points = np.empty(len(inside) + 2 * len(filled_runs), dtype="int64")
+        points[run_offsets] = starts[filled_runs] - step
+        points[run_offsets + bar_counts + 1] = ends[filled_runs] + step
+        points[np.arange(len(inside)) + 2 * np.repeat(np.arange(len(filled_runs)), bar_counts) + 1] = inside
+
+        # At least one whole bar is missing between consecutive timestamps of the same run
+        gap = np.diff(points) >= 2 * step
+        gap[run_offsets[1:] - 1] = False
+        point_runs = np.repeat(filled_runs, bar_counts + 2)[:-1][gap]
+
+        frames = [
+            gaps_df.drop(index=gaps_df.index[filled_runs]),
+            pd.DataFrame({
+                "start": (points[:-1][gap] + step).view("datetime64[ns]"),
+                "end": (points[1:][gap] - step).view("datetime64[ns]"),
+                "checked": gaps_df["checked"].to_numpy()[point_runs],
+            }),
+        ]
+
+        # Extend the index with the bars before the first and after the last indexed timestamp
+        before = dates[dates < first]
+        if len(before) > 0:
+            runs = gap_index_find_runs(np.append(before, first), granularity)
+            runs["checked"] = False
+            frames.append(runs)
+            first = before[0]
+
+        after = dates[dates > last]
+        if len(after) > 0:
+            runs = gap_index_find_runs(np.insert(after, 0, last), granularity)
+            runs["checked"] = False
+            frames.append(runs)
+            last = after[-1]
+
+        runs = pd.concat(frames, ignore_index=True)
+
+    # A refetch before the first bar extends the indexed span back to the start of the refetch
+    if checked_ranges:
+        checked_first = min(pd.Timestamp(range_start).value for range_start, _ in checked_ranges)
+        if checked_first < first:
+            head_runs = gap_index_find_runs([first], granularity, start=pd.Timestamp(checked_first))
+            runs = pd.concat([head_runs.assign(checked=False), runs], ignore_index=True)
+            first = checked_first
+
+    runs = runs.sort_values(by="start", kind="mergesort").reset_index(drop=True)
+
+    # Runs that are still missing after a refetch are not available from the source
+    if checked_ranges:
+        checked_ranges = sorted((pd.Timestamp(range_start).value, pd.Timestamp(range_end).value) for range_start, range_end in checked_ranges)
+        range_starts = np.array([range_start for range_start, _ in checked_ranges], dtype="int64")
+        range_ends = np.maximum.accumulate(np.array([range_end for _, range_end in checked_ranges], dtype="int64"))
+
+        # Merge ranges that touch, so a run refetched in several windows counts as covered
+        step = np.int64(granularity) * 1_000_000_000  # nanoseconds
+        new_range = np.ones(len(range_starts), dtype=bool)
+        new_range[1:] = range_starts[1:] > range_ends[:-1] + step
+        range_starts = range_starts[new_range]
+        range_ends = np.append(range_ends[np.flatnonzero(new_range)[1:] - 1], range_ends[-1])
+
+        range_numbers = np.searchsorted(range_starts, runs["start"].to_numpy().astype("int64"), side="right") - 1
+        covered = (range_numbers >= 0) & (runs["end"].to_numpy().astype("int64") <= range_ends[np.maximum(range_numbers, 0)])
+        runs.loc[covered, "checked"] = True
+
+    runs.attrs["first"] = pd.Timestamp(first)
+    runs.attrs["last"] = pd.Timestamp(last)
+    runs.attrs["granularity"] = granularity
+
+    gap_index_write(base_directory, runs, ticker, source, asset_class, timeframe)
+
+    return runs
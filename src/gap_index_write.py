@@ -0,0 +1,61 @@
+import json
+import os
+
+from pathlib import Path
+
+def gap_index_write(
+    base_directory,
+    gaps_df,
+    ticker: str,
+    source: str,
+    asset_class: str,
+    timeframe: str,
+) -> None:
+
+    """
+    Write the gap index of a ticker.
+
+    The gap index is written to a hidden temporary file and then renamed over
+    {base_directory}/{source}/{asset_class}/{timeframe}/_gaps/{ticker}.json so that
+    readers never see a partial file. Each run is stored as [start, end, checked].
+
+    Parameters:
+    -----------
+    base_directory
+        Root path where the data is stored.
+    gaps_df : pd.DataFrame
+        DataFrame with the columns 'start', 'end' and 'checked', and the first and last
+        indexed timestamps and the bar length in seconds in attrs["first"],
+        attrs["last"] and attrs["granularity"] (see gap_index_read).
+    ticker : str
+        Ticker symbol of the data.
+    source : str
+        Name of the data source (e.g., 'Coinbase').
+    asset_class : str
+        Asset class name (e.g., 'Cryptocurrencies').
+    timeframe : str
+        Timeframe for the data (e.g., 'Minute', 'Daily').
+
+    Returns:
+    --------
+    None
+    """
+
+    gaps_directory = Path(base_directory) / source / asset_class / timeframe / "_gaps"
+    os.makedirs(gaps_directory, exist_ok=True)
+
+    gap_index = {
+        "first": gaps_df.attrs["first"].isoformat(),
+        "last": gaps_df.attrs["last"].isoformat(),
+        "granularity": int(gaps_df.attrs["granularity"]),
+        "gaps": [
+            [start.isoformat(), end.isoformat(), bool(checked)]
+            for start, end, checked in zip(gaps_df["start"], gaps_df["end"], gaps_df["checked"])
+        ],
+    }
+
+    gaps_file = gaps_directory / f"{ticker}.json"
+    temp_gaps_file = gaps_directory / f".{ticker}.json.tmp"
+    with open(temp_gaps_file, "w") as f:
+        json.dump(gap_index, f)
+    os.replace(temp_gaps_file, gaps_file)
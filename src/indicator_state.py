@@ -0,0 +1,490 @@
+import math
+import numpy as np
+import os
+import pandas as pd
+import pickle
+
+from collections import deque
+
+# Relative loss of precision that triggers a recompute of the rolling variance
+# (the same tolerance as pandas: about 3 significant digits remaining)
+INV_COND_TOL = np.finfo(np.float64).eps * 1e3
+
+class IndicatorState:
+
+    """
+    Incremental RSI, moving average, and Bollinger band state for crypto assets.
+
+    Holds the running state of the calculations in add_rsi_ma_bb (the Wilder EWM
+    of calculate_rsi, the rolling means, and the rolling mean and standard
+    deviation of the Bollinger bands) so that new bars can be processed without
+    recomputing the full history. Each update advances the state by the new rows
+    only, in O(new bars).
+
+    The updates replicate the pandas ewm (adjust=False) and rolling mean and
+    variance algorithms step by step, including their Kahan-compensated sums
+    and the recompute of the variance window after a loss of precision, so the
+    output is bit-for-bit the same as running add_rsi_ma_bb over the full
+    history. The first update processes the full history once. The state is
+    tied to the rows of the merged data, so the same tickers and start date
+    must be used for every update.
+
+    Parameters:
+    -----------
+    tickers : list
+        List of crypto tickers, e.g., ["BTC-USD", "ETH-USD", "SOL-USD"].
+    rsi_period : int
+        RSI lookback period.
+    ma_days : list
+        List of moving average durations in days.
+    bb_window : int
+        Bollinger band lookback window in rows.
+    bb_num_std : float
+        Number of standard deviations for the upper and lower bands.
+
+    Example:
+    --------
+    >>> state = IndicatorState.load(base_directory=DATA_DIR, tickers=tickers, rsi_period=14,
+    ...     ma_days=[7, 30], bb_window=20, bb_num_std=2)
+    >>> df = state.update(data)
+    >>> state.save(base_directory=DATA_DIR)
+    """
+
+    def __init__(
+        self,
+        tickers: list,
+        rsi_period: int,
+        ma_days: list,
+        bb_window: int,
+        bb_num_std: float,
+    ):
+        self.tickers = list(tickers)
+        self.rsi_period = rsi_period
+        self.ma_days = list(ma_days)
+        self.bb_window = bb_window
+        self.bb_num_std = bb_num_std
+        self.last_date = None
+        self.rows = 0
+
+        self.series = {}
+        for ticker in self.tickers:
+            self.series[ticker] = {
+                "close": np.nan,
+                "rsi": np.nan,
+                "avg_gain": _ewm_state(),
+                "avg_loss": _ewm_state(),
+                "ma": {day: _rolling_state(window=1440 * day) for day in self.ma_days},  # 1440 minutes in a day
+                "ma_last": {day: np.nan for day in self.ma_days},
+                "bb_mean": _rolling_state(window=bb_window),
+                "bb_var": _rolling_state(window=bb_window),
+            }
+
+    def matches(
+        self,
+        tickers: list,
+        rsi_period: int,
+        ma_days: list,
+        bb_window: int,
+        bb_num_std: float,
+    ) -> bool:
+
+        """
+        Check whether the state was created with the same tickers and parameters.
+        """
+
+        return (
+            self.tickers == list(tickers)
+            and self.rsi_period == rsi_period
+            and self.ma_days == list(ma_days)
+            and self.bb_window == bb_window
+            and self.bb_num_std == bb_num_std
+        )
+
+    def update(
+        self,
+        data: pd.DataFrame,
+    ) -> pd.DataFrame:
+
+        """
+        Advance the state by the rows after the last processed date.
+
+        Parameters:
+        -----------
+        data : pd.DataFrame
+            DataFrame containing merged price data for all tickers with a 'Date'
+            column, e.g., from load_crypto_data. Rows up to the last processed
+            date are ignored, so the full merged data can be passed.
+
+        Returns:
+        --------
+        pd.DataFrame
+            The new rows with the same columns as add_rsi_ma_bb.
+        """
+
+        # Keep only the new rows
+        if self.last_date is not None:
+            data = data[data["Date"] > self.last_date]
+
+        df = data.copy()
+
+        if df.empty:
+            return df
+
+        # Division by zero gives inf or NaN, as in pandas
+        with np.errstate(divide="ignore", invalid="ignore"):
+            for ticker in self.tickers:
+                self._update_ticker(df, ticker)
+
+        self.last_date = df["Date"].iloc[-1]
+        self.rows += len(df)
+
+        return df
+
+    def _update_ticker(
+        self,
+        df: pd.DataFrame,
+        ticker: str,
+    ) -> None:
+        state = self.series[ticker]
+        close = df[f"{ticker}_close"].to_numpy(dtype="float64")
+
+        # Shift close by 1 row
+        close_prev = np.concatenate(([state["close"]], close[:-1]))
+        df[f"{ticker}_close_prev"] = close_prev
+
+        # ----- RSI -----
+
+        # Same operations as calculate_rsi, continued from the last close
+        delta = pd.Series(np.concatenate(([state["close"]], close))).diff()[1:]
+        gain = delta.clip(lower=0)
+        loss = -delta.clip(upper=0)
+
+        avg_gain = _ewm_update(state["avg_gain"], gain.to_numpy(), alpha=1/self.rsi_period)
+        avg_loss = _ewm_update(state["avg_loss"], loss.to_numpy(), alpha=1/self.rsi_period)
+
+        rs = avg_gain / avg_loss
+        rsi = 100 - (100 / (1 + rs))
+        df[f"{ticker}_RSI"] = rsi
+        df[f"{ticker}_RSI_prev"] = np.concatenate(([state["rsi"]], rsi[:-1]))
+
+        # ----- Moving Averages -----
+
+        for day in self.ma_days:
+            ma = _rolling_mean_update(state["ma"][day], close, min_periods=1)
+            df[f"{ticker}_MA_{day}d"] = ma
+            df[f"{ticker}_MA_{day}d_prev"] = np.concatenate(([state["ma_last"][day]], ma[:-1]))
+            state["ma_last"][day] = ma[-1]
+
+        # ----- Bollinger Bands -----
+
+        bb_mid = _rolling_mean_update(state["bb_mean"], close_prev, min_periods=self.bb_window)
+        bb_std = _zsqrt(_rolling_var_update(state["bb_var"], close_prev, min_periods=self.bb_window))
+        df[f"{ticker}_BB_MID_prev"] = bb_mid
+        df[f"{ticker}_BB_STD_prev"] = bb_std
+        df[f"{ticker}_BB_UPPER_prev"] = bb_mid + (self.bb_num_std * bb_std)
+        df[f"{ticker}_BB_LOWER_prev"] = bb_mid - (self.bb_num_std * bb_std)
+        df[f"{ticker}_BB_Z_prev"] = (close_prev - bb_mid) / bb_std
+
+        state["close"] = close[-1]
+        state["rsi"] = rsi[-1]
+
+    def save(
+        self,
+        base_directory,
+        source: str = "Coinbase",
+        asset_class: str = "Cryptocurrencies",
+        timeframe: str = "Minute",
+        file_name: str = "indicator_state",
+    ) -> None:
+
+        """
+        Save the state next to the price data.
+
+        The file is written to '{base_directory}/{source}/{asset_class}/{timeframe}/{file_name}.pkl'
+        through a temporary file, so an interrupted save does not corrupt the
+        previous state.
+        """
+
+        directory = f"{base_directory}/{source}/{asset_class}/{timeframe}"
+        os.makedirs(directory, exist_ok=True)
+
+        location = f"{directory}/{file_name}.pkl"
+        with open(f"{location}.tmp", "wb") as file:
+            pickle.dump(self, file, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(f"{location}.tmp", location)
+
+    @classmethod
+    def load(
+        cls,
+        base_directory,
+        tickers: list,
+        rsi_period: int,
+        ma_days: list,
+        bb_window: int,
+        bb_num_std: float,
+        source: str = "Coinbase",
+        asset_class: str = "Cryptocurrencies",
+        timeframe: str = "Minute",
+        file_name: str = "indicator_state",
+    ) -> "IndicatorState":
+
+        """
+        Load the saved state, or create a new one.
+
+        A new state is returned if no state was saved or if the saved state was
+        created with different tickers or parameters.
+        """
+
+        location = f"{base_directory}/{source}/{asset_class}/{timeframe}/{file_name}.pkl"
+
+        try:
+            with open(location, "rb") as file:
+                state = pickle.load(file)
+        except FileNotFoundError:
+            print(f"File not found...creating a new indicator state.")
+            return cls(tickers, rsi_period, ma_days, bb_window, bb_num_std)
+
+        if state.matches(tickers, rsi_period, ma_days, bb_window, bb_num_std) == False:
+            print(f"Indicator state parameters changed...creating a new indicator state.")
+            return cls(tickers, rsi_period, ma_days, bb_window, bb_num_std)
+
+        return state
+
+def _ewm_state() -> dict:
+    return {"weighted": np.nan, "old_wt": 1.0, "nobs": 0}
+
+def _rolling_state(window: int) -> dict:
+    return {
+        "window": window,
+        "values": deque(maxlen=window),
+        "nobs": 0,
+        "neg_ct": 0,
+        "sum_x": 0.0,
+        "mean_x": 0.0,
+        "ssqdm_x": 0.0,
+        "compensation_add": 0.0,
+        "compensation_remove": 0.0,
+        "numerically_unstable": False,
+        "num_consecutive_same_value": 0,
+        "prev_value": np.nan,
+    }
+
+def _prep_values(values: np.ndarray) -> list:
+    # pandas converts inf to NaN before the window calculations
+    return np.where(np.isinf(values), np.nan, values).tolist()
+
+def _zsqrt(values: np.ndarray) -> np.ndarray:
+    # Square root with negative variances set to 0, as in pandas
+    with np.errstate(invalid="ignore"):
+        result = np.sqrt(values)
+    result[values < 0] = 0
+    return result
+
+def _ewm_update(state: dict, values: np.ndarray, alpha: float) -> np.ndarray:
+    # Step through pandas ewm mean with adjust=False and ignore_na=False
+    com = (1 - alpha) / alpha
+    alpha = 1. / (1. + com)
+    old_wt_factor = 1. - alpha
+    new_wt = alpha
+
+    weighted = state["weighted"]
+    old_wt = state["old_wt"]
+    nobs = state["nobs"]
+
+    output = np.empty(len(values), dtype="float64")
+    for i, cur in enumerate(_prep_values(values)):
+        is_observation = cur == cur
+        nobs += is_observation
+        if weighted == weighted:
+            old_wt *= old_wt_factor
+            if is_observation:
+                # avoid numerical errors on constant series
+                if weighted != cur:
+                    if com == 1:
+                        # update in case of irregular-interval series
+                        new_wt = 1. - old_wt
+                    weighted = old_wt * weighted + new_wt * cur
+                    weighted /= (old_wt + new_wt)
+                old_wt = 1.
+        elif is_observation:
+            weighted = cur
+
+        output[i] = weighted if nobs >= 1 else np.nan
+
+    state["weighted"] = weighted
+    state["old_wt"] = old_wt
+    state["nobs"] = nobs
+
+    return output
+
+def _rolling_mean_update(state: dict, values: np.ndarray, min_periods: int) -> np.ndarray:
+    # Step through pandas rolling mean (Kahan summation over a fixed window)
+    window = state["window"]
+    buffer = state["values"]
+    nobs = state["nobs"]
+    neg_ct = state["neg_ct"]
+    sum_x = state["sum_x"]
+    compensation_add = state["compensation_add"]
+    compensation_remove = state["compensation_remove"]
+    num_consecutive_same_value = state["num_consecutive_same_value"]
+    prev_value = state["prev_value"]
+
+    output = np.empty(len(values), dtype="float64")
+    for i, val in enumerate(_prep_values(values)):
+        # Remove the value leaving the window
+        if len(buffer) == window:
+            old = buffer[0]
+            if old == old:
+                nobs -= 1
+                y = - old - compensation_remove
+                t = sum_x + y
+                compensation_remove = t - sum_x - y
+                sum_x = t
+                if math.copysign(1., old) < 0:
+                    neg_ct -= 1
+        buffer.append(val)
+
+        # Add the new value
+        if val == val:
+            nobs += 1
+            y = val - compensation_add
+            t = sum_x + y
+            compensation_add = t - sum_x - y
+            sum_x = t
+            if math.copysign(1., val) < 0:
+                neg_ct += 1
+            if val == prev_value:
+                num_consecutive_same_value += 1
+            else:
+                num_consecutive_same_value = 1
+            prev_value = val
+
+        if nobs >= min_periods and nobs > 0:
+            result = sum_x / nobs
+            if num_consecutive_same_value >= nobs:
+                result = prev_value
+            elif neg_ct == 0 and result < 0:
+                result = 0
+            elif neg_ct == nobs and result > 0:
+                result = 0
+        else:
+            result = np.nan
+        output[i] = result
+
+    state["nobs"] = nobs
+    state["neg_ct"] = neg_ct
+    state["sum_x"] = sum_x
+    state["compensation_add"] = compensation_add
+    state["compensation_remove"] = compensation_remove
+    state["num_consecutive_same_value"] = num_consecutive_same_value
+    state["prev_value"] = prev_value
+
+    return output
+
+def _rolling_var_update(state: dict, values: np.ndarray, min_periods: int, ddof: int = 1) -> np.ndarray:
+    # Step through pandas rolling variance (Welford's method with Kahan summation)
+    window = state["window"]
+    buffer = state["values"]
+
+    min_periods = max(min_periods, 1)
+
+    output = np.empty(len(values), dtype="float64")
+    for i, val in enumerate(_prep_values(values)):
+        # Remove the value leaving the window
+        if len(buffer) == window:
+            _remove_var(state, buffer[0])
+        buffer.append(val)
+
+        # Add the new value
+        _add_var(state, val)
+
+        # Recompute the window from scratch after a possible catastrophic cancellation
+        if state["numerically_unstable"] == True:
+            state["nobs"] = 0
+            state["mean_x"] = state["ssqdm_x"] = 0.0
+            state["compensation_add"] = state["compensation_remove"] = 0.0
+            for value in buffer:
+                _add_var(state, value)
+            state["numerically_unstable"] = False
+
+        nobs = state["nobs"]
+        if nobs >= min_periods and nobs > ddof:
+            output[i] = state["ssqdm_x"] / (nobs - ddof)
+        else:
+            output[i] = np.nan
+
+    return output
+
+def _add_var(state: dict, val: float) -> None:
+    if val != val:
+        return
+
+    prev_m2 = state["ssqdm_x"]
+    mean_x = state["mean_x"]
+    compensation = state["compensation_add"]
+
+    state["nobs"] += 1
+    prev_mean = mean_x - compensation
+    y = val - compensation
+    t = y - mean_x
+    state["compensation_add"] = t + mean_x - y
+    mean_x = mean_x + t / state["nobs"]
+    state["mean_x"] = mean_x
+    state["ssqdm_x"] = prev_m2 + (val - prev_mean) * (val - mean_x)
+
+    if prev_m2 * INV_COND_TOL > state["ssqdm_x"]:
+        state["numerically_unstable"] = True
+
+def _remove_var(state: dict, val: float) -> None:
+    if val != val:
+        return
+
+    state["nobs"] -= 1
+    if state["nobs"]:
+        prev_m2 = state["ssqdm_x"]
+        mean_x = state["mean_x"]
+        compensation = state["compensation_remove"]
+
+        prev_mean = mean_x - compensation
+        y = val - compensation
+        t = y - mean_x
+        state["compensation_remove"] = t + mean_x - y
+        mean_x = mean_x - t / state["nobs"]
+        state["mean_x"] = mean_x
+        state["ssqdm_x"] = prev_m2 - (val - prev_mean) * (val - mean_x)
+
+        if prev_m2 * INV_COND_TOL > state["ssqdm_x"]:
+            state["numerically_unstable"] = True
+    else:
+        state["mean_x"] = 0.0
+        state["ssqdm_x"] = 0.0
+        state["numerically_unstable"] = False
+
+if __name__ == "__main__":
+
+    from load_crypto_data import load_crypto_data
+    from settings import config
+
+    # Get the environment variable for where data is stored
+    DATA_DIR = config("DATA_DIR")
+
+    tickers = ["BTC-USD", "ETH-USD", "SOL-USD"]
+
+    # Example usage
+    state = IndicatorState.load(
+        base_directory=DATA_DIR,
+        tickers=tickers,
+        rsi_period=14,
+        ma_days=[7, 30],
+        bb_window=20,
+        bb_num_std=2,
+    )
+    data = load_crypto_data(
+        tickers=tickers,
+        base_directory=DATA_DIR,
+        start_date="2025-01-01",
+        end_date=None,
+    )
+    df = state.update(data)
+    state.save(base_directory=DATA_DIR)
+    print(df.tail())
@@ -1,17 +1,65 @@
+import numpy as np
 import pandas as pd
 
 from load_data import load_data
 
+def _load_ticker_data(
+    ticker: str,
+    base_directory,
+    file_format: str,
+    start: pd.Timestamp,
+    end: pd.Timestamp,
+    columns: list = None,
+) -> pd.DataFrame:
+    # Load one ticker and keep only the rows in [start, end], sorted by date
+    temp_df = load_data(
+        base_directory=base_directory,
+        ticker=ticker,
+        source="Coinbase",
+        asset_class="Cryptocurrencies",
+        timeframe="Minute",
+        file_format=file_format,
+        start=start,
+        end=end,
+        columns=columns,
+    )
+    if file_format == "csv" or file_format == "excel":
+        temp_df = temp_df.set_index("Date")
+    else:
+        pass
+    temp_df.index = pd.to_datetime(temp_df.index)
+
+    # The Parquet read already applies the date filter; other formats are filtered per file
+    if start is not None:
+        temp_df = temp_df[temp_df.index >= start]
+    if end is not None:
+        temp_df = temp_df[temp_df.index <= end]
+
+    if not temp_df.index.is_monotonic_increasing:
+        temp_df = temp_df.sort_index(kind="mergesort")
+    if not temp_df.index.is_unique:
+        temp_df = temp_df[~temp_df.index.duplicated(keep="last")]
+    return temp_df
+
 def load_crypto_data(
     tickers: list,
     base_directory,
     start_date: str,
     end_date: str,
+    file_format: str = "pickle",
+    dtype: str = "float64",
 ) -> pd.DataFrame:
     
     """
     Loads minute-level data for multiple crypto tickers from Coinbase source.
 
+    The union of the timestamps of all tickers is built once, and each ticker's
+    prices are copied into a preallocated block aligned to it (no repeated outer
+    merges of the full frame). The date filter is applied to each file as it is
+    read, and pushed down into the read for the 'parquet' format. For the
+    'parquet' format only the dates are read in the first pass and the prices
+    are read one ticker at a time, so the peak memory is about the size of the
+    result plus one ticker.
 
     Parameters:
     -----------
@@ -23,6 +71,10 @@ def load_crypto_data(
         Optional start date for filtering data, e.g., "2023-01-01".
     end_date : str
         Optional end date for filtering data, e.g., "2023-12-31".
+    file_format : str, optional
+        Format of the stored data ('pickle', 'parquet', 'csv', or 'excel') (default is 'pickle').
+    dtype : str, optional
+        Data type for the price and volume columns, 'float64' or 'float32' (default is 'float64').
 
     Returns:
     --------
@@ -30,41 +82,55 @@ def load_crypto_data(
         DataFrame containing merged price data for all tickers.
     """
 
-    # Create empty DataFrame
-    df = pd.DataFrame()
-    
+    if dtype not in ["float64", "float32"]:
+        raise Exception(f"Invalid dtype: {dtype}. Acceptable dtypes are: ['float64', 'float32'].")
+
+    start = pd.to_datetime(start_date) if start_date else None
+    end = pd.to_datetime(end_date) if end_date else None
+
+    # ----- Pass 1: dates for every ticker -----
+    ticker_dates = {}
+    ticker_data = {}
     for ticker in tickers:
-        # Load data
-        temp_df = load_data(
-            base_directory=base_directory,
-            ticker=ticker,
-            source="Coinbase",
-            asset_class="Cryptocurrencies",
-            timeframe="Minute",
-            file_format="pickle",
-        )
-        temp_df.index = pd.to_datetime(temp_df.index)
-        temp_df = temp_df.sort_index()
+        if file_format == "parquet":
+            # Dates only; the prices are read again in pass 2
+            temp_df = _load_ticker_data(ticker, base_directory, file_format, start, end, columns=[])
+        else:
+            # The whole file has to be read, so keep the filtered prices as a compact array
+            temp_df = _load_ticker_data(ticker, base_directory, file_format, start, end)
+            ticker_data[ticker] = (list(temp_df.columns), temp_df.to_numpy(dtype=dtype))
+
+        ticker_dates[ticker] = temp_df.index
+        del temp_df
+
+    # Union of the timestamps, sorted
+    dates = pd.DatetimeIndex([])
+    for ticker in tickers:
+        dates = ticker_dates[ticker] if len(dates) == 0 else dates.union(ticker_dates[ticker])
+    dates = dates.rename("Date")
+
+    # ----- Pass 2: copy each ticker into its own block aligned to the union -----
+    frames = [pd.DataFrame({"Date": dates})]
+    for ticker in tickers:
+        if file_format == "parquet":
+            temp_df = _load_ticker_data(ticker, base_directory, file_format, start, end)
+            columns, values = list(temp_df.columns), temp_df.to_numpy(dtype=dtype)
+            del temp_df
+        else:
+            columns, values = ticker_data.pop(ticker)
+
+        # Column-major block so the dataframe can use it without a copy
+        block = np.full((len(dates), len(columns)), np.nan, dtype=dtype, order="F")
+        block[dates.get_indexer(ticker_dates.pop(ticker))] = values
+        del values
 
         # Rename columns
-        temp_df = temp_df.rename(columns={
-            "open": f"{ticker}_open",
-            "high": f"{ticker}_high",
-            "low": f"{ticker}_low",
-            "close": f"{ticker}_close",
-            "volume": f"{ticker}_volume",
-        })
-
-        # Merge the data
-        df = pd.merge(df, temp_df, how="outer", left_index=True, right_index=True)
-
-    # Apply date filtering if specified
-    if start_date:
-        df = df[df.index >= pd.to_datetime(start_date)]
-    if end_date:
-        df = df[df.index <= pd.to_datetime(end_date)]
-
-    # Reset index
-    df = df.reset_index()
-
-    return df
\ No newline at end of file
+        columns = [
+            f"{ticker}_{col}" if col in ["open", "high", "low", "close", "volume"] else col
+            for col in columns
+        ]
+        frames.append(pd.DataFrame(block, columns=columns, copy=False))
+
+    df = pd.concat(frames, axis=1)
+
+    return df
@@ -1,4 +1,7 @@
 import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+
 from pathlib import Path
 
 def load_data(
@@ -8,15 +11,22 @@ def load_data(
     asset_class: str,
     timeframe: str,
     file_format: str,
+    start=None,
+    end=None,
+    columns: list = None,
 ) -> pd.DataFrame:
     
     """
-    Load data from a CSV, Excel, or Pickle file into a pandas DataFrame.
+    Load data from a CSV, Excel, Pickle file, or the partitioned Parquet store into a pandas DataFrame.
 
     This function attempts to read a file first as a CSV, then as an Excel file 
     (specifically looking for a sheet named 'data' and using the 'calamine' engine).
     If both attempts fail, a ValueError is raised.
 
+    For the 'parquet' format, the date range and column selection are pushed down
+    into the read so that only the matching year-month partitions, row groups, and
+    columns are loaded from disk.
+
     Parameters:
     -----------
     base_directory
@@ -30,7 +40,13 @@ def load_data(
     timeframe : str
         Timeframe for the data (e.g., 'Daily', 'Month_End').
     file_format : str
-        Format of the file to load ('csv', 'excel', or 'pickle')
+        Format of the file to load ('csv', 'excel', 'pickle', or 'parquet')
+    start : str or datetime, optional
+        First date to load (inclusive). Only used for the 'parquet' format.
+    end : str or datetime, optional
+        Last date to load (inclusive). Only used for the 'parquet' format.
+    columns : list, optional
+        Columns to load in addition to 'Date'. Only used for the 'parquet' format.
 
     Returns:
     --------
@@ -45,6 +61,7 @@ def load_data(
     Example:
     --------
     >>> df = load_data(DATA_DIR, "^VIX", "Yahoo_Finance", "Indices")
+    >>> df = load_data(DATA_DIR, "BTC-USD", "Coinbase", "Cryptocurrencies", "Minute", "parquet", start="2025-01-01", columns=["close"])
     """
 
     if file_format == "csv":
@@ -62,5 +79,55 @@ def load_data(
         df = pd.read_pickle(pickle_path)
         return df
     
+    elif file_format == "parquet":
+        dataset_path = Path(base_directory) / source / asset_class / timeframe / ticker
+        partitioning = ds.partitioning(pa.schema([("year_month", pa.string())]), flavor="hive")
+        dataset = ds.dataset(dataset_path, format="parquet", partitioning=partitioning)
+
+        # Build the filter on both the partition key and the Date column so that
+        # whole months are pruned and row groups are skipped using their statistics
+        partition_expression = None
+        date_expression = None
+        if start is not None:
+            start = pd.Timestamp(start)
+            partition_expression = ds.field("year_month") >= start.strftime("%Y-%m")
+            date_expression = ds.field("Date") >= pa.scalar(start.to_pydatetime())
+        if end is not None:
+            end = pd.Timestamp(end)
+            end_partition_expression = ds.field("year_month") <= end.strftime("%Y-%m")
+            end_date_expression = ds.field("Date") <= pa.scalar(end.to_pydatetime())
+            partition_expression = end_partition_expression if partition_expression is None else partition_expression & end_partition_expression
+            date_expression = end_date_expression if date_expression is None else date_expression & end_date_expression
+        filter_expression = None if date_expression is None else partition_expression & date_expression
+
+        # Append-only segments that have not been compacted yet are stored in the
+        # hidden _segments directory, which the partitioned dataset ignores
+        segments_path = dataset_path / "_segments"
+        segment_dataset = ds.dataset(segments_path, format="parquet") if segments_path.exists() else None
+
+        # Read only the requested columns
+        if columns is None:
+            schema = dataset.schema if dataset.files else segment_dataset.schema
+            read_columns = [name for name in schema.names if name != "year_month"]
+        else:
+            read_columns = ["Date"] + [col for col in columns if col != "Date"]
+
+        frames = []
+        if dataset.files:
+            frames.append(dataset.to_table(columns=read_columns, filter=filter_expression).to_pandas())
+        if segment_dataset is not None and segment_dataset.files:
+            frames.append(segment_dataset.to_table(columns=read_columns, filter=date_expression).to_pandas())
+
+        if not frames:
+            raise FileNotFoundError(f"❌ No Parquet data found at {dataset_path}.")
+
+        # Segments are newer than the partitions, so keep the last row for any duplicate date
+        df = pd.concat(frames, ignore_index=True) if len(frames) > 1 else frames[0]
+        df = df.sort_values(by="Date", kind="mergesort")
+        if len(frames) > 1:
+            df = df.drop_duplicates(subset="Date", keep="last")
+        df = df.set_index("Date")
+        return df
+
     else:
-        raise ValueError(f"❌ Unsupported file format: {file_format}. Please use 'csv', 'excel', or 'pickle'.")
\ No newline at end of file
+        raise ValueError(f"❌ Unsupported file format: {file_format}. Please use 'csv', 'excel', 'pickle', or 'parquet'.")
\ No newline at end of file
@@ -0,0 +1,64 @@
+import numpy as np
+import pandas as pd
+
+def ndl_fill_dividend(
+    df: pd.DataFrame,
+) -> pd.DataFrame:
+
+    """
+    Forward fill the dividend until the end of the month in which it was paid.
+
+    Dividends of 0 are replaced with NaN. The first dividend of a month is
+    carried forward to the following days of the same month, so that the
+    month-end resample keeps the dividend paid during the month.
+
+    Parameters:
+    -----------
+    df : pd.DataFrame
+        Daily data with a 'Dividend' column and a 'Date' column or index.
+
+    Returns:
+    --------
+    pd.DataFrame
+        Copy of the DataFrame with the forward filled 'Dividend' column.
+    """
+
+    df = df.copy()
+
+    # Replace any instances of 0 dividend with np.nan
+    df['Dividend'] = df['Dividend'].replace(0.00, np.nan)
+
+    dates = pd.DatetimeIndex(df['Date'] if 'Date' in df.columns else df.index)
+    dividends = df['Dividend'].to_numpy(dtype=float, copy=True)
+    is_dividend = ~np.isnan(dividends)
+
+    # The current month, year and dividend only change at a dividend entry in a
+    # new month, so loop over the dividend entries and forward fill the state
+    current_month = None
+    current_year = None
+    current_dividend = None
+    state = pd.DataFrame(np.nan, index=np.arange(len(df)), columns=['month', 'year', 'dividend'])
+
+    for position in np.flatnonzero(is_dividend):
+        date = dates[position]
+
+        # Check if it's a new month
+        if date.month != current_month:
+            current_month = date.month
+            current_year = date.year
+            current_dividend = dividends[position]
+
+        state.iloc[position] = [current_month, current_year, current_dividend]
+
+    state = state.ffill()
+
+    # Forward fill the dividend until the end of the month
+    fill = (
+        ~is_dividend
+        & (dates.month.to_numpy() == state['month'].to_numpy())
+        & (dates.year.to_numpy() == state['year'].to_numpy())
+    )
+    dividends[fill] = state['dividend'].to_numpy()[fill]
+    df['Dividend'] = dividends
+
+    return df
@@ -1,8 +1,9 @@
-import numpy as np
 import os
 import pandas as pd
 
+from export_data import export_data, export_data_wait
 from IPython.display import display
+from ndl_fill_dividend import ndl_fill_dividend
 
 def ndl_month_end(
     base_directory,
@@ -43,36 +44,17 @@ def ndl_month_end(
     # Set location from where to read existing excel file
     location = f"{base_directory}/{source}/{asset_class}/Daily/{ticker}.xlsx"
 
+    # Wait for any queued export of the daily excel file
+    export_data_wait()
+
     # Read data from excel
     df = pd.read_excel(location, sheet_name="data", engine="calamine")
     
     # Keep only required columns
     df = df[['Date', 'Close', 'Dividend']]
 
-    # Replace any instances of 0 dividend with np.nan
-    df['Dividend'] = df['Dividend'].replace(0.00, np.nan)
-    
-    # Create variables
-    current_month = None
-    current_year = None
-    current_dividend = None
-
-    # Loop through the dataframes and forward fill the dividend
-    for index, row in df.iterrows():
-        date = row['Date']
-        dividend = row['Dividend']
-
-        # Check if it's a dividend entry
-        if pd.notnull(dividend):
-            # Check if it's a new month
-            if date.month != current_month:
-                current_month = date.month
-                current_year = date.year
-                current_dividend = dividend
-
-        # Forward fill the dividend until the end of the month
-        if pd.isnull(dividend) and date.month == current_month and date.year == current_year:
-            df.at[index, 'Dividend'] = current_dividend
+    # Forward fill the dividend until the end of the month
+    df = ndl_fill_dividend(df)
 
     # Set index to date column
     df.set_index('Date', inplace=True)
@@ -84,17 +66,14 @@ def ndl_month_end(
     directory = f"{base_directory}/{source}/{asset_class}/Month_End"
     os.makedirs(directory, exist_ok=True)
 
-    # Export to excel
-    if excel_export == True:
-        df_month_end.to_excel(f"{directory}/{ticker}_ME.xlsx", sheet_name="data")
-    else:
-        pass
-
-    # Export to pickle
-    if pickle_export == True:
-        df_month_end.to_pickle(f"{directory}/{ticker}_ME.pkl")
-    else:
-        pass
+    # Export to pickle and queue the export to excel in the background
+    export_data(
+        df=df_month_end,
+        directory=directory,
+        file_name=f"{ticker}_ME",
+        excel_export=excel_export,
+        pickle_export=pickle_export,
+    )
         
     # Output confirmation
     if output_confirmation == True:
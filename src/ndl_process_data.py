@@ -8,11 +8,9 @@ Nasdaq Data Link, then:
 * Resample to quarter end total return data
 """
 
+from ndl_fill_dividend import ndl_fill_dividend
 from ndl_pull_data import ndl_pull_data
-from ndl_month_end import ndl_month_end
-from ndl_month_end_total_return import ndl_month_end_total_return
-from ndl_quarter_end import ndl_quarter_end
-from ndl_quarter_end_total_return import ndl_quarter_end_total_return
+from resample_data import resample_data
 from settings import config
 
 # Get the environment variable for where data is stored
@@ -27,7 +25,7 @@ equities = ["AMZN", "AAPL"]
 # Iterate through each stock
 for stock in equities:
     # Fetch raw data
-    ndl_pull_data(
+    df = ndl_pull_data(
         base_directory=DATA_DIR,
         ticker=stock,
         source="Nasdaq_Data_Link",
@@ -37,45 +35,20 @@ for stock in equities:
         output_confirmation=True,
     )
 
-    # Resample to month-end data
-    ndl_month_end(
-        base_directory=DATA_DIR,
-        ticker=stock,
-        source="Nasdaq_Data_Link",
-        asset_class="Equities",
-        excel_export=True,
-        pickle_export=True,
-        output_confirmation=True,
-    )
-
-    # Resample to month-end total return data
-    ndl_month_end_total_return(
-        base_directory=DATA_DIR,
-        ticker=stock,
-        source="Nasdaq_Data_Link",
-        asset_class="Equities",
-        excel_export=True,
-        pickle_export=True,
-        output_confirmation=True,
-    )
-
-    # Resample to quarter-end data
-    ndl_quarter_end(
-        base_directory=DATA_DIR,
-        ticker=stock,
-        source="Nasdaq_Data_Link",
-        asset_class="Equities",
-        excel_export=True,
-        pickle_export=True,
-        output_confirmation=True,
-    )
-
-    # Resample to quarter-end total return data
-    ndl_quarter_end_total_return(
+    # Resample to month-end, month-end total return, quarter-end and quarter-end
+    # total return data in one pass, with the dividend filled to the end of the month
+    resample_data(
         base_directory=DATA_DIR,
+        df=ndl_fill_dividend(df),
         ticker=stock,
         source="Nasdaq_Data_Link",
         asset_class="Equities",
+        columns={
+            "ME": ["Close", "Dividend"],
+            "ME_TR": ["adj_close"],
+            "QE": ["Close"],
+            "QE_TR": ["adj_close"],
+        },
         excel_export=True,
         pickle_export=True,
         output_confirmation=True,
@@ -104,40 +77,7 @@ etfs = [
 # Iterate through each ETF
 for fund in etfs:
     # Fetch raw data
-    ndl_pull_data(
-        base_directory=DATA_DIR,
-        ticker=fund,
-        source="Nasdaq_Data_Link",
-        asset_class="Exchange_Traded_Funds",
-        excel_export=True,
-        pickle_export=True,
-        output_confirmation=True,
-    )
-
-    # Resample to month-end data
-    ndl_month_end(
-        base_directory=DATA_DIR,
-        ticker=fund,
-        source="Nasdaq_Data_Link",
-        asset_class="Exchange_Traded_Funds",
-        excel_export=True,
-        pickle_export=True,
-        output_confirmation=True,
-    )
-
-    # Resample to month-end total return data
-    ndl_month_end_total_return(
-        base_directory=DATA_DIR,
-        ticker=fund,
-        source="Nasdaq_Data_Link",
-        asset_class="Exchange_Traded_Funds",
-        excel_export=True,
-        pickle_export=True,
-        output_confirmation=True,
-    )
-
-    # Resample to quarter-end data
-    ndl_quarter_end(
+    df = ndl_pull_data(
         base_directory=DATA_DIR,
         ticker=fund,
         source="Nasdaq_Data_Link",
@@ -147,12 +87,20 @@ for fund in etfs:
         output_confirmation=True,
     )
 
-    # Resample to quarter-end total return data
-    ndl_quarter_end_total_return(
+    # Resample to month-end, month-end total return, quarter-end and quarter-end
+    # total return data in one pass, with the dividend filled to the end of the month
+    resample_data(
         base_directory=DATA_DIR,
+        df=ndl_fill_dividend(df),
         ticker=fund,
         source="Nasdaq_Data_Link",
         asset_class="Exchange_Traded_Funds",
+        columns={
+            "ME": ["Close", "Dividend"],
+            "ME_TR": ["adj_close"],
+            "QE": ["Close"],
+            "QE_TR": ["adj_close"],
+        },
         excel_export=True,
         pickle_export=True,
         output_confirmation=True,
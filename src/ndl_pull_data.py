@@ -3,6 +3,7 @@ import numpy as np
 import os
 import pandas as pd
 
+from export_data import export_data
 from IPython.display import display
 from load_api_keys import load_api_keys
 from pathlib import Path
@@ -109,17 +110,14 @@ def ndl_pull_data(
     directory = f"{base_directory}/{source}/{asset_class}/Daily"
     os.makedirs(directory, exist_ok=True)
 
-    # Export to excel
-    if excel_export == True:
-        df_comp.to_excel(f"{directory}/{ticker}.xlsx", sheet_name="data")
-    else:
-        pass
-
-    # Export to pickle
-    if pickle_export == True:
-        df_comp.to_pickle(f"{directory}/{ticker}.pkl")
-    else:
-        pass
+    # Export to pickle and queue the export to excel in the background
+    export_data(
+        df=df_comp,
+        directory=directory,
+        file_name=f"{ticker}",
+        excel_export=excel_export,
+        pickle_export=pickle_export,
+    )
 
     # Output confirmation
     if output_confirmation == True:
@@ -0,0 +1,86 @@
+import os
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from parquet_read_manifest import parquet_read_manifest
+from parquet_write_manifest import parquet_write_manifest
+from pathlib import Path
+
+def parquet_append_segment(
+    base_directory,
+    df: pd.DataFrame,
+    ticker: str,
+    source: str,
+    asset_class: str,
+    timeframe: str,
+) -> int:
+
+    """
+    Append new rows to the Parquet store as a small immutable segment file.
+
+    Only rows newer than the last stored timestamp in the manifest are written.
+    The segment is saved to {base_directory}/{source}/{asset_class}/{timeframe}/{ticker}/_segments/
+    and the manifest is updated with the new last timestamp, so the cost of an
+    update scales with the new data rather than with the size of the history.
+    Segments are merged into the monthly partitions by parquet_compact_segments
+    and are read together with the partitions by load_data.
+
+    Parameters:
+    -----------
+    base_directory
+        Root path to store data.
+    df : pd.DataFrame
+        DataFrame containing the new data with 'Date' as the index or as a column.
+    ticker : str
+        Ticker symbol of the data.
+    source : str
+        Name of the data source (e.g., 'Coinbase').
+    asset_class : str
+        Asset class name (e.g., 'Cryptocurrencies').
+    timeframe : str
+        Timeframe for the data (e.g., 'Minute', 'Daily').
+
+    Returns:
+    --------
+    int
+        Number of rows appended.
+    """
+
+    # Move 'Date' to a column if it is the index
+    if "Date" not in df.columns:
+        df = df.reset_index()
+        if "Date" not in df.columns:
+            raise ValueError("❌ DataFrame must have a 'Date' index or column.")
+
+    # Ensure dates are timezone naive
+    dates = pd.to_datetime(df["Date"])
+    if dates.dt.tz is not None:
+        dates = dates.dt.tz_localize(None)
+    df = df.assign(Date=dates)
+
+    # Keep only the rows after the last stored timestamp
+    manifest = parquet_read_manifest(base_directory, source, asset_class, timeframe)
+    if ticker in manifest:
+        df = df[df["Date"] > manifest[ticker]]
+
+    if df.empty:
+        return 0
+
+    df = df.sort_values(by="Date", kind="mergesort").drop_duplicates(subset="Date", keep="last")
+
+    # Write the segment to a hidden temporary file and then rename it
+    first_date = df["Date"].iloc[0]
+    last_date = df["Date"].iloc[-1]
+    segments_directory = Path(base_directory) / source / asset_class / timeframe / ticker / "_segments"
+    os.makedirs(segments_directory, exist_ok=True)
+    segment_file = segments_directory / f"{first_date:%Y%m%dT%H%M%S}_{last_date:%Y%m%dT%H%M%S}.parquet"
+    temp_file = segments_directory / f".{segment_file.name}.tmp"
+    pq.write_table(pa.Table.from_pandas(df, preserve_index=False), temp_file)
+    os.replace(temp_file, segment_file)
+
+    # Update the manifest only after the segment is in place
+    manifest[ticker] = last_date
+    parquet_write_manifest(base_directory, source, asset_class, timeframe, manifest)
+
+    return len(df)
@@ -0,0 +1,81 @@
+import os
+import pandas as pd
+import pyarrow.parquet as pq
+
+from parquet_write_data import parquet_write_data
+from pathlib import Path
+
+def parquet_compact_segments(
+    base_directory,
+    ticker: str,
+    source: str,
+    asset_class: str,
+    timeframe: str,
+    min_segments: int,
+    output_confirmation: bool,
+) -> int:
+
+    """
+    Merge the append-only segment files for a ticker into the monthly Parquet partitions.
+
+    Only the months covered by the segments are rewritten. The segment files are
+    deleted after the partitions have been replaced. This is safe to run in a
+    background thread while new segments are appended, because only the segment
+    files found at the start of the compaction are merged and removed.
+
+    Parameters:
+    -----------
+    base_directory
+        Root path where the data is stored.
+    ticker : str
+        Ticker symbol of the data.
+    source : str
+        Name of the data source (e.g., 'Coinbase').
+    asset_class : str
+        Asset class name (e.g., 'Cryptocurrencies').
+    timeframe : str
+        Timeframe for the data (e.g., 'Minute', 'Daily').
+    min_segments : int
+        Minimum number of segment files required before compacting.
+    output_confirmation : bool
+        If True, print confirmation message.
+
+    Returns:
+    --------
+    int
+        Number of segment files compacted.
+    """
+
+    segments_directory = Path(base_directory) / source / asset_class / timeframe / ticker / "_segments"
+    if not segments_directory.exists():
+        return 0
+
+    # Segment file names start with the first timestamp, so sorting by name is chronological
+    segment_files = sorted(segments_directory.glob("*.parquet"))
+    if not segment_files or len(segment_files) < min_segments:
+        return 0
+
+    segments_df = pd.concat(
+        [pq.read_table(file).to_pandas() for file in segment_files],
+        ignore_index=True,
+    )
+
+    parquet_write_data(
+        base_directory=base_directory,
+        df=segments_df,
+        ticker=ticker,
+        source=source,
+        asset_class=asset_class,
+        timeframe=timeframe,
+    )
+
+    for file in segment_files:
+        os.remove(file)
+
+    # Output confirmation
+    if output_confirmation == True:
+        print(f"Compacted {len(segment_files)} segments ({len(segments_df)} rows) for {timeframe} {ticker}.")
+    else:
+        pass
+
+    return len(segment_files)
@@ -0,0 +1,130 @@
+import pandas as pd
+
+from parquet_read_manifest import parquet_read_manifest
+from parquet_write_data import parquet_write_data
+from parquet_write_manifest import parquet_write_manifest
+from pathlib import Path
+from settings import config
+
+# Get the environment variable for where data is stored
+DATA_DIR = config("DATA_DIR")
+
+def parquet_migrate_data(
+    base_directory,
+    sources: list,
+    overwrite: bool,
+    output_confirmation: bool,
+) -> pd.DataFrame:
+
+    """
+    One-shot migration of the existing pickle and Excel trees into the partitioned Parquet store.
+
+    Walks {base_directory}/{source}/{asset_class}/{timeframe}/ and converts every
+    {ticker}.pkl file (or {ticker}.xlsx file if there is no pickle) into
+    {base_directory}/{source}/{asset_class}/{timeframe}/{ticker}/year_month=YYYY-MM/data.parquet.
+    The manifest of last stored timestamps is updated so that append-only updates
+    can continue from the migrated data. The original files are left in place.
+
+    Parameters:
+    -----------
+    base_directory
+        Root path where the data is stored.
+    sources : list
+        List of data sources to migrate (e.g., ['Coinbase', 'Yahoo_Finance']). If None, all sources are migrated.
+    overwrite : bool
+        If True, convert files even if a Parquet dataset already exists for the ticker.
+    output_confirmation : bool
+        If True, print confirmation message.
+
+    Returns:
+    --------
+    pd.DataFrame
+        DataFrame summarizing each file and the result of its migration.
+    """
+
+    base_directory = Path(base_directory)
+
+    if sources is None:
+        source_directories = sorted(path for path in base_directory.iterdir() if path.is_dir())
+    else:
+        source_directories = [base_directory / source for source in sources]
+
+    results = []
+
+    for source_directory in source_directories:
+        # Find all pickle and Excel files at the {asset_class}/{timeframe}/{ticker} depth
+        files = sorted(source_directory.glob("*/*/*.pkl")) + sorted(source_directory.glob("*/*/*.xlsx"))
+
+        # Prefer the pickle file when both formats exist for the same ticker
+        files_by_ticker = {}
+        for file in files:
+            key = file.with_suffix("")
+            if key not in files_by_ticker:
+                files_by_ticker[key] = file
+
+        for key, file in files_by_ticker.items():
+            ticker = file.stem
+            timeframe = file.parent.name
+            asset_class = file.parent.parent.name
+            source = source_directory.name
+
+            dataset_directory = file.parent / ticker
+            if dataset_directory.exists() and not overwrite:
+                results.append([source, asset_class, timeframe, ticker, file.name, 0, "skipped (exists)"])
+                continue
+
+            try:
+                if file.suffix == ".pkl":
+                    df = pd.read_pickle(file)
+                else:
+                    df = pd.read_excel(file, sheet_name="data", engine="calamine")
+
+                # Only time series keyed by date can be partitioned by month
+                if "Date" not in df.columns and df.index.name != "Date":
+                    results.append([source, asset_class, timeframe, ticker, file.name, 0, "skipped (no Date)"])
+                    continue
+
+                partitions = parquet_write_data(
+                    base_directory=base_directory,
+                    df=df,
+                    ticker=ticker,
+                    source=source,
+                    asset_class=asset_class,
+                    timeframe=timeframe,
+                )
+
+                # Record the last stored timestamp for append-only updates
+                last_date = pd.to_datetime(df["Date"] if "Date" in df.columns else df.index).max()
+                manifest = parquet_read_manifest(base_directory, source, asset_class, timeframe)
+                manifest[ticker] = last_date.tz_localize(None) if last_date.tz is not None else last_date
+                parquet_write_manifest(base_directory, source, asset_class, timeframe, manifest)
+
+                results.append([source, asset_class, timeframe, ticker, file.name, len(df), f"migrated ({len(partitions)} partitions)"])
+
+                if output_confirmation == True:
+                    print(f"Migrated {source}/{asset_class}/{timeframe}/{file.name} to Parquet ({len(df)} rows).")
+
+            except Exception as e:
+                print(f"Failed to migrate {file}: {e}")
+                results.append([source, asset_class, timeframe, ticker, file.name, 0, f"failed ({e})"])
+
+    results_df = pd.DataFrame(results, columns=["source", "asset_class", "timeframe", "ticker", "file", "rows", "status"])
+
+    # Output confirmation
+    if output_confirmation == True:
+        print(f"Parquet migration complete for {len(results_df)} files.")
+        print(f"--------------------")
+    else:
+        pass
+
+    return results_df
+
+if __name__ == "__main__":
+
+    # Example usage - migrate every source
+    parquet_migrate_data(
+        base_directory=DATA_DIR,
+        sources=None,
+        overwrite=False,
+        output_confirmation=True,
+    )
@@ -0,0 +1,45 @@
+import json
+import pandas as pd
+
+from pathlib import Path
+
+def parquet_read_manifest(
+    base_directory,
+    source: str,
+    asset_class: str,
+    timeframe: str,
+) -> dict:
+
+    """
+    Read the manifest of the last stored timestamp for each ticker in the Parquet store.
+
+    The manifest is kept at {base_directory}/{source}/{asset_class}/{timeframe}/_manifest.json
+    and is updated by parquet_append_segment.
+
+    Parameters:
+    -----------
+    base_directory
+        Root path where the data is stored.
+    source : str
+        Name of the data source (e.g., 'Coinbase').
+    asset_class : str
+        Asset class name (e.g., 'Cryptocurrencies').
+    timeframe : str
+        Timeframe for the data (e.g., 'Minute', 'Daily').
+
+    Returns:
+    --------
+    dict
+        Dictionary of ticker to the last stored timestamp (pd.Timestamp). Empty if
+        there is no manifest yet.
+    """
+
+    manifest_file = Path(base_directory) / source / asset_class / timeframe / "_manifest.json"
+
+    try:
+        with open(manifest_file, "r") as f:
+            manifest = json.load(f)
+    except FileNotFoundError:
+        return {}
+
+    return {ticker: pd.Timestamp(timestamp) for ticker, timestamp in manifest.items()}
@@ -0,0 +1,94 @@
+import os
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from pathlib import Path
+
+def parquet_write_data(
+    base_directory,
+    df: pd.DataFrame,
+    ticker: str,
+    source: str,
+    asset_class: str,
+    timeframe: str,
+    row_group_size: int = 50_000,
+) -> list:
+
+    """
+    Write price data to the partitioned Parquet store.
+
+    Data is stored as one file per calendar month under
+    {base_directory}/{source}/{asset_class}/{timeframe}/{ticker}/year_month=YYYY-MM/data.parquet.
+    Only the months present in df are touched. Rows for an existing month are
+    merged with the new rows (new rows win on duplicate dates) and the month
+    file is replaced atomically, so updates never rewrite the full history.
+
+    Parameters:
+    -----------
+    base_directory
+        Root path to store data.
+    df : pd.DataFrame
+        DataFrame containing the data with 'Date' as the index or as a column.
+    ticker : str
+        Ticker symbol of the data.
+    source : str
+        Name of the data source (e.g., 'Coinbase').
+    asset_class : str
+        Asset class name (e.g., 'Cryptocurrencies').
+    timeframe : str
+        Timeframe for the data (e.g., 'Minute', 'Daily').
+    row_group_size : int, optional
+        Maximum number of rows per Parquet row group (default is 50,000). Smaller
+        row groups allow finer-grained date pushdown when reading.
+
+    Returns:
+    --------
+    list
+        List of the year-month partitions that were written.
+    """
+
+    # Move 'Date' to a column if it is the index
+    if "Date" not in df.columns:
+        df = df.reset_index()
+        if "Date" not in df.columns:
+            raise ValueError("❌ DataFrame must have a 'Date' index or column.")
+
+    # Ensure dates are timezone naive and sorted
+    dates = pd.to_datetime(df["Date"])
+    if dates.dt.tz is not None:
+        dates = dates.dt.tz_localize(None)
+    df = df.assign(Date=dates)
+    if not df["Date"].is_monotonic_increasing:
+        df = df.sort_values(by="Date", kind="mergesort")
+
+    # Set the dataset location
+    dataset_directory = Path(base_directory) / source / asset_class / timeframe / ticker
+
+    # Group rows by year and month
+    year_month_key = df["Date"].dt.year * 100 + df["Date"].dt.month
+
+    written_partitions = []
+    for key, month_df in df.groupby(year_month_key, sort=True):
+        year_month = f"{key // 100:04d}-{key % 100:02d}"
+        partition_directory = dataset_directory / f"year_month={year_month}"
+        os.makedirs(partition_directory, exist_ok=True)
+        partition_file = partition_directory / "data.parquet"
+
+        # Merge with the existing month, keeping the new rows on duplicate dates
+        if partition_file.exists():
+            existing_df = pq.read_table(partition_file).to_pandas()
+            month_df = pd.concat([existing_df, month_df], ignore_index=True)
+            month_df = month_df.drop_duplicates(subset="Date", keep="last")
+            month_df = month_df.sort_values(by="Date", kind="mergesort")
+
+        table = pa.Table.from_pandas(month_df, preserve_index=False)
+
+        # Write to a hidden temporary file and then replace so readers never see a partial month
+        temp_file = partition_directory / ".data.parquet.tmp"
+        pq.write_table(table, temp_file, row_group_size=row_group_size)
+        os.replace(temp_file, partition_file)
+
+        written_partitions.append(year_month)
+
+    return written_partitions
@@ -0,0 +1,46 @@
+import json
+import os
+
+from pathlib import Path
+
+def parquet_write_manifest(
+    base_directory,
+    source: str,
+    asset_class: str,
+    timeframe: str,
+    manifest: dict,
+) -> None:
+
+    """
+    Write the manifest of the last stored timestamp for each ticker in the Parquet store.
+
+    The manifest is written to a hidden temporary file and then renamed over
+    {base_directory}/{source}/{asset_class}/{timeframe}/_manifest.json so that
+    readers never see a partial file.
+
+    Parameters:
+    -----------
+    base_directory
+        Root path where the data is stored.
+    source : str
+        Name of the data source (e.g., 'Coinbase').
+    asset_class : str
+        Asset class name (e.g., 'Cryptocurrencies').
+    timeframe : str
+        Timeframe for the data (e.g., 'Minute', 'Daily').
+    manifest : dict
+        Dictionary of ticker to the last stored timestamp (pd.Timestamp).
+
+    Returns:
+    --------
+    None
+    """
+
+    manifest_directory = Path(base_directory) / source / asset_class / timeframe
+    os.makedirs(manifest_directory, exist_ok=True)
+
+    manifest_file = manifest_directory / "_manifest.json"
+    temp_manifest_file = manifest_directory / ".manifest.json.tmp"
+    with open(temp_manifest_file, "w") as f:
+        json.dump({ticker: timestamp.isoformat() for ticker, timestamp in sorted(manifest.items())}, f, indent=4)
+    os.replace(temp_manifest_file, manifest_file)
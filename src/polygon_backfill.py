@@ -0,0 +1,199 @@
+import pandas as pd
+
+from backfill_plan import BACKFILL_MAX_BARS, backfill_plan
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from gap_index_update import gap_index_update
+from load_api_keys import load_api_keys
+from polygon import RESTClient
+from polygon_fetch_full_history_concurrent import POLYGON_TIER_REQUESTS_PER_MINUTE
+from polygon_fetch_missing_ranges import POLYGON_TIMESPAN_SECONDS, polygon_fetch_missing_ranges
+from settings import config
+from token_bucket import TokenBucket
+
+# Load API keys from the environment
+api_keys = load_api_keys()
+
+# Get the environment variable for where data is stored
+DATA_DIR = config("DATA_DIR")
+
+def polygon_backfill(
+    base_directory,
+    client,
+    ticker: str,
+    source: str,
+    asset_class: str,
+    timespan: str,
+    multiplier: int,
+    adjusted: bool,
+    existing_history_df: pd.DataFrame,
+    start_date: datetime,
+    tier: str,
+    requests_per_minute: int = None,
+    max_requests: int = None,
+    dry_run: bool = False,
+    max_workers: int = 4,
+    verbose: bool = False,
+) -> pd.DataFrame:
+
+    """
+    Refetch only the missing bars of the existing data of a ticker from Polygon API.
+
+    The gap index of the ticker is brought up to date with the existing data, and
+    the missing runs from start_date to the last existing bar are coalesced by
+    backfill_plan into windows that fit in one request under the 5000 aggregate
+    limit. The cost of the repair is printed before anything is fetched. The
+    windows are fetched with polygon_fetch_missing_ranges from the most recent to
+    the oldest under a token bucket sized for the Polygon plan. Each window is
+    widened by one bar on each side, so the new data overlaps the existing bars
+    around the hole and is checked with polygon_check_overlap. Windows that are still missing afterwards (e.g., nights,
+    weekends and holidays) are marked as checked in the gap index so they are not
+    planned again.
+
+    Parameters:
+    -----------
+    base_directory
+        Root path where the data is stored.
+    client
+        Polygon API client instance.
+    ticker : str
+        Ticker symbol to repair.
+    source : str
+        Name of the data source (e.g., 'Polygon').
+    asset_class : str
+        Asset class name (e.g., 'Equities').
+    timespan : str
+        Time span for the data (e.g., "minute", "hour", "day").
+    multiplier : int
+        Multiplier for the time span (e.g., 1 for daily data).
+    adjusted : bool
+        If True, return adjusted data; if False, return raw data.
+    existing_history_df : pd.DataFrame
+        DataFrame containing the existing data with a 'Date' column.
+    start_date : datetime
+        First date that should be present in UTC. Bars missing before the first existing bar are included.
+    tier : str
+        Polygon plan, one of the keys of POLYGON_TIER_REQUESTS_PER_MINUTE ('free' or 'paid').
+    requests_per_minute : int, optional
+        Request budget per minute. Overrides the budget for the tier if provided.
+    max_requests : int, optional
+        Maximum number of requests to make, most recent gaps first (default is None, for no limit).
+    dry_run : bool, optional
+        If True, only plan and report the cost of the repair (default is False).
+    max_workers : int, optional
+        Number of concurrent requests (default is 4).
+    verbose : bool, optional
+        If True, print detailed information about the data being processed (default is False).
+
+    Returns:
+    --------
+    full_history_df : pd.DataFrame
+        DataFrame containing the existing data and the bars that were refetched.
+    """
+
+    if tier not in POLYGON_TIER_REQUESTS_PER_MINUTE:
+        raise Exception(f"Invalid tier: {tier}. Acceptable tiers are: {list(POLYGON_TIER_REQUESTS_PER_MINUTE.keys())}.")
+
+    if requests_per_minute is None:
+        requests_per_minute = POLYGON_TIER_REQUESTS_PER_MINUTE[tier]
+
+    granularity = POLYGON_TIMESPAN_SECONDS[timespan] * multiplier
+    bar_length = timedelta(seconds=granularity)
+
+    # ----- Bring the gap index up to date and add the bars missing before the first existing bar -----
+    gaps_df = gap_index_update(base_directory, existing_history_df, ticker, source, asset_class, timespan, granularity)
+    missing_ranges = list(zip(gaps_df["start"][~gaps_df["checked"]], gaps_df["end"][~gaps_df["checked"]]))
+    if gaps_df.attrs["first"] is not None and pd.Timestamp(start_date) < gaps_df.attrs["first"] - bar_length:
+        missing_ranges.append((pd.Timestamp(start_date), gaps_df.attrs["first"] - bar_length))
+    missing_ranges = [(max(range_start, pd.Timestamp(start_date)), range_end) for range_start, range_end in missing_ranges if range_end >= pd.Timestamp(start_date)]
+
+    # ----- Plan and report the cost, leaving room in each request for the bar on each side -----
+    plan = backfill_plan(
+        missing_ranges={ticker: missing_ranges},
+        granularity=granularity,
+        max_bars=BACKFILL_MAX_BARS["polygon"] - 2,
+        requests_per_second=requests_per_minute / 60,
+        max_requests=max_requests,
+        verbose=True,
+    )
+
+    if dry_run == True or plan.empty:
+        return existing_history_df
+
+    # Requests are evenly spaced rather than sent in bursts
+    rate_limiter = TokenBucket(rate=requests_per_minute / 60, capacity=1)
+
+    def fetch_window(window):
+        # One request per window (continued if truncated at the row limit), checked against the existing bars around the hole
+        chunks, _ = polygon_fetch_missing_ranges(
+            client=client,
+            ticker=ticker,
+            timespan=timespan,
+            multiplier=multiplier,
+            adjusted=adjusted,
+            existing_history_df=existing_history_df,
+            missing_ranges=[window],
+            rate_limiter=rate_limiter,
+            verbose=verbose,
+        )
+
+        if not chunks:
+            return None
+
+        return pd.concat(chunks, ignore_index=True).drop_duplicates(subset="Date", keep="last")
+
+    # ----- Fetch the windows, most recent first; results come back in plan order -----
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        window_dfs = list(executor.map(fetch_window, zip(plan["start"], plan["end"])))
+
+    new_data = [df for df in window_dfs if df is not None]
+    full_history_df = pd.concat([existing_history_df] + new_data)
+    full_history_df = full_history_df.drop_duplicates(subset="Date", keep="first")
+    full_history_df = full_history_df.sort_values(by='Date', ascending=True)
+    full_history_df = full_history_df.reset_index(drop=True)
+
+    # Windows that were fetched and are still missing are not available from Polygon
+    gap_index_update(
+        base_directory=base_directory,
+        df=pd.concat(new_data) if new_data else existing_history_df.iloc[:0],
+        ticker=ticker,
+        source=source,
+        asset_class=asset_class,
+        timeframe=timespan,
+        granularity=granularity,
+        checked_ranges=list(zip(plan["start"], plan["end"])),
+    )
+
+    if verbose == True:
+        print(f"Added {len(full_history_df) - len(existing_history_df)} bars for {ticker} {timespan} data in {len(plan)} windows.")
+    else:
+        pass
+
+    return full_history_df
+
+if __name__ == "__main__":
+
+    current_year = datetime.now().year
+    current_month = datetime.now().month
+    current_day = datetime.now().day
+
+    # Open client connection
+    client = RESTClient(api_key=api_keys["POLYGON_KEY"])
+
+    # Example usage - report the cost of repairing the minute data without fetching anything
+    existing_history_df = pd.read_pickle(f"{DATA_DIR}/Polygon/Equities/minute/TQQQ.pkl")
+
+    polygon_backfill(
+        base_directory=DATA_DIR,
+        client=client,
+        ticker="TQQQ",
+        source="Polygon",
+        asset_class="Equities",
+        timespan="minute",
+        multiplier=1,
+        adjusted=True,
+        existing_history_df=existing_history_df,
+        start_date=datetime(current_year - 2, current_month, current_day),
+        tier="free",
+        dry_run=True,
+    )
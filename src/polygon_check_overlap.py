@@ -0,0 +1,56 @@
+import pandas as pd
+
+def polygon_check_overlap(
+    previous_df: pd.DataFrame,
+    new_df: pd.DataFrame,
+    boundary_start,
+    boundary_end,
+) -> bool:
+
+    """
+    Confirm that two adjacent pulls of Polygon data agree where they overlap.
+
+    Only the rows inside the stitched boundary are compared, instead of the full
+    history. If both sides have rows inside the boundary, at least one row must
+    match on open, high, low and close; otherwise the data does not overlap
+    (e.g., because of an unadjusted split) and an exception is raised. If either
+    side has no rows inside the boundary (e.g., a weekend or holiday), there is
+    nothing to compare and the check passes.
+
+    Parameters:
+    -----------
+    previous_df : pd.DataFrame
+        Earlier data with a 'Date' column.
+    new_df : pd.DataFrame
+        Later data with a 'Date' column.
+    boundary_start : datetime
+        Start of the overlapping period (inclusive).
+    boundary_end : datetime
+        End of the overlapping period (inclusive).
+
+    Returns:
+    --------
+    bool
+        True if the overlap was compared, False if there was nothing to compare.
+
+    Raises:
+    -------
+    Exception
+        If both sides have data inside the boundary but no rows match.
+    """
+
+    price_cols = ['open', 'high', 'low', 'close']
+
+    previous_overlap = previous_df.loc[(previous_df['Date'] >= boundary_start) & (previous_df['Date'] <= boundary_end), price_cols]
+    new_overlap = new_df.loc[(new_df['Date'] >= boundary_start) & (new_df['Date'] <= boundary_end), price_cols]
+
+    if previous_overlap.empty or new_overlap.empty:
+        return False
+
+    # Inner join on the price columns = exact row matches
+    overlap = previous_overlap.merge(new_overlap, on=price_cols, how="inner")
+
+    if overlap.empty:
+        raise Exception(f"New data does not overlap with existing data between {boundary_start} and {boundary_end} (full-row check).")
+
+    return True
@@ -1,9 +1,12 @@
 import pandas as pd
 import time
+import tracemalloc
 
 from datetime import datetime, timedelta
 from load_api_keys import load_api_keys
 from polygon import RESTClient
+from polygon_check_overlap import polygon_check_overlap
+from polygon_fetch_missing_ranges import polygon_fetch_missing_ranges
 from settings import config
 
 # Load API keys from the environment
@@ -22,11 +25,23 @@ def polygon_fetch_full_history(
     current_start: datetime,
     free_tier: bool,
     verbose: bool,
+    report_performance: bool = False,
+    missing_ranges: list = None,
 ) -> pd.DataFrame:
 
     """
     Fetch full historical data for a given product from Polygon API.
 
+    Each window of new data is collected into a list of chunks and the history is
+    materialised once at the end, so the cost of a long backfill grows linearly
+    with the number of rows. The overlap check only compares each new chunk with
+    the previous chunk (or the existing data for the first chunk).
+
+    If missing_ranges is given (e.g., the unchecked runs of the gap index), only
+    those ranges are fetched with polygon_fetch_missing_ranges instead of
+    everything from current_start, and each range is checked against the
+    existing bars on either side of it.
+
     Parameters:
     -----------
     client
@@ -47,6 +62,12 @@ def polygon_fetch_full_history(
         If True, then pause to avoid API limits.
     verbose : bool
         If True, print detailed information about the data being processed.
+    report_performance : bool, optional
+        If True, print the rows fetched per second (excluding free tier pauses) and
+        the peak memory allocated during the fetch (default is False).
+    missing_ranges : list, optional
+        List of (start, end) tuples in UTC of the bars to fetch, with both ends inclusive.
+        If given, current_start is not used (default is None).
 
     Returns:
     --------
@@ -54,8 +75,24 @@ def polygon_fetch_full_history(
         DataFrame containing the data.
     """
 
-    # Copy DataFrame
-    full_history_df = existing_history_df.copy()
+    # Start measuring elapsed time and peak memory
+    if report_performance == True:
+        started_tracing = not tracemalloc.is_tracing()
+        if started_tracing:
+            tracemalloc.start()
+        else:
+            tracemalloc.reset_peak()
+        start_time = time.perf_counter()
+        sleep_time = 0.0
+    else:
+        pass
+
+    # New data is collected into chunks and combined once at the end
+    chunks = []
+    fetched_rows = 0
+
+    # Data that the next chunk must overlap with
+    previous_df = existing_history_df
 
     if timespan == "minute":
         time_delta = 15
@@ -72,7 +109,27 @@ def polygon_fetch_full_history(
     new_data_last_date = None
     new_date_last_date_check = None
 
-    while current_start < datetime.now():
+    # Fetch only the missing ranges instead of walking forward from current_start
+    if missing_ranges is not None:
+        chunks, ranges_sleep_time = polygon_fetch_missing_ranges(
+            client=client,
+            ticker=ticker,
+            timespan=timespan,
+            multiplier=multiplier,
+            adjusted=adjusted,
+            existing_history_df=existing_history_df,
+            missing_ranges=missing_ranges,
+            time_delta=time_delta,
+            free_tier=free_tier,
+            verbose=verbose,
+        )
+        fetched_rows = sum(len(chunk) for chunk in chunks)
+        if report_performance == True:
+            sleep_time += ranges_sleep_time
+    else:
+        pass
+
+    while missing_ranges is None and current_start < datetime.now():
 
         # Offset end date by time_delta
         current_end = current_start + timedelta(days=time_delta)
@@ -103,11 +160,11 @@ def polygon_fetch_full_history(
             new_data = new_data[['Date', 'open', 'high', 'low', 'close', 'volume', 'vwap', 'transactions', 'otc']]
             new_data = new_data.sort_values(by='Date', ascending=True)
 
-            # Enforce dtypes to match full_history_df
-            new_data = new_data.astype(full_history_df.dtypes.to_dict())
+            # Enforce dtypes to match existing_history_df
+            new_data = new_data.astype(existing_history_df.dtypes.to_dict())
 
             # (Optional) reorder columns to match schema
-            # new_data = new_data[full_history_df.columns]
+            # new_data = new_data[existing_history_df.columns]
 
             # Find last date in new_data
             new_data_last_date = new_data['Date'].max()
@@ -127,35 +184,20 @@ def polygon_fetch_full_history(
                 # if not full_history_df['Date'].isin(new_data['Date']).any():
                     # raise Exception(f"New data does not overlap with existing data.")
 
-            if not full_history_df.empty:
-                # Columns present in both frames
-                common_cols = list(full_history_df.columns.intersection(new_data.columns))
-                if not common_cols:
-                    raise Exception("No common columns to compare.")
-
-                # (Optional) de-duplicate to speed up the merge
-                # full_dedup = full_history_df[common_cols].drop_duplicates()
-                # new_dedup  = new_data[common_cols].drop_duplicates()
-
-                price_cols = ['open', 'high', 'low', 'close']
-
-                # Inner join on every shared column = exact row matches
-                # overlap = full_dedup.merge(new_dedup, on=common_cols, how="inner")
-                # overlap = full_dedup.merge(new_dedup, on=price_cols, how="inner")
-                overlap = full_history_df.merge(new_data, on=price_cols, how="inner")
-
-                if overlap.empty:
-                    raise Exception(f"New data does not overlap with existing data (full-row check).")
-
-            # Combine existing data with recent data, drop duplicates, sort values, reset index
-            full_history_df = pd.concat([full_history_df, new_data])
-            full_history_df = full_history_df.drop_duplicates(subset="Date", keep="last")
-            full_history_df = full_history_df.sort_values(by='Date',ascending=True)
-            full_history_df = full_history_df.reset_index(drop=True)
-
-            if verbose == True:
-                print("Combined data:")
-                print(full_history_df)
+            # If previous data exists, check to confirm that data overlaps at the boundary
+            # to verify that there were not any splits in the data
+            if not previous_df.empty:
+                polygon_check_overlap(
+                    previous_df=previous_df,
+                    new_df=new_data,
+                    boundary_start=current_start,
+                    boundary_end=previous_df['Date'].max(),
+                )
+
+            # Add new data to the list of chunks
+            chunks.append(new_data)
+            fetched_rows += len(new_data)
+            previous_df = new_data
 
         except KeyError as e:
             print(f"No data is available for {ticker} from {current_start} thru {current_end}.")
@@ -207,6 +249,29 @@ def polygon_fetch_full_history(
             if verbose == True:
                 print(f"Sleeping for 12 seconds to avoid hitting API rate limits...\n")
             time.sleep(12)
+            if report_performance == True:
+                sleep_time += 12
+
+    # Combine existing data with new data, drop duplicates, sort values, reset index
+    full_history_df = pd.concat([existing_history_df] + chunks)
+    full_history_df = full_history_df.drop_duplicates(subset="Date", keep="last")
+    full_history_df = full_history_df.sort_values(by='Date', ascending=True)
+    full_history_df = full_history_df.reset_index(drop=True)
+
+    if verbose == True:
+        print("Combined data:")
+        print(full_history_df)
+
+    if report_performance == True:
+        elapsed = time.perf_counter() - start_time
+        _, peak_memory = tracemalloc.get_traced_memory()
+        if started_tracing:
+            tracemalloc.stop()
+        fetch_time = max(elapsed - sleep_time, 1e-9)
+        print(f"Fetched {fetched_rows} rows in {len(chunks)} chunks for {ticker} in {elapsed:.1f} seconds ({sleep_time:.0f} seconds paused for API limits).")
+        print(f"Throughput: {fetched_rows / fetch_time:,.0f} rows/sec, peak memory: {peak_memory / 1024**2:,.1f} MB")
+    else:
+        pass
 
     # Return the DataFrame containing the full history
     return full_history_df
@@ -244,4 +309,5 @@ if __name__ == "__main__":
         current_start=datetime(current_year - 2, current_month, current_day),
         free_tier=True,
         verbose=True,
+        report_performance=True,
     )
\ No newline at end of file
@@ -0,0 +1,225 @@
+import pandas as pd
+
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from load_api_keys import load_api_keys
+from polygon import RESTClient
+from polygon_check_overlap import polygon_check_overlap
+from token_bucket import TokenBucket
+
+# Load API keys from the environment
+api_keys = load_api_keys()
+
+# Requests per minute allowed by each Polygon plan. The free tier allows 5 calls
+# per minute; paid plans are unlimited, so cap them at a polite 100 per second.
+POLYGON_TIER_REQUESTS_PER_MINUTE = {
+    "free": 5,
+    "paid": 6_000,
+}
+
+def polygon_fetch_full_history_concurrent(
+    client,
+    ticker: str,
+    timespan: str,
+    multiplier: int,
+    adjusted: bool,
+    existing_history_df: pd.DataFrame,
+    current_start: datetime,
+    tier: str,
+    requests_per_minute: int = None,
+    max_workers: int = 4,
+    verbose: bool = False,
+) -> pd.DataFrame:
+
+    """
+    Fetch full historical data for a given ticker from Polygon API with concurrent requests.
+
+    All date windows from current_start to now are computed up front and fetched
+    concurrently, with the request rate governed by a token bucket sized for the
+    Polygon plan. The windows are merged once at the end, and the overlap
+    validation is run only on the stitched boundaries between adjacent windows
+    (and between the existing data and the first window).
+
+    Parameters:
+    -----------
+    client
+        Polygon API client instance.
+    ticker : str
+        Ticker symbol to download.
+    timespan : str
+        Time span for the data (e.g., "minute", "hour", "day").
+    multiplier : int
+        Multiplier for the time span (e.g., 1 for daily data).
+    adjusted : bool
+        If True, return adjusted data; if False, return raw data.
+    existing_history_df : pd.DataFrame
+        DataFrame containing the existing data.
+    current_start : datetime
+        Date for which to start pulling data in datetime format (UTC).
+    tier : str
+        Polygon plan, one of the keys of POLYGON_TIER_REQUESTS_PER_MINUTE ('free' or 'paid').
+    requests_per_minute : int, optional
+        Request budget per minute. Overrides the budget for the tier if provided.
+    max_workers : int, optional
+        Number of concurrent requests (default is 4).
+    verbose : bool, optional
+        If True, print detailed information about the data being processed (default is False).
+
+    Returns:
+    --------
+    full_history_df : pd.DataFrame
+        DataFrame containing the data.
+    """
+
+    if tier not in POLYGON_TIER_REQUESTS_PER_MINUTE:
+        raise Exception(f"Invalid tier: {tier}. Acceptable tiers are: {list(POLYGON_TIER_REQUESTS_PER_MINUTE.keys())}.")
+
+    if requests_per_minute is None:
+        requests_per_minute = POLYGON_TIER_REQUESTS_PER_MINUTE[tier]
+
+    # Requests are evenly spaced rather than sent in bursts
+    rate_limiter = TokenBucket(rate=requests_per_minute / 60, capacity=1)
+
+    # Window lengths are sized so that a window normally stays under the 5000 row limit
+    if timespan == "minute":
+        time_delta = 5
+        time_overlap = 1
+    elif timespan == "hour":
+        time_delta = 15
+        time_overlap = 1
+    elif timespan == "day":
+        time_delta = 180
+        time_overlap = 1
+    else:
+        raise Exception(f"Invalid {timespan}.")
+
+    limit = 5000
+
+    # Precompute all windows (in UTC, like the bars), each overlapping the previous one by time_overlap days
+    now = pd.Timestamp.now(tz="UTC").tz_localize(None).to_pydatetime()
+    windows = []
+    window_start = current_start
+    while True:
+        window_end = window_start + timedelta(days=time_delta)
+        windows.append((window_start, window_end))
+        if window_end > now:
+            break
+        window_start = window_end - timedelta(days=time_overlap)
+
+    def fetch_window(window):
+        window_start, window_end = window
+        frames = []
+        # Timestamps in milliseconds, because the windows and the bars are in UTC (the client
+        # reads a naive datetime as local time)
+        from_ = int(pd.Timestamp(window_start).value // 1_000_000)
+        to = int(pd.Timestamp(window_end).value // 1_000_000)
+
+        while True:
+            rate_limiter.acquire()
+
+            if verbose == True:
+                print(f"Pulling {timespan} data for {pd.Timestamp(from_, unit='ms')} thru {window_end} for {ticker}...")
+
+            aggs = client.get_aggs(
+                ticker=ticker,
+                timespan=timespan,
+                multiplier=multiplier,
+                from_=from_,
+                to=to,
+                adjusted=adjusted,
+                sort="asc",
+                limit=limit,
+            )
+
+            if len(aggs) == 0:
+                break
+
+            # Convert to DataFrame
+            new_data = pd.DataFrame([bar.__dict__ for bar in aggs])
+            new_data["timestamp"] = pd.to_datetime(new_data["timestamp"], unit="ms")
+            new_data = new_data.rename(columns = {'timestamp':'Date'})
+            new_data = new_data[['Date', 'open', 'high', 'low', 'close', 'volume', 'vwap', 'transactions', 'otc']]
+            new_data = new_data.sort_values(by='Date', ascending=True)
+
+            # Enforce dtypes to match existing_history_df
+            new_data = new_data.astype(existing_history_df.dtypes.to_dict())
+            frames.append(new_data)
+
+            # If the window was truncated at the row limit, continue from the last bar
+            last_timestamp = int(new_data['Date'].max().value // 1_000_000)
+            if len(aggs) < limit or last_timestamp <= from_:
+                break
+            from_ = last_timestamp
+
+        if not frames:
+            print(f"No data is available for {ticker} from {window_start} thru {window_end}.")
+            return None
+
+        return pd.concat(frames, ignore_index=True).drop_duplicates(subset="Date", keep="last")
+
+    if verbose == True:
+        print(f"Fetching {len(windows)} windows for {ticker} at {requests_per_minute} requests per minute with {max_workers} workers...")
+
+    # Fetch all windows concurrently; results come back in window order
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        window_dfs = list(executor.map(fetch_window, windows))
+
+    # Validate the overlap only at the stitched boundaries
+    previous_df = existing_history_df
+    previous_end = existing_history_df['Date'].max() if not existing_history_df.empty else None
+    for (window_start, window_end), window_df in zip(windows, window_dfs):
+        if window_df is None:
+            continue
+        if previous_end is not None and not previous_df.empty:
+            polygon_check_overlap(previous_df, window_df, window_start, previous_end)
+        previous_df = window_df
+        previous_end = window_end
+
+    # Combine existing data with new data once, drop duplicates, sort values, reset index
+    full_history_df = pd.concat([existing_history_df] + [df for df in window_dfs if df is not None])
+    full_history_df = full_history_df.drop_duplicates(subset="Date", keep="last")
+    full_history_df = full_history_df.sort_values(by='Date', ascending=True)
+    full_history_df = full_history_df.reset_index(drop=True)
+
+    if verbose == True:
+        print("Combined data:")
+        print(full_history_df)
+
+    # Return the DataFrame containing the full history
+    return full_history_df
+
+if __name__ == "__main__":
+
+    current_year = datetime.now().year
+    current_month = datetime.now().month
+    current_day = datetime.now().day
+
+    # Open client connection
+    client = RESTClient(api_key=api_keys["POLYGON_KEY"])
+
+    # Create an empty DataFrame
+    df = pd.DataFrame({
+        'Date': pd.Series(dtype="datetime64[ns]"),
+        'open': pd.Series(dtype="float64"),
+        'high': pd.Series(dtype="float64"),
+        'low': pd.Series(dtype="float64"),
+        'close': pd.Series(dtype="float64"),
+        'volume': pd.Series(dtype="float64"),
+        'vwap': pd.Series(dtype="float64"),
+        'transactions': pd.Series(dtype="int64"),
+        'otc': pd.Series(dtype="object")
+    })
+
+    # Example usage - hourly data on a paid plan
+    df = polygon_fetch_full_history_concurrent(
+        client=client,
+        ticker="TQQQ",
+        timespan="hour",
+        multiplier=1,
+        adjusted=True,
+        existing_history_df=df,
+        current_start=datetime(current_year - 2, current_month, current_day),
+        tier="paid",
+        max_workers=8,
+        verbose=True,
+    )
@@ -0,0 +1,148 @@
+import pandas as pd
+import time
+
+from datetime import timedelta
+from polygon_check_overlap import polygon_check_overlap
+from token_bucket import TokenBucket
+
+# Length of one bar of each timespan in seconds
+POLYGON_TIMESPAN_SECONDS = {
+    "minute": 60,
+    "hour": 3_600,
+    "day": 86_400,
+}
+
+def polygon_fetch_missing_ranges(
+    client,
+    ticker: str,
+    timespan: str,
+    multiplier: int,
+    adjusted: bool,
+    existing_history_df: pd.DataFrame,
+    missing_ranges: list,
+    time_delta: int = None,
+    rate_limiter: TokenBucket = None,
+    free_tier: bool = False,
+    verbose: bool = False,
+) -> tuple[list, float]:
+
+    """
+    Fetch only the missing ranges of the data of a ticker from Polygon API.
+
+    Each range is widened by one bar on each side, so the new data overlaps the
+    existing bars around the hole, and is fetched in windows of time_delta days
+    (or in one request per range). A window that is truncated at the 5000 row
+    limit is continued from its last bar. Once a range is fetched, its bars are
+    checked against the existing bars on either side of it with
+    polygon_check_overlap.
+
+    Parameters:
+    -----------
+    client
+        Polygon API client instance.
+    ticker : str
+        Ticker symbol to download.
+    timespan : str
+        Time span for the data, one of the keys of POLYGON_TIMESPAN_SECONDS.
+    multiplier : int
+        Multiplier for the time span (e.g., 1 for daily data).
+    adjusted : bool
+        If True, return adjusted data; if False, return raw data.
+    existing_history_df : pd.DataFrame
+        DataFrame containing the existing data with a 'Date' column.
+    missing_ranges : list
+        List of (start, end) tuples in UTC of the bars to fetch, with both ends inclusive.
+    time_delta : int, optional
+        Length of each request window in days. If None, each range is requested as
+        one window (default is None).
+    rate_limiter : TokenBucket, optional
+        Token bucket to acquire before each request, e.g., one shared by concurrent
+        fetches (default is None).
+    free_tier : bool, optional
+        If True, then pause after each request to avoid API limits (default is False).
+    verbose : bool, optional
+        If True, print detailed information about the data being processed (default is False).
+
+    Returns:
+    --------
+    tuple[list, float]
+        List of DataFrames of the new bars (one per request with data), and the
+        number of seconds paused for API limits.
+    """
+
+    bar_length = timedelta(seconds=POLYGON_TIMESPAN_SECONDS[timespan] * multiplier)
+    limit = 5000
+    chunks = []
+    sleep_time = 0.0
+
+    for range_start, range_end in sorted(missing_ranges):
+        range_start = pd.Timestamp(range_start).to_pydatetime() - bar_length
+        range_end = pd.Timestamp(range_end).to_pydatetime() + bar_length
+        range_chunks = []
+        from_ = range_start
+
+        while from_ < range_end:
+            if time_delta is None:
+                to = range_end
+            else:
+                to = min(from_ + timedelta(days=time_delta), range_end)
+
+            if rate_limiter is not None:
+                rate_limiter.acquire()
+            else:
+                pass
+
+            if verbose == True:
+                print(f"Pulling missing {timespan} data for {from_} thru {to} for {ticker}...\n")
+
+            # Timestamps in milliseconds, because the missing ranges are in UTC
+            aggs = client.get_aggs(
+                ticker=ticker,
+                timespan=timespan,
+                multiplier=multiplier,
+                from_=int(pd.Timestamp(from_).value // 1_000_000),
+                to=int(pd.Timestamp(to).value // 1_000_000),
+                adjusted=adjusted,
+                sort="asc",
+                limit=limit,
+            )
+
+            # Check for free tier and if so then pause for 12 seconds to avoid hitting API rate limits
+            if free_tier == True:
+                time.sleep(12)
+                sleep_time += 12
+
+            if len(aggs) == 0:
+                from_ = to
+                continue
+
+            # Convert to DataFrame
+            new_data = pd.DataFrame([bar.__dict__ for bar in aggs])
+            new_data["timestamp"] = pd.to_datetime(new_data["timestamp"], unit="ms")
+            new_data = new_data.rename(columns = {'timestamp':'Date'})
+            new_data = new_data[['Date', 'open', 'high', 'low', 'close', 'volume', 'vwap', 'transactions', 'otc']]
+            new_data = new_data.sort_values(by='Date', ascending=True)
+
+            # Enforce dtypes to match existing_history_df
+            new_data = new_data.astype(existing_history_df.dtypes.to_dict())
+            range_chunks.append(new_data)
+
+            # If the window was truncated at the row limit, continue from the last bar
+            last_date = new_data['Date'].max().to_pydatetime()
+            if len(aggs) < limit or last_date <= from_:
+                from_ = to
+            else:
+                from_ = last_date
+
+        # Confirm that the new data matches the existing bars around the hole
+        if range_chunks and not existing_history_df.empty:
+            polygon_check_overlap(
+                previous_df=existing_history_df,
+                new_df=pd.concat(range_chunks, ignore_index=True),
+                boundary_start=range_start,
+                boundary_end=range_end,
+            )
+
+        chunks.extend(range_chunks)
+
+    return chunks, sleep_time
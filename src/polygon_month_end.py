@@ -1,6 +1,8 @@
 import os
 import pandas as pd
 
+from export_data import export_data
+
 def polygon_month_end(
     base_directory,
     ticker: str,
@@ -63,17 +65,14 @@ def polygon_month_end(
     directory = f"{base_directory}/{source}/{asset_class}/Month_End"
     os.makedirs(directory, exist_ok=True)
 
-    # Export to Excel
-    if excel_export == True:
-        df_month_end.to_excel(f"{directory}/{ticker}_ME.xlsx", sheet_name="data")
-    else:
-        pass
-
-    # Export to Pickle
-    if pickle_export == True:
-        df_month_end.to_pickle(f"{directory}/{ticker}_ME.pkl")
-    else:
-        pass
+    # Export to pickle and queue the export to excel in the background
+    export_data(
+        df=df_month_end,
+        directory=directory,
+        file_name=f"{ticker}_ME",
+        excel_export=excel_export,
+        pickle_export=pickle_export,
+    )
         
     # Output confirmation
     if output_confirmation == True:
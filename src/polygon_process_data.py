@@ -10,8 +10,7 @@ import time
 
 from datetime import datetime
 from polygon_pull_data import polygon_pull_data
-from polygon_month_end import polygon_month_end
-from polygon_quarter_end import polygon_quarter_end
+from resample_data import resample_data
 from settings import config
 
 # Get the environment variable for where data is stored
@@ -88,7 +87,7 @@ for stock in equities.keys():
         pass
 
     # Pull daily data
-    polygon_pull_data(
+    df = polygon_pull_data(
         base_directory=DATA_DIR,
         ticker=stock,
         source="Polygon",
@@ -110,52 +109,22 @@ for stock in equities.keys():
     else:
         pass
 
-    # Resample to month-end data
-    polygon_month_end(
-        base_directory=DATA_DIR,
-        ticker=stock,
-        source="Polygon",
-        asset_class="Equities",
-        timespan="day",
-        excel_export=True,
-        pickle_export=True,
-        output_confirmation=True,
-    )
-
-    # # Resample to month-end total return data
-    # ndl_month_end_total_return(
-    #     base_directory=DATA_DIR,
-    #     ticker=stock,
-    #     source="Nasdaq_Data_Link",
-    #     asset_class="Equities",
-    #     excel_export=True,
-    #     pickle_export=False,
-    #     output_confirmation=True,
-    # )
-
-    # Resample to quarter-end data
-    polygon_quarter_end(
+    # Resample to month-end and quarter-end data in one pass
+    resample_data(
         base_directory=DATA_DIR,
+        df=df,
         ticker=stock,
         source="Polygon",
         asset_class="Equities",
-        timespan="day",
+        columns={
+            "ME": ["close"],
+            "QE": ["close"],
+        },
         excel_export=True,
         pickle_export=True,
         output_confirmation=True,
     )
 
-    # # Resample to quarter-end total return data
-    # ndl_quarter_end_total_return(
-    #     base_directory=DATA_DIR,
-    #     ticker=stock,
-    #     source="Nasdaq_Data_Link",
-    #     asset_class="Equities",
-    #     excel_export=True,
-    #     pickle_export=False,
-    #     output_confirmation=True,
-    # )
-
 # # Index Data
 # indices = ["I:SPX"]
 
@@ -209,52 +178,6 @@ for stock in equities.keys():
 #         output_confirmation=True,
 #     )
 
-#     # Resample to month-end data
-#     polygon_month_end(
-#         base_directory=DATA_DIR,
-#         ticker=index,
-#         source="Polygon",
-#         asset_class="Indices",
-#         timespan="day",
-#         excel_export=True,
-#         pickle_export=False,
-#         output_confirmation=True,
-#     )
-
-#     # # Resample to month-end total return data
-#     # ndl_month_end_total_return(
-#     #     base_directory=DATA_DIR,
-#     #     ticker=stock,
-#     #     source="Nasdaq_Data_Link",
-#     #     asset_class="Equities",
-#     #     excel_export=True,
-#     #     pickle_export=False,
-#     #     output_confirmation=True,
-#     # )
-
-#     # Resample to quarter-end data
-#     polygon_quarter_end(
-#         base_directory=DATA_DIR,
-#         ticker=index,
-#         source="Polygon",
-#         asset_class="Indices",
-#         timespan="day",
-#         excel_export=True,
-#         pickle_export=False,
-#         output_confirmation=True,
-#     )
-
-#     # # Resample to quarter-end total return data
-#     # ndl_quarter_end_total_return(
-#     #     base_directory=DATA_DIR,
-#     #     ticker=stock,
-#     #     source="Nasdaq_Data_Link",
-#     #     asset_class="Equities",
-#     #     excel_export=True,
-#     #     pickle_export=False,
-#     #     output_confirmation=True,
-#     # )
-
 # Exchange Traded Fund Data
 etfs = {
     'AGG': 'iShares Core U.S. Aggregate Bond ETF', 
@@ -375,7 +298,7 @@ for fund in etfs.keys():
         pass
 
     # Pull daily data
-    polygon_pull_data(
+    df = polygon_pull_data(
         base_directory=DATA_DIR,
         ticker=fund,
         source="Polygon",
@@ -397,51 +320,21 @@ for fund in etfs.keys():
     else:
         pass
 
-    # Resample to month-end data
-    polygon_month_end(
-        base_directory=DATA_DIR,
-        ticker=fund,
-        source="Polygon",
-        asset_class="Exchange_Traded_Funds",
-        timespan="day",
-        excel_export=True,
-        pickle_export=True,
-        output_confirmation=True,
-    )
-
-    # # Resample to month-end total return data
-    # ndl_month_end_total_return(
-    #     base_directory=DATA_DIR,
-    #     ticker=stock,
-    #     source="Nasdaq_Data_Link",
-    #     asset_class="Equities",
-    #     excel_export=True,
-    #     pickle_export=False,
-    #     output_confirmation=True,
-    # )
-
-    # Resample to quarter-end data
-    polygon_quarter_end(
+    # Resample to month-end and quarter-end data in one pass
+    resample_data(
         base_directory=DATA_DIR,
+        df=df,
         ticker=fund,
         source="Polygon",
         asset_class="Exchange_Traded_Funds",
-        timespan="day",
+        columns={
+            "ME": ["close"],
+            "QE": ["close"],
+        },
         excel_export=True,
         pickle_export=True,
         output_confirmation=True,
     )
 
-    # # Resample to quarter-end total return data
-    # ndl_quarter_end_total_return(
-    #     base_directory=DATA_DIR,
-    #     ticker=stock,
-    #     source="Nasdaq_Data_Link",
-    #     asset_class="Equities",
-    #     excel_export=True,
-    #     pickle_export=False,
-    #     output_confirmation=True,
-    # )
-
 # Mutual Fund Data
 # None
\ No newline at end of file
@@ -3,10 +3,15 @@ import pandas as pd
 import time
 
 from datetime import datetime, timedelta
+from export_data import export_data
+from gap_index_update import gap_index_update
 from IPython.display import display
 from load_api_keys import load_api_keys
+from polygon_backfill import polygon_backfill
 from polygon import RESTClient
 from polygon_fetch_full_history import polygon_fetch_full_history
+from polygon_fetch_full_history_concurrent import polygon_fetch_full_history_concurrent
+from polygon_fetch_missing_ranges import POLYGON_TIMESPAN_SECONDS
 from settings import config
 
 # Load API keys from the environment
@@ -31,6 +36,11 @@ def polygon_pull_data(
     excel_export: bool,
     pickle_export: bool,
     output_confirmation: bool,
+    concurrent_fetch: bool = False,
+    requests_per_minute: int = None,
+    max_workers: int = 4,
+    update_gap_index: bool = False,
+    max_backfill_requests: int = None,
 ) -> pd.DataFrame:
     """
     Read existing data file, download price data from Polygon, and export data.
@@ -55,6 +65,8 @@ def polygon_pull_data(
         If True, return adjusted data; if False, return raw data.
     force_existing_check : bool
         If True, force a complete check of the existing data file to verify that there are not any gaps in the data.
+        Only the missing bars from start_date are refetched (see polygon_backfill), and the
+        number of requests is printed before they are made.
     free_tier : bool
         If True, then pause to avoid API limits.
     verbose : bool
@@ -65,6 +77,19 @@ def polygon_pull_data(
         If True, export data to Pickle format.
     output_confirmation : bool
         If True, print confirmation message.
+    concurrent_fetch : bool, optional
+        If True, fetch all date windows concurrently under a rate limit for the
+        Polygon plan ('free' if free_tier is True, otherwise 'paid') (default is False).
+    requests_per_minute : int, optional
+        Request budget per minute for concurrent fetching. If None, the budget for the plan is used.
+    max_workers : int, optional
+        Number of concurrent requests when concurrent_fetch is True (default is 4).
+    update_gap_index : bool, optional
+        If True, update the gap index (the runs of missing bars) of the ticker with the
+        stored data (default is False).
+    max_backfill_requests : int, optional
+        Maximum number of requests for the missing bars when force_existing_check is True,
+        most recent gaps first (default is None, for no limit).
 
     Returns:
     --------
@@ -149,33 +174,85 @@ def polygon_pull_data(
     # Check for force_existing_check flag
     if force_existing_check == True:
         print("Forcing check of existing data...")
-        current_start = start_date
-
-    full_history_df = polygon_fetch_full_history(
-        client=client,
-        ticker=ticker,
-        timespan=timespan,
-        multiplier=multiplier,
-        adjusted=adjusted,
-        existing_history_df=existing_history_df,
-        current_start=current_start,
-        free_tier=free_tier,
-        verbose=verbose,
-    )
+        if starting_rows:
+            # Refetch only the missing bars instead of walking the whole range from start_date again
+            existing_history_df = polygon_backfill(
+                base_directory=base_directory,
+                client=client,
+                ticker=ticker,
+                source=source,
+                asset_class=asset_class,
+                timespan=timespan,
+                multiplier=multiplier,
+                adjusted=adjusted,
+                existing_history_df=existing_history_df,
+                start_date=start_date,
+                tier="free" if free_tier == True else "paid",
+                requests_per_minute=requests_per_minute,
+                max_requests=max_backfill_requests,
+                max_workers=max_workers,
+                verbose=verbose,
+            )
+        else:
+            current_start = start_date
+
+    if concurrent_fetch == True:
+        full_history_df = polygon_fetch_full_history_concurrent(
+            client=client,
+            ticker=ticker,
+            timespan=timespan,
+            multiplier=multiplier,
+            adjusted=adjusted,
+            existing_history_df=existing_history_df,
+            current_start=current_start,
+            tier="free" if free_tier == True else "paid",
+            requests_per_minute=requests_per_minute,
+            max_workers=max_workers,
+            verbose=verbose,
+        )
+    else:
+        full_history_df = polygon_fetch_full_history(
+            client=client,
+            ticker=ticker,
+            timespan=timespan,
+            multiplier=multiplier,
+            adjusted=adjusted,
+            existing_history_df=existing_history_df,
+            current_start=current_start,
+            free_tier=free_tier,
+            verbose=verbose,
+        )
 
     # Create directory
     directory = f"{base_directory}/{source}/{asset_class}/{timespan}"
     os.makedirs(directory, exist_ok=True)
 
-    # Export to Excel
-    if excel_export == True:
-        print(f"Exporting {ticker} {timespan} data to Excel...")
-        full_history_df.to_excel(f"{directory}/{ticker}.xlsx", sheet_name="data")
-
-    # Export to Pickle
+    # Export to Pickle and queue the export to Excel in the background
     if pickle_export == True:
         print(f"Exporting {ticker} {timespan} data to Pickle...")
-        full_history_df.to_pickle(f"{directory}/{ticker}.pkl")
+    if excel_export == True:
+        print(f"Queueing export of {ticker} {timespan} data to Excel...")
+    export_data(
+        df=full_history_df,
+        directory=directory,
+        file_name=f"{ticker}",
+        excel_export=excel_export,
+        pickle_export=pickle_export,
+    )
+
+    # Update the gap index with the stored bars
+    if update_gap_index == True:
+        gap_index_update(
+            base_directory=base_directory,
+            df=full_history_df,
+            ticker=ticker,
+            source=source,
+            asset_class=asset_class,
+            timeframe=timespan,
+            granularity=POLYGON_TIMESPAN_SECONDS[timespan] * multiplier,
+        )
+    else:
+        pass
 
     total_rows = len(full_history_df)
 
@@ -1,6 +1,8 @@
 import os
 import pandas as pd
 
+from export_data import export_data
+
 def polygon_quarter_end(
     base_directory,
     ticker: str,
@@ -63,17 +65,14 @@ def polygon_quarter_end(
     directory = f"{base_directory}/{source}/{asset_class}/Quarter_End"
     os.makedirs(directory, exist_ok=True)
 
-    # Export to excel
-    if excel_export == True:
-        df_quarter_end.to_excel(f"{directory}/{ticker}_QE.xlsx", sheet_name="data")
-    else:
-        pass
-
-    # Export to pickle
-    if pickle_export == True:
-        df_quarter_end.to_pickle(f"{directory}/{ticker}_QE.pkl")
-    else:
-        pass
+    # Export to pickle and queue the export to excel in the background
+    export_data(
+        df=df_quarter_end,
+        directory=directory,
+        file_name=f"{ticker}_QE",
+        excel_export=excel_export,
+        pickle_export=pickle_export,
+    )
 
     # Output confirmation
     if output_confirmation == True:
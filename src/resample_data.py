@@ -0,0 +1,108 @@
+import os
+import pandas as pd
+
+from export_data import export_data
+
+# Resample rule, output directory, file suffix and description for each frequency
+RESAMPLE_FREQUENCIES = {
+    "ME": ("ME", "Month_End", "_ME", "Month end"),
+    "ME_TR": ("ME", "Month_End_Total_Return", "_ME_TR", "Month end total return"),
+    "QE": ("QE", "Quarter_End", "_QE", "Quarter end"),
+    "QE_TR": ("QE", "Quarter_End_Total_Return", "_QE_TR", "Quarter end total return"),
+}
+
+def resample_data(
+    base_directory,
+    df: pd.DataFrame,
+    ticker: str,
+    source: str,
+    asset_class: str,
+    columns: dict,
+    excel_export: bool,
+    pickle_export: bool,
+    output_confirmation: bool,
+) -> dict:
+
+    """
+    Resample daily data to month-end and quarter-end frequencies in one pass and export the results.
+
+    Takes the daily DataFrame that was just pulled, so the daily file does not need
+    to be read again for each frequency. Each resample rule is applied once to all
+    of the columns required by the frequencies that share it. The exported files
+    are the same as the ones from the yf_*, ndl_* and polygon_* month and quarter
+    end functions.
+
+    Parameters:
+    -----------
+    base_directory
+        Root path to store downloaded data.
+    df : pd.DataFrame
+        Daily data with a 'Date' column or index.
+    ticker : str
+        Ticker symbol.
+    source : str
+        Name of the data source (e.g., 'Yahoo').
+    asset_class : str
+        Asset class name (e.g., 'Equities').
+    columns : dict
+        Dictionary of frequency ('ME', 'ME_TR', 'QE', 'QE_TR') to the list of
+        columns to keep (e.g., {'ME': ['Close'], 'ME_TR': ['Adj Close']}).
+    excel_export : bool
+        If True, export data to Excel format.
+    pickle_export : bool
+        If True, export data to Pickle format.
+    output_confirmation : bool
+        If True, print confirmation message.
+
+    Returns:
+    --------
+    dict
+        Dictionary of frequency to the resampled DataFrame.
+    """
+
+    for frequency in columns:
+        if frequency not in RESAMPLE_FREQUENCIES:
+            raise Exception(f"Invalid frequency: {frequency}. Acceptable frequencies are: {list(RESAMPLE_FREQUENCIES.keys())}.")
+
+    # Set index to date column
+    if 'Date' in df.columns:
+        df = df.set_index('Date')
+
+    # Resample each rule once for all of the columns that need it
+    resampled = {}
+    for rule in dict.fromkeys(RESAMPLE_FREQUENCIES[frequency][0] for frequency in columns):
+        rule_columns = list(dict.fromkeys(
+            column
+            for frequency in columns
+            if RESAMPLE_FREQUENCIES[frequency][0] == rule
+            for column in columns[frequency]
+        ))
+        resampled[rule] = df[rule_columns].resample(rule).last()
+
+    results = {}
+    for frequency, frequency_columns in columns.items():
+        rule, folder, suffix, description = RESAMPLE_FREQUENCIES[frequency]
+        df_resampled = resampled[rule][frequency_columns]
+        results[frequency] = df_resampled
+
+        # Create directory
+        directory = f"{base_directory}/{source}/{asset_class}/{folder}"
+        os.makedirs(directory, exist_ok=True)
+
+        # Export to pickle and queue the export to excel in the background
+        export_data(
+            df=df_resampled,
+            directory=directory,
+            file_name=f"{ticker}{suffix}",
+            excel_export=excel_export,
+            pickle_export=pickle_export,
+        )
+
+        # Output confirmation
+        if output_confirmation == True:
+            print(f"{description} data complete for {ticker}")
+            print(f"--------------------")
+        else:
+            pass
+
+    return results
@@ -0,0 +1,76 @@
+import pandas as pd
+import numpy as np
+
+def rolling_summary_stats(
+    df: pd.DataFrame,
+    period: str,
+    window: int,
+    use_calendar_days: bool,
+    min_periods: int = None,
+) -> pd.DataFrame:
+
+    """
+    Calculate rolling summary statistics (e.g., 36 month rolling Sharpe ratio) for all columns at once.
+
+    The annualized mean, volatility, Sharpe ratio, and CAGR are calculated from rolling
+    sums that are updated as each return enters and leaves the window, instead of
+    recomputing summary_stats for every window. The CAGR uses the rolling sum of
+    log(1 + return), which gives the compounded growth over the window.
+
+    Parameters:
+    -----------
+    df (pd.DataFrame):
+        Dataframe with return data. Assumes returns are in decimal format (e.g., 0.05 for 5%), with one column per fund or strategy.
+    period (str):
+        Period of the return data. Options are "Monthly", "Weekly", "Daily".
+    window (int):
+        Number of periods in each window, e.g., 36 for 36 months of monthly returns.
+    use_calendar_days (bool):
+        If True, use calendar days for calculations. If False, use trading days.
+    min_periods (int):
+        Minimum number of returns in a window to calculate the statistics (default is None, the full window).
+
+    Returns:
+    --------
+    df_rolling_stats (pd.DataFrame):
+        pd.DataFrame: DataFrame with the same index as df and two column levels, the statistic
+        ('Annualized Mean', 'Annualized Volatility', 'Annualized Sharpe Ratio', 'CAGR') and the column of df.
+    """
+
+    # Get the period in proper format
+    period = period.strip().capitalize()
+
+    # Map base timeframes
+    period_to_timeframe = {
+        "Monthly": 12,
+        "Weekly": 52,
+        "Daily": 365 if use_calendar_days else 252,
+    }
+
+    try:
+        timeframe = period_to_timeframe[period]
+    except KeyError:
+        raise ValueError(f"Invalid period: {period}. Must be one of {list(period_to_timeframe.keys())}")
+
+    rolling = df.rolling(window=window, min_periods=min_periods)
+
+    rolling_mean = rolling.mean() * timeframe # annualized
+    rolling_volatility = rolling.std() * np.sqrt(timeframe) # annualized
+    rolling_sharpe = rolling_mean / rolling_volatility
+
+    # Compounded growth over the window from the rolling sum of log returns
+    log_returns = np.log1p(df)
+    rolling_log_growth = log_returns.rolling(window=window, min_periods=min_periods)
+    rolling_cagr = np.exp(rolling_log_growth.sum() * timeframe / rolling_log_growth.count()) - 1
+
+    df_rolling_stats = pd.concat(
+        {
+            'Annualized Mean': rolling_mean,
+            'Annualized Volatility': rolling_volatility,
+            'Annualized Sharpe Ratio': rolling_sharpe,
+            'CAGR': rolling_cagr,
+        },
+        axis=1,
+    )
+
+    return df_rolling_stats
@@ -0,0 +1,43 @@
+import pandas as pd
+
+
+def rolling_time_mean(
+    data: pd.DataFrame,
+    columns: list,
+    window: str,
+    min_periods: int = 1,
+) -> pd.DataFrame:
+    """
+    Calculates time-based rolling means ('7D', '30D') for many columns of the merged price frame.
+
+    Each mean covers the bars in (t - window, t], so a window never spans more than
+    the requested time when bars are missing (a 1440 * days bar count window spans
+    more than the number of days whenever there are gaps). The windows are taken on
+    the Date column of the wide frame (no DatetimeIndex is set and no column is
+    re-indexed). pandas finds the window bounds with a two-pointer scan over the
+    sorted dates, where the window start only moves forward, so each column is a
+    single O(n) pass no matter how many bars are missing. Missing values are skipped.
+
+    Parameters
+    ----------
+    data : pd.DataFrame
+        DataFrame containing merged price data for all tickers, sorted by 'Date'.
+    columns : list
+        Columns to average, e.g., ["BTC-USD_close", "ETH-USD_close"].
+    window : str
+        Length of the window as a pandas offset, e.g., "7D" or "30D".
+    min_periods : int, optional
+        Minimum number of non-missing values in the window (default is 1).
+
+    Returns
+    -------
+    pd.DataFrame
+        DataFrame with the rolling mean of each column, with the same index as data.
+    """
+
+    if not data["Date"].is_monotonic_increasing:
+        raise Exception("Invalid data: the 'Date' column must be sorted in increasing order.")
+
+    rolling = data[["Date"] + list(columns)].rolling(window, on="Date", min_periods=min_periods)
+
+    return rolling.mean()[list(columns)]
@@ -0,0 +1,415 @@
+import itertools
+import numpy as np
+import pandas as pd
+
+def _rebalance_date_flags(
+    dates: pd.Series,
+    rebal_month: int,
+    rebal_day: int,
+) -> np.ndarray:
+    # Annual rebalance on the first date in the month on or after the day, for each year
+    month_day_mask = ((dates.dt.month == rebal_month) & (dates.dt.day >= rebal_day)).to_numpy()
+    rows = np.flatnonzero(month_day_mask)
+    years = dates.dt.year.to_numpy()[rows]
+
+    # First matching date of each year (an empty selection if no date matches, e.g., rebal_day=30 in February)
+    first_of_year = np.diff(years, prepend=years[:1] - 1) != 0
+
+    flags = np.zeros(len(dates), dtype=bool)
+    flags[rows[first_of_year]] = True
+    return flags
+
+def _harry_brown_perm_port_engine(
+    close_nparray: np.ndarray,
+    starting_cash: float,
+    cash_contrib: float,
+    rebal_flags: np.ndarray,
+    rebal_per_high: np.ndarray,
+    rebal_per_low: np.ndarray,
+    store_funds: bool,
+) -> tuple:
+    # Day loop over (parameter set x fund) arrays. The shares carried from one day to the next
+    # go through the same $ invested -> shares round trip as strategy_harry_brown_perm_port,
+    # so the results are identical to the iterrows version.
+    n, num_funds = close_nparray.shape
+    n_sets = rebal_flags.shape[0]
+    weight = 1 / num_funds
+
+    rebal_per_high = rebal_per_high[:, None]
+    rebal_per_low = rebal_per_low[:, None]
+
+    shares = np.tile(starting_cash / num_funds / close_nparray[0], (n_sets, 1))
+
+    total_aa_invested = np.empty((n_sets, n))
+    total_aa_invested[:, 0] = starting_cash
+    rebalance = np.zeros((n_sets, n), dtype=bool)
+
+    if store_funds == True:
+        aa_shares = np.empty((n, n_sets, num_funds))
+        aa_invested = np.empty((n, n_sets, num_funds))
+        aa_shares[0] = shares
+        aa_invested[0] = shares * close_nparray[0]
+    else:
+        pass
+
+    for i in range(1, n):
+        close = close_nparray[i]
+
+        # Before action (BA) $ invested and port %, summed fund by fund
+        ba_invested = shares * close
+        total_ba = ba_invested[:, 0]
+        for fund in range(1, num_funds):
+            total_ba = total_ba + ba_invested[:, fund]
+        ba_port = ba_invested / total_ba[:, None]
+
+        # Annual rebalance date, or any fund outside of the rebalance band
+        rebalance_today = (
+            rebal_flags[:, i]
+            | (ba_port > rebal_per_high).any(axis=1)
+            | (ba_port < rebal_per_low).any(axis=1)
+        )
+
+        # Rebalance back to equal weights, else divide the contribution evenly across funds
+        invested = np.where(
+            rebalance_today[:, None],
+            ((total_ba + cash_contrib) * weight)[:, None],
+            ba_invested + cash_contrib * weight,
+        )
+        shares = invested / close
+
+        total_aa = invested[:, 0]
+        for fund in range(1, num_funds):
+            total_aa = total_aa + invested[:, fund]
+
+        total_aa_invested[:, i] = total_aa
+        rebalance[:, i] = rebalance_today
+
+        if store_funds == True:
+            aa_shares[i] = shares
+            aa_invested[i] = invested
+        else:
+            pass
+
+    if store_funds == True:
+        return total_aa_invested, rebalance, aa_shares, aa_invested
+    else:
+        return total_aa_invested, rebalance, None, None
+
+def strategy_harry_brown_perm_port_vectorized(
+    fund_list: str,
+    starting_cash: int,
+    cash_contrib: int,
+    close_prices_df: pd.DataFrame,
+    rebal_month: int,
+    rebal_day: int,
+    rebal_per_high: float,
+    rebal_per_low: float,
+    excel_export: bool,
+    pickle_export: bool,
+    output_confirmation: bool,
+) -> pd.DataFrame:
+
+    """
+    Execute the re-balance strategy based on specified criteria, using NumPy arrays.
+
+    Same output as strategy_harry_brown_perm_port, but the shares and $ invested are
+    carried in a loop over the close price array instead of reading and writing
+    every cell of the dataframe with iterrows. The port %, totals, and returns are
+    calculated for all days at once after the loop.
+
+    Parameters:
+    -----------
+    fund_list (str):
+        List of funds for data to be combined from. Funds are strings in the form "BTC-USD".
+    starting_cash (int):
+        Starting investment balance.
+    cash_contrib (int):
+        Cash contribution to be made daily.
+    close_prices_df (pd.DataFrame):
+        DataFrame containing date and close prices for all funds to be included.
+    rebal_month (int):
+        Month for annual rebalance.
+    rebal_day (int):
+        Day for annual rebalance.
+    rebal_per_high (float):
+        High percentage for rebalance.
+    rebal_per_low (float):
+        Low percentage for rebalance.
+    excel_export : bool
+        If True, export data to Excel format.
+    pickle_export : bool
+        If True, export data to Pickle format.
+    output_confirmation : bool
+        If True, print confirmation message.
+
+    Returns:
+    --------
+    df (pd.DataFrame):
+        DataFrame containing strategy data for all funds to be included, with the same
+        columns as strategy_harry_brown_perm_port.
+    """
+
+    num_funds = len(fund_list)
+    weight = 1 / num_funds
+
+    df = close_prices_df.reset_index()
+
+    close_nparray = np.column_stack([df[fund + "_Close"].to_numpy(dtype="float64") for fund in fund_list])
+    rebal_flags = _rebalance_date_flags(df["Date"], rebal_month, rebal_day)
+
+    total_aa_invested, rebalance, aa_shares, aa_invested = _harry_brown_perm_port_engine(
+        close_nparray=close_nparray,
+        starting_cash=starting_cash,
+        cash_contrib=cash_contrib,
+        rebal_flags=rebal_flags[None, :],
+        rebal_per_high=np.array([rebal_per_high], dtype="float64"),
+        rebal_per_low=np.array([rebal_per_low], dtype="float64"),
+        store_funds=True,
+    )
+    aa_shares = aa_shares[:, 0, :]
+    aa_invested = aa_invested[:, 0, :]
+
+    # Before action (BA) shares are the previous day's after action (AA) shares
+    ba_shares = np.vstack([aa_shares[:1], aa_shares[:-1]])
+    ba_invested = ba_shares * close_nparray
+
+    total_ba_invested = ba_invested[:, 0].copy()
+    for fund in range(1, num_funds):
+        total_ba_invested = total_ba_invested + ba_invested[:, fund]
+    total_ba_invested[0] = starting_cash
+
+    ba_port = ba_invested / total_ba_invested[:, None]
+    ba_port[0] = weight
+
+    aa_port = aa_invested / total_aa_invested[0][:, None]
+    aa_port[0] = weight
+
+    # Same column order as strategy_harry_brown_perm_port
+    strategy_cols = {}
+    for fund_number, fund in enumerate(fund_list):
+        strategy_cols[fund + "_BA_Shares"] = ba_shares[:, fund_number]
+        strategy_cols[fund + "_BA_$_Invested"] = ba_invested[:, fund_number]
+        strategy_cols[fund + "_BA_Port_%"] = ba_port[:, fund_number]
+
+    strategy_cols['Total_BA_$_Invested'] = total_ba_invested
+    strategy_cols['Contribution'] = np.full(len(df), cash_contrib)
+    strategy_cols['Rebalance'] = np.where(rebalance[0], "Yes", "No")
+
+    for fund_number, fund in enumerate(fund_list):
+        strategy_cols[fund + "_AA_Shares"] = aa_shares[:, fund_number]
+        strategy_cols[fund + "_AA_$_Invested"] = aa_invested[:, fund_number]
+        strategy_cols[fund + "_AA_Port_%"] = aa_port[:, fund_number]
+
+    strategy_cols['Total_AA_$_Invested'] = total_aa_invested[0]
+
+    df = pd.concat([df, pd.DataFrame(strategy_cols, index=df.index)], axis=1)
+
+    df['Return'] = df['Total_AA_$_Invested'].pct_change()
+    df['Cumulative_Return'] = (1 + df['Return']).cumprod()
+
+    plan_name = '_'.join(fund_list)
+
+    # Export to excel
+    if excel_export == True:
+        df.to_excel(f"{plan_name}_Strategy.xlsx", sheet_name="data")
+    else:
+        pass
+
+    # Export to pickle
+    if pickle_export == True:
+        df.to_pickle(f"{plan_name}_Strategy.pkl")
+    else:
+        pass
+
+    # Output confirmation
+    if output_confirmation == True:
+        print(f"Strategy complete for {plan_name}")
+    else:
+        pass
+
+    return df
+
+def strategy_harry_brown_perm_port_batch(
+    fund_list: str,
+    starting_cash: int,
+    cash_contrib: int,
+    close_prices_df: pd.DataFrame,
+    param_grid: dict,
+    use_calendar_days: bool = False,
+) -> pd.DataFrame:
+
+    """
+    Execute the re-balance strategy for many combinations of the rebalance criteria at once.
+
+    Every combination of rebal_per_high, rebal_per_low, rebal_month, and rebal_day in
+    the grid is run through the same day loop as strategy_harry_brown_perm_port_vectorized,
+    with the combinations as rows of the arrays, so each day is processed once for all
+    of the combinations. Only the total $ invested is kept for each combination.
+
+    Parameters:
+    -----------
+    fund_list (str):
+        List of funds for data to be combined from. Funds are strings in the form "BTC-USD".
+    starting_cash (int):
+        Starting investment balance.
+    cash_contrib (int):
+        Cash contribution to be made daily.
+    close_prices_df (pd.DataFrame):
+        DataFrame containing date and close prices for all funds to be included.
+    param_grid (dict):
+        Lists of values for 'rebal_per_high', 'rebal_per_low', 'rebal_month', and
+        'rebal_day', e.g., {"rebal_per_high": [0.30, 0.35], "rebal_per_low": [0.15, 0.20],
+        "rebal_month": [1], "rebal_day": [1]}.
+    use_calendar_days (bool):
+        If True, annualize with 365 days. If False, annualize with 252 trading days
+        (default is False).
+
+    Returns:
+    --------
+    df_results (pd.DataFrame):
+        DataFrame with one row per combination, with the final total $ invested,
+        cumulative return, annualized mean, volatility, Sharpe ratio, CAGR, max
+        drawdown, and number of rebalances.
+    """
+
+    param_names = ["rebal_per_high", "rebal_per_low", "rebal_month", "rebal_day"]
+    missing = [name for name in param_names if name not in param_grid]
+    if missing:
+        raise Exception(f"Invalid param_grid: missing {missing}. Acceptable params are: {param_names}.")
+
+    combos = pd.DataFrame(
+        list(itertools.product(*[param_grid[name] for name in param_names])),
+        columns=param_names,
+    )
+
+    df = close_prices_df.reset_index()
+    close_nparray = np.column_stack([df[fund + "_Close"].to_numpy(dtype="float64") for fund in fund_list])
+
+    # Rebalance dates once per distinct (month, day)
+    month_day_flags = {
+        (month, day): _rebalance_date_flags(df["Date"], month, day)
+        for month, day in combos[["rebal_month", "rebal_day"]].drop_duplicates().itertuples(index=False)
+    }
+    rebal_flags = np.vstack([
+        month_day_flags[(month, day)]
+        for month, day in combos[["rebal_month", "rebal_day"]].itertuples(index=False)
+    ])
+
+    total_aa_invested, rebalance, _, _ = _harry_brown_perm_port_engine(
+        close_nparray=close_nparray,
+        starting_cash=starting_cash,
+        cash_contrib=cash_contrib,
+        rebal_flags=rebal_flags,
+        rebal_per_high=combos["rebal_per_high"].to_numpy(dtype="float64"),
+        rebal_per_low=combos["rebal_per_low"].to_numpy(dtype="float64"),
+        store_funds=False,
+    )
+
+    timeframe = 365 if use_calendar_days else 252
+
+    # Daily returns (combination x day), same as the Return column of the strategy
+    returns = total_aa_invested[:, 1:] / total_aa_invested[:, :-1] - 1
+    cumulative_return = np.cumprod(1 + returns, axis=1)
+
+    df_results = combos.copy()
+    df_results['Total_AA_$_Invested'] = total_aa_invested[:, -1]
+    df_results['Cumulative_Return'] = cumulative_return[:, -1]
+    df_results['Annualized Mean'] = returns.mean(axis=1) * timeframe
+    df_results['Annualized Volatility'] = returns.std(axis=1, ddof=1) * np.sqrt(timeframe)
+    df_results['Annualized Sharpe Ratio'] = df_results['Annualized Mean'] / df_results['Annualized Volatility']
+    df_results['CAGR'] = cumulative_return[:, -1] ** (1 / (returns.shape[1] / timeframe)) - 1
+
+    previous_peaks = np.maximum.accumulate(cumulative_return, axis=1)
+    df_results['Max Drawdown'] = ((cumulative_return - previous_peaks) / previous_peaks).min(axis=1)
+    df_results['Rebalances'] = rebalance.sum(axis=1)
+
+    return df_results
+
+if __name__ == "__main__":
+
+    from load_data import load_data
+    from settings import config
+
+    # Get the environment variable for where data is stored
+    DATA_DIR = config("DATA_DIR")
+
+    fund_list = ["SPY", "TLT", "GLD", "BIL"]
+
+    close_prices_df = pd.concat(
+        [
+            load_data(
+                base_directory=DATA_DIR,
+                ticker=fund,
+                source="Yahoo_Finance",
+                asset_class="Exchange_Traded_Funds",
+                timeframe="Daily",
+                file_format="pickle",
+            )[["Close"]].rename(columns={"Close": fund + "_Close"})
+            for fund in fund_list
+        ],
+        axis=1,
+    ).dropna()
+
+    strategy = strategy_harry_brown_perm_port_vectorized(
+        fund_list=fund_list,
+        starting_cash=10000,
+        cash_contrib=0,
+        close_prices_df=close_prices_df,
+        rebal_month=1,
+        rebal_day=1,
+        rebal_per_high=0.35,
+        rebal_per_low=0.15,
+        excel_export=False,
+        pickle_export=False,
+        output_confirmation=True,
+    )
+    print(strategy.tail())
+
+    results = strategy_harry_brown_perm_port_batch(
+        fund_list=fund_list,
+        starting_cash=10000,
+        cash_contrib=0,
+        close_prices_df=close_prices_df,
+        param_grid={
+            "rebal_per_high": [0.30, 0.35, 0.40],
+            "rebal_per_low": [0.10, 0.15, 0.20],
+            "rebal_month": [1, 7],
+            "rebal_day": [1],
+        },
+    )
+    print(results.sort_values(by="CAGR", ascending=False).head(10))
+
+    # Check against strategy_harry_brown_perm_port when no date matches the rebalance month and day
+    # (February 30th, and data that ends before the rebalance month)
+    from strategy_harry_brown_perm_port import strategy_harry_brown_perm_port
+
+    short_prices_df = close_prices_df.iloc[:40]
+    missing_month = [month for month in range(1, 13) if month not in short_prices_df.index.month][0]
+
+    for prices_df, rebal_month, rebal_day in [(close_prices_df, 2, 30), (short_prices_df, missing_month, 1)]:
+        strategy_args = dict(
+            fund_list=fund_list,
+            starting_cash=10000.0,
+            cash_contrib=0,
+            close_prices_df=prices_df,
+            rebal_month=rebal_month,
+            rebal_day=rebal_day,
+            rebal_per_high=0.35,
+            rebal_per_low=0.15,
+            excel_export=False,
+            pickle_export=False,
+            output_confirmation=False,
+        )
+        pd.testing.assert_frame_equal(
+            strategy_harry_brown_perm_port(**strategy_args),
+            strategy_harry_brown_perm_port_vectorized(**strategy_args),
+            check_dtype=False,
+        )
+
+        strategy_harry_brown_perm_port_batch(
+            fund_list=fund_list,
+            starting_cash=10000,
+            cash_contrib=0,
+            close_prices_df=prices_df,
+            param_grid={"rebal_per_high": [0.35], "rebal_per_low": [0.15], "rebal_month": [1, rebal_month], "rebal_day": [1, rebal_day]},
+        )
@@ -0,0 +1,128 @@
+import pandas as pd
+import numpy as np
+
+def summary_stats_vectorized(
+    fund_list: list[str],
+    df: pd.DataFrame,
+    period: str,
+    use_calendar_days: bool,
+    excel_export: bool,
+    pickle_export: bool,
+    output_confirmation: bool,
+) -> pd.DataFrame:
+
+    """
+    Calculate summary statistics for the given fund list and return data, for all columns at once.
+
+    Same statistics as summary_stats, but the CAGR, drawdown, peak, trough, and recovery
+    are calculated for every column of the return data in one pass over a NumPy array
+    (no per-column slicing or temporary dataframes). With a single column the result
+    is the same as summary_stats; with multiple columns each column gets its own CAGR
+    and max/min return dates.
+
+    Parameters:
+    -----------
+    fund_list (str):
+        List of funds. This is used below in the excel/pickle export but not in the analysis.. Funds are strings in the form "BTC-USD".
+    df (pd.DataFrame):
+        Dataframe with return data. Assumes returns are in decimal format (e.g., 0.05 for 5%), with one column per fund or strategy.
+    period (str):
+        Period for which to calculate statistics. Options are "Monthly", "Weekly", "Daily".
+    use_calendar_days (bool):
+        If True, use calendar days for calculations. If False, use trading days.
+    excel_export : bool
+        If True, export data to Excel format.
+    pickle_export : bool
+        If True, export data to Pickle format.
+    output_confirmation : bool
+        If True, print confirmation message.
+
+    Returns:
+    --------
+    df_stats (pd.DataFrame):
+        pd.DataFrame: DataFrame containing various portfolio statistics, one row per column of df.
+    """
+
+    # Get the period in proper format
+    period = period.strip().capitalize()
+
+    # Map base timeframes
+    period_to_timeframe = {
+        "Monthly": 12,
+        "Weekly": 52,
+        "Daily": 365 if use_calendar_days else 252,
+    }
+
+    try:
+        timeframe = period_to_timeframe[period]
+    except KeyError:
+        raise ValueError(f"Invalid period: {period}. Must be one of {list(period_to_timeframe.keys())}")
+
+    df_stats = pd.DataFrame(df.mean(axis=0) * timeframe) # annualized
+    df_stats.columns = ['Annualized Mean']
+    df_stats['Annualized Volatility'] = df.std() * np.sqrt(timeframe) # annualized
+    df_stats['Annualized Sharpe Ratio'] = df_stats['Annualized Mean'] / df_stats['Annualized Volatility']
+
+    # Growth of 1 for every column (missing returns are skipped, like cumprod)
+    returns = df.to_numpy(dtype="float64")
+    missing = np.isnan(returns)
+    growth = np.cumprod(np.where(missing, 1.0, 1 + returns), axis=0)
+    growth[missing] = np.nan
+
+    # Scalar power per column (the array power can differ from summary_stats in the last digit)
+    cagr = [final_growth ** (1 / (len(growth) / timeframe)) - 1 for final_growth in growth[-1]]
+    df_stats['CAGR'] = cagr
+
+    df_stats[f'{period} Max Return'] = df.max()
+    df_stats[f'{period} Max Return (Date)'] = df.idxmax()
+    df_stats[f'{period} Min Return'] = df.min()
+    df_stats[f'{period} Min Return (Date)'] = df.idxmin()
+
+    # Wealth index, previous peaks, and drawdowns for all columns at once
+    wealth_index = 1000 * growth
+    previous_peaks = np.fmax.accumulate(wealth_index, axis=0)
+    previous_peaks[missing] = np.nan
+    drawdowns = (wealth_index - previous_peaks) / previous_peaks
+
+    columns = np.arange(returns.shape[1])
+    rows = np.arange(returns.shape[0])[:, None]
+
+    # Trough is the max drawdown; peak is the first row up to the trough at the trough's previous peak
+    trough_rows = np.nanargmin(drawdowns, axis=0)
+    trough_peaks = previous_peaks[trough_rows, columns]
+    peak_rows = np.argmax((previous_peaks == trough_peaks) & (rows <= trough_rows), axis=0)
+
+    # Recovery is the first row from the trough where the wealth index is back to the peak
+    recovered = (wealth_index >= trough_peaks) & (rows >= trough_rows)
+    recovery_rows = np.argmax(recovered, axis=0)
+    recovery_dates = pd.Series(df.index[recovery_rows], index=df.columns)
+    recovery_dates[~recovered.any(axis=0)] = pd.NaT
+
+    df_stats['Max Drawdown'] = drawdowns[trough_rows, columns]
+    df_stats['Peak'] = df.index[peak_rows]
+    df_stats['Trough'] = df.index[trough_rows]
+    df_stats['Recovery Date'] = recovery_dates
+    df_stats['Days to Recover'] = (df_stats['Recovery Date'] - df_stats['Trough']).dt.days
+    df_stats['MAR Ratio'] = df_stats['CAGR'] / -df_stats['Max Drawdown']
+
+    plan_name = '_'.join(fund_list)
+
+    # Export to excel
+    if excel_export == True:
+        df_stats.to_excel(f"{plan_name}_Summary_Stats.xlsx", sheet_name="data")
+    else:
+        pass
+
+    # Export to pickle
+    if pickle_export == True:
+        df_stats.to_pickle(f"{plan_name}_Summary_Stats.pkl")
+    else:
+        pass
+
+    # Output confirmation
+    if output_confirmation == True:
+        print(f"Summary stats complete for {plan_name}")
+    else:
+        pass
+
+    return df_stats
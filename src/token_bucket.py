@@ -0,0 +1,67 @@
+import threading
+import time
+
+class TokenBucket:
+
+    """
+    Thread-safe token bucket rate limiter shared by concurrent API requests.
+
+    Tokens are added continuously at `rate` per second up to `capacity`. Each
+    request takes one token and waits if none are available, so the long-run
+    request rate never exceeds `rate` while short bursts up to `capacity` are
+    allowed. When the API responds with a rate limit error, `backoff` pauses
+    every consumer of the bucket, not just the thread that received the error.
+
+    Parameters:
+    -----------
+    rate : float
+        Number of tokens added per second (sustained requests per second).
+    capacity : float
+        Maximum number of tokens held by the bucket (burst size).
+
+    Example:
+    --------
+    >>> bucket = TokenBucket(rate=10, capacity=15)
+    >>> bucket.acquire()
+    """
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = float(rate)
+        self.capacity = float(capacity)
+        self.tokens = float(capacity)
+        self.last_refill = time.monotonic()
+        self.paused_until = 0.0
+        self.total_wait = 0.0
+        self.lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        # No tokens accrue while paused by a backoff
+        if now > self.last_refill:
+            self.tokens = min(self.capacity, self.tokens + (now - self.last_refill) * self.rate)
+            self.last_refill = now
+
+    def acquire(self, tokens: float = 1.0) -> float:
+        """Block until `tokens` are available and take them. Returns the seconds spent waiting."""
+        waited = 0.0
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self._refill(now)
+                if self.paused_until > now:
+                    wait = self.paused_until - now
+                elif self.tokens >= tokens:
+                    self.tokens -= tokens
+                    self.total_wait += waited
+                    return waited
+                else:
+                    wait = (tokens - self.tokens) / self.rate
+            time.sleep(wait)
+            waited += wait
+
+    def backoff(self, seconds: float) -> None:
+        """Pause all consumers for `seconds` and drain the bucket, e.g. after an HTTP 429."""
+        with self.lock:
+            now = time.monotonic()
+            self.paused_until = max(self.paused_until, now + seconds)
+            self.tokens = 0.0
+            self.last_refill = self.paused_until
@@ -0,0 +1,163 @@
+import numpy as np
+import pandas as pd
+
+# Columns of the trade log, in the order of the trades DataFrame of the backtests
+TRADE_COLUMNS = [
+    "asset", "entry_time", "entry_type", "entry_price", "exit_time", "exit_type", "exit_price",
+    "quantity", "allocation_pct", "pnl", "return", "cash", "entry_fee", "exit_fee",
+]
+TRADE_FLOAT_COLUMNS = ["entry_price", "exit_price", "quantity", "allocation_pct", "pnl", "return", "cash", "entry_fee", "exit_fee"]
+TRADE_TIME_COLUMNS = ["entry_time", "exit_time"]
+TRADE_CATEGORY_COLUMNS = ["asset", "entry_type", "exit_type"]
+
+# Order types written by the backtests
+TRADE_ENTRY_TYPES = ["limit", "market"]
+TRADE_EXIT_TYPES = ["exit at open (gap)", "trailing stop"]
+
+class TradeBuffer:
+
+    """
+    Preallocated, growable columnar trade log for backtests.
+
+    Each trade is written into typed arrays instead of a dict per trade: one
+    float64 block for the prices, quantities, fees, pnl, return and cash, one
+    int64 block for the entry and exit times (nanoseconds), and one block for the
+    codes of the asset and the entry and exit types (int8, or int16/int32 for more
+    than 126 assets). The blocks are column-major, so every column is a contiguous
+    array. When the buffer is full the capacity is doubled, so appending n trades
+    costs O(n) in total.
+
+    to_frame builds the same trades DataFrame as the backtests (with the asset and
+    order types as categoricals) from views of the blocks, without copying. The
+    frame shares memory with the buffer, and later appends do not change it.
+
+    Parameters:
+    -----------
+    assets : list
+        List of assets that can be traded, e.g., ["BTC-USD", "ETH-USD", "SOL-USD"].
+    capacity : int, optional
+        Number of trades to preallocate (default is 1,024).
+
+    Example:
+    --------
+    >>> trades = TradeBuffer(assets=["BTC-USD", "ETH-USD"])
+    >>> trades.append("BTC-USD", entry_time, "market", 100.0, exit_time, "trailing stop", 98.0,
+    ...     1.0, 1.0, -2.0, -0.02, 9998.0, 0.0, 0.0)
+    >>> trades_df = trades.to_frame(initial_capital=10_000)
+    """
+
+    def __init__(
+        self,
+        assets: list,
+        capacity: int = 1_024,
+    ):
+        # Sorted categories, so grouping by asset gives the same order as asset names
+        self.categories = {
+            "asset": sorted(assets),
+            "entry_type": TRADE_ENTRY_TYPES,
+            "exit_type": TRADE_EXIT_TYPES,
+        }
+        self.codes = {column: {value: code for code, value in enumerate(values)} for column, values in self.categories.items()}
+
+        self.capacity = max(int(capacity), 1)
+        self.n = 0
+        self.floats = np.empty((self.capacity, len(TRADE_FLOAT_COLUMNS)), dtype="float64", order="F")
+        self.times = np.empty((self.capacity, len(TRADE_TIME_COLUMNS)), dtype="int64", order="F")
+        # Smallest integer type for the codes of the largest category, chosen like pandas does for
+        # categorical codes (int8 up to 126 assets), so to_frame can use the codes without a copy
+        n_categories = max(len(values) for values in self.categories.values())
+        self.code_dtype = next(dtype for dtype in ["int8", "int16", "int32", "int64"] if n_categories < np.iinfo(dtype).max)
+        self.category_codes = np.empty((self.capacity, len(TRADE_CATEGORY_COLUMNS)), dtype=self.code_dtype, order="F")
+
+    def __len__(self) -> int:
+        return self.n
+
+    @property
+    def empty(self) -> bool:
+        """True if there are no trades (like DataFrame.empty)."""
+        return self.n == 0
+
+    def _grow(self) -> None:
+        # Double the capacity and copy the trades into the new blocks
+        self.capacity *= 2
+        for name in ["floats", "times", "category_codes"]:
+            block = getattr(self, name)
+            new_block = np.empty((self.capacity, block.shape[1]), dtype=block.dtype, order="F")
+            new_block[:self.n] = block[:self.n]
+            setattr(self, name, new_block)
+
+    def append(
+        self,
+        asset: str,
+        entry_time,
+        entry_type: str,
+        entry_price: float,
+        exit_time,
+        exit_type: str,
+        exit_price: float,
+        quantity: float,
+        allocation_pct: float,
+        pnl: float,
+        return_dec: float,
+        cash: float,
+        entry_fee: float,
+        exit_fee: float,
+    ) -> None:
+        """Add one closed trade to the buffer."""
+        if self.n == self.capacity:
+            self._grow()
+
+        try:
+            self.category_codes[self.n] = (
+                self.codes["asset"][asset],
+                self.codes["entry_type"][entry_type],
+                self.codes["exit_type"][exit_type],
+            )
+        except KeyError as e:
+            raise Exception(f"Invalid trade value: {e}. Acceptable values are: {self.categories}.")
+
+        self.times[self.n] = (pd.Timestamp(entry_time).value, pd.Timestamp(exit_time).value)
+        self.floats[self.n] = (entry_price, exit_price, quantity, allocation_pct, pnl, return_dec, cash, entry_fee, exit_fee)
+        self.n += 1
+
+    def __getitem__(self, column: str) -> np.ndarray:
+        """Return a column as a NumPy view (codes for the categorical columns)."""
+        if column in TRADE_FLOAT_COLUMNS:
+            return self.floats[:self.n, TRADE_FLOAT_COLUMNS.index(column)]
+        elif column in TRADE_TIME_COLUMNS:
+            return self.times[:self.n, TRADE_TIME_COLUMNS.index(column)].view("datetime64[ns]")
+        elif column in TRADE_CATEGORY_COLUMNS:
+            return self.category_codes[:self.n, TRADE_CATEGORY_COLUMNS.index(column)]
+        else:
+            raise KeyError(column)
+
+    def to_frame(
+        self,
+        initial_capital: float = None,
+    ) -> pd.DataFrame:
+        """
+        Return the trades as a DataFrame of views of the buffer (no copy).
+
+        If initial_capital is given and there are trades, the cumulative_pnl, equity and
+        cumulative_return columns are added, as in the backtests.
+        """
+        columns = {}
+        for column in TRADE_COLUMNS:
+            if column in TRADE_CATEGORY_COLUMNS:
+                columns[column] = pd.Categorical.from_codes(
+                    self[column],
+                    dtype=pd.CategoricalDtype(self.categories[column]),
+                    validate=False,
+                )
+            else:
+                columns[column] = self[column]
+
+        trades_df = pd.DataFrame(columns, copy=False)
+
+        # If there are entries, calc cumulative pnl, equity, cumulative return
+        if initial_capital is not None and not trades_df.empty:
+            trades_df["cumulative_pnl"] = trades_df["pnl"].cumsum()
+            trades_df["equity"] = trades_df["cumulative_pnl"] + initial_capital
+            trades_df["cumulative_return"] = trades_df["equity"] / initial_capital - 1
+
+        return trades_df
@@ -0,0 +1,53 @@
+import numpy as np
+import pandas as pd
+
+def yf_merge_incremental(
+    existing_df: pd.DataFrame,
+    new_df: pd.DataFrame,
+) -> pd.DataFrame:
+
+    """
+    Append newly downloaded Yahoo Finance data to the stored data if the history was not revised.
+
+    The prices (Close and Adj Close, if present) on the dates contained in both
+    DataFrames are compared. If they differ, e.g., because a dividend or split
+    adjusted the history, the stored data can not be extended and None is returned.
+
+    Parameters:
+    -----------
+    existing_df : pd.DataFrame
+        Stored daily data with a 'Date' index.
+    new_df : pd.DataFrame
+        Newly downloaded daily data with a 'Date' index, starting before the last stored date.
+
+    Returns:
+    --------
+    pd.DataFrame or None
+        Combined DataFrame, or None if the history was revised and a full download is required.
+    """
+
+    if new_df.empty:
+        return existing_df
+
+    if set(new_df.columns) != set(existing_df.columns):
+        return None
+
+    # Compare the prices on the dates in both the stored and new data
+    overlap_dates = existing_df.index.intersection(new_df.index)
+    if overlap_dates.empty:
+        return None
+
+    price_cols = [col for col in ["Close", "Adj Close"] if col in existing_df.columns]
+    unchanged = np.allclose(
+        existing_df.loc[overlap_dates, price_cols].to_numpy(dtype=float),
+        new_df.loc[overlap_dates, price_cols].to_numpy(dtype=float),
+        rtol=1e-6,
+        atol=0,
+        equal_nan=True,
+    )
+
+    if not unchanged:
+        return None
+
+    # Keep the stored data before the overlap and replace the rest
+    return pd.concat([existing_df[existing_df.index < new_df.index.min()], new_df[existing_df.columns]])
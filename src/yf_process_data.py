@@ -2,12 +2,9 @@
 This script uses existing functions to download daily price data from Yahoo Finance, then resample to month end data, then resample to month end total return data, then resample to quarter end data, and finally resample to quarter end total return data.
 """
 
+from resample_data import resample_data
 from settings import config
-from yf_pull_data import yf_pull_data
-from yf_month_end import yf_month_end
-from yf_month_end_total_return import yf_month_end_total_return
-from yf_quarter_end import yf_quarter_end
-from yf_quarter_end_total_return import yf_quarter_end_total_return
+from yf_pull_data_batch import yf_pull_data_batch
 
 # Get the environment variable for where data is stored
 DATA_DIR = config("DATA_DIR")
@@ -27,58 +24,36 @@ cryptocurrencies = [
     "XRP-USD",
 ]
 
+# Fetch raw data for all tickers in batched requests
+data = yf_pull_data_batch(
+    base_directory=DATA_DIR,
+    tickers=cryptocurrencies,
+    source="Yahoo_Finance",
+    asset_class="Cryptocurrencies",
+    excel_export=True,
+    pickle_export=True,
+    output_confirmation=True,
+    incremental=True,
+)
+
 # Iterate through each cryptocurrency
 for currency in cryptocurrencies:
-    # Fetch raw data
-    yf_pull_data(
-        base_directory=DATA_DIR,
-        ticker=currency,
-        source="Yahoo_Finance",
-        asset_class="Cryptocurrencies",
-        excel_export=True,
-        pickle_export=True,
-        output_confirmation=True,
-    )
+    # Use Adj Close if available, otherwise fall back to Close
+    total_return_column = "Adj Close" if "Adj Close" in data[currency].columns else "Close"
 
-    # Resample to month-end data
-    # yf_month_end(
-    #     base_directory=DATA_DIR,
-    #     ticker=currency,
-    #     source="Yahoo_Finance",
-    #     asset_class="Cryptocurrencies",
-    #     excel_export=True,
-    #     pickle_export=True,
-    #     output_confirmation=True,
-    # )
-
-    # Resample to month-end total return data
-    yf_month_end_total_return(
-        base_directory=DATA_DIR,
-        ticker=currency,
-        source="Yahoo_Finance",
-        asset_class="Cryptocurrencies",
-        excel_export=True,
-        pickle_export=True,
-        output_confirmation=True,
-    )
-
-    # Resample to quarter-end data
-    # yf_quarter_end(
-    #     base_directory=DATA_DIR,
-    #     ticker=currency,
-    #     source="Yahoo_Finance",
-    #     asset_class="Cryptocurrencies",
-    #     excel_export=True,
-    #     pickle_export=True,
-    #     output_confirmation=True,
-    # )
-
-    # Resample to quarter-end total return data
-    yf_quarter_end_total_return(
+    # Resample to month-end and quarter-end total return data in one pass
+    resample_data(
         base_directory=DATA_DIR,
+        df=data[currency],
         ticker=currency,
         source="Yahoo_Finance",
         asset_class="Cryptocurrencies",
+        columns={
+            # "ME": ["Close"],
+            "ME_TR": [total_return_column],
+            # "QE": ["Close"],
+            "QE_TR": [total_return_column],
+        },
         excel_export=True,
         pickle_export=True,
         output_confirmation=True,
@@ -90,64 +65,36 @@ equities = {
     'AMZN': 'Amazon.Com Inc',
 }
 
-# Iterate through each stock
-for stock in equities.keys():
-
-# Stock Data
-# equities = ["AMZN", "AAPL"]
+# Fetch raw data for all tickers in batched requests
+data = yf_pull_data_batch(
+    base_directory=DATA_DIR,
+    tickers=list(equities.keys()),
+    source="Yahoo_Finance",
+    asset_class="Equities",
+    excel_export=True,
+    pickle_export=True,
+    output_confirmation=True,
+    incremental=True,
+)
 
 # Iterate through each stock
-# for stock in equities:
-    # Fetch raw data
-    yf_pull_data(
-        base_directory=DATA_DIR,
-        ticker=stock,
-        source="Yahoo_Finance",
-        asset_class="Equities",
-        excel_export=True,
-        pickle_export=True,
-        output_confirmation=True,
-    )
-
-    # Resample to month-end data
-    # yf_month_end(
-    #     base_directory=DATA_DIR,
-    #     ticker=stock,
-    #     source="Yahoo_Finance",
-    #     asset_class="Equities",
-    #     excel_export=True,
-    #     pickle_export=True,
-    #     output_confirmation=True,
-    # )
-
-    # Resample to month-end total return data
-    yf_month_end_total_return(
-        base_directory=DATA_DIR,
-        ticker=stock,
-        source="Yahoo_Finance",
-        asset_class="Equities",
-        excel_export=True,
-        pickle_export=True,
-        output_confirmation=True,
-    )
-
-    # Resample to quarter-end data
-    # yf_quarter_end(
-    #     base_directory=DATA_DIR,
-    #     ticker=stock,
-    #     source="Yahoo_Finance",
-    #     asset_class="Equities",
-    #     excel_export=True,
-    #     pickle_export=True,
-    #     output_confirmation=True,
-    # )
+for stock in equities.keys():
+    # Use Adj Close if available, otherwise fall back to Close
+    total_return_column = "Adj Close" if "Adj Close" in data[stock].columns else "Close"
 
-    # Resample to quarter-end total return data
-    yf_quarter_end_total_return(
+    # Resample to month-end and quarter-end total return data in one pass
+    resample_data(
         base_directory=DATA_DIR,
+        df=data[stock],
         ticker=stock,
         source="Yahoo_Finance",
         asset_class="Equities",
+        columns={
+            # "ME": ["Close"],
+            "ME_TR": [total_return_column],
+            # "QE": ["Close"],
+            "QE_TR": [total_return_column],
+        },
         excel_export=True,
         pickle_export=True,
         output_confirmation=True,
@@ -156,58 +103,36 @@ for stock in equities.keys():
 # Index Data
 indices = ["^GSPC", "^VIX", "^VVIX"]
 
+# Fetch raw data for all tickers in batched requests
+data = yf_pull_data_batch(
+    base_directory=DATA_DIR,
+    tickers=indices,
+    source="Yahoo_Finance",
+    asset_class="Indices",
+    excel_export=True,
+    pickle_export=True,
+    output_confirmation=True,
+    incremental=True,
+)
+
 # Iterate through each index
 for index in indices:
-    # Fetch raw data
-    yf_pull_data(
-        base_directory=DATA_DIR,
-        ticker=index,
-        source="Yahoo_Finance",
-        asset_class="Indices",
-        excel_export=True,
-        pickle_export=True,
-        output_confirmation=True,
-    )
+    # Use Adj Close if available, otherwise fall back to Close
+    total_return_column = "Adj Close" if "Adj Close" in data[index].columns else "Close"
 
-    # Resample to month-end data
-    # yf_month_end(
-    #     base_directory=DATA_DIR,
-    #     ticker=index,
-    #     source="Yahoo_Finance",
-    #     asset_class="Indices",
-    #     excel_export=True,
-    #     pickle_export=True,
-    #     output_confirmation=True,
-    # )
-
-    # Resample to month-end total return data
-    yf_month_end_total_return(
-        base_directory=DATA_DIR,
-        ticker=index,
-        source="Yahoo_Finance",
-        asset_class="Indices",
-        excel_export=True,
-        pickle_export=True,
-        output_confirmation=True,
-    )
-
-    # Resample to quarter-end data
-    # yf_quarter_end(
-    #     base_directory=DATA_DIR,
-    #     ticker=index,
-    #     source="Yahoo_Finance",
-    #     asset_class="Indices",
-    #     excel_export=True,
-    #     pickle_export=True,
-    #     output_confirmation=True,
-    # )
-
-    # Resample to quarter-end total return data
-    yf_quarter_end_total_return(
+    # Resample to month-end and quarter-end total return data in one pass
+    resample_data(
         base_directory=DATA_DIR,
+        df=data[index],
         ticker=index,
         source="Yahoo_Finance",
         asset_class="Indices",
+        columns={
+            # "ME": ["Close"],
+            "ME_TR": [total_return_column],
+            # "QE": ["Close"],
+            "QE_TR": [total_return_column],
+        },
         excel_export=True,
         pickle_export=True,
         output_confirmation=True,
@@ -284,61 +209,36 @@ etfs = {
     'XLY': 'Consumer Discretionary Select Sector SPDR Fund'
 }
 
-# Iterate through each ETF
-for fund in etfs.keys():
+# Fetch raw data for all tickers in batched requests
+data = yf_pull_data_batch(
+    base_directory=DATA_DIR,
+    tickers=list(etfs.keys()),
+    source="Yahoo_Finance",
+    asset_class="Exchange_Traded_Funds",
+    excel_export=True,
+    pickle_export=True,
+    output_confirmation=True,
+    incremental=True,
+)
 
 # Iterate through each ETF
-# for fund in etfs:
-    # Fetch raw data
-    yf_pull_data(
-        base_directory=DATA_DIR,
-        ticker=fund,
-        source="Yahoo_Finance",
-        asset_class="Exchange_Traded_Funds",
-        excel_export=True,
-        pickle_export=True,
-        output_confirmation=True,
-    )
-
-    # Resample to month-end data
-    # yf_month_end(
-    #     base_directory=DATA_DIR,
-    #     ticker=fund,
-    #     source="Yahoo_Finance",
-    #     asset_class="Exchange_Traded_Funds",
-    #     excel_export=True,
-    #     pickle_export=True,
-    #     output_confirmation=True,
-    # )
-
-    # Resample to month-end total return data
-    yf_month_end_total_return(
-        base_directory=DATA_DIR,
-        ticker=fund,
-        source="Yahoo_Finance",
-        asset_class="Exchange_Traded_Funds",
-        excel_export=True,
-        pickle_export=True,
-        output_confirmation=True,
-    )
-
-    # Resample to quarter-end data
-    # yf_quarter_end(
-    #     base_directory=DATA_DIR,
-    #     ticker=fund,
-    #     source="Yahoo_Finance",
-    #     asset_class="Exchange_Traded_Funds",
-    #     excel_export=True,
-    #     pickle_export=True,
-    #     output_confirmation=True,
-    # )
+for fund in etfs.keys():
+    # Use Adj Close if available, otherwise fall back to Close
+    total_return_column = "Adj Close" if "Adj Close" in data[fund].columns else "Close"
 
-    # Resample to quarter-end total return data
-    yf_quarter_end_total_return(
+    # Resample to month-end and quarter-end total return data in one pass
+    resample_data(
         base_directory=DATA_DIR,
+        df=data[fund],
         ticker=fund,
         source="Yahoo_Finance",
         asset_class="Exchange_Traded_Funds",
+        columns={
+            # "ME": ["Close"],
+            "ME_TR": [total_return_column],
+            # "QE": ["Close"],
+            "QE_TR": [total_return_column],
+        },
         excel_export=True,
         pickle_export=True,
         output_confirmation=True,
@@ -347,58 +247,36 @@ for fund in etfs.keys():
 # Mutual Fund Data
 mutual_funds = ["VFIAX", "FXAIX", "TCIEX", "OGGYX", "VSMAX", "VBTLX", "VMVAX", "GIBIX"]
 
+# Fetch raw data for all tickers in batched requests
+data = yf_pull_data_batch(
+    base_directory=DATA_DIR,
+    tickers=mutual_funds,
+    source="Yahoo_Finance",
+    asset_class="Mutual_Funds",
+    excel_export=True,
+    pickle_export=True,
+    output_confirmation=True,
+    incremental=True,
+)
+
 # Iterate through each mutual fund
 for fund in mutual_funds:
-    # Fetch raw data
-    yf_pull_data(
-        base_directory=DATA_DIR,
-        ticker=fund,
-        source="Yahoo_Finance",
-        asset_class="Mutual_Funds",
-        excel_export=True,
-        pickle_export=True,
-        output_confirmation=True,
-    )
-
-    # Resample to month-end data
-    # yf_month_end(
-    #     base_directory=DATA_DIR,
-    #     ticker=fund,
-    #     source="Yahoo_Finance",
-    #     asset_class="Mutual_Funds",
-    #     excel_export=True,
-    #     pickle_export=True,
-    #     output_confirmation=True,
-    # )
-
-    # Resample to month-end total return data
-    yf_month_end_total_return(
-        base_directory=DATA_DIR,
-        ticker=fund,
-        source="Yahoo_Finance",
-        asset_class="Mutual_Funds",
-        excel_export=True,
-        pickle_export=True,
-        output_confirmation=True,
-    )
-
-    # Resample to quarter-end data
-    # yf_quarter_end(
-    #     base_directory=DATA_DIR,
-    #     ticker=fund,
-    #     source="Yahoo_Finance",
-    #     asset_class="Mutual_Funds",
-    #     excel_export=True,
-    #     pickle_export=True,
-    #     output_confirmation=True,
-    # )
+    # Use Adj Close if available, otherwise fall back to Close
+    total_return_column = "Adj Close" if "Adj Close" in data[fund].columns else "Close"
 
-    # Resample to quarter-end total return data
-    yf_quarter_end_total_return(
+    # Resample to month-end and quarter-end total return data in one pass
+    resample_data(
         base_directory=DATA_DIR,
+        df=data[fund],
         ticker=fund,
         source="Yahoo_Finance",
         asset_class="Mutual_Funds",
+        columns={
+            # "ME": ["Close"],
+            "ME_TR": [total_return_column],
+            # "QE": ["Close"],
+            "QE_TR": [total_return_column],
+        },
         excel_export=True,
         pickle_export=True,
         output_confirmation=True,
@@ -2,7 +2,10 @@ import os
 import pandas as pd
 import yfinance as yf
 
+from datetime import timedelta
+from export_data import export_data
 from IPython.display import display
+from yf_merge_incremental import yf_merge_incremental
 
 def yf_pull_data(
     base_directory,
@@ -12,11 +15,18 @@ def yf_pull_data(
     excel_export: bool,
     pickle_export: bool,
     output_confirmation: bool,
+    incremental: bool = False,
+    overlap_days: int = 10,
 ) -> pd.DataFrame:
     
     """
     Download daily price data from Yahoo Finance and export it.
 
+    In incremental mode, the existing pickle file is read and only the data after
+    the last stored date (plus an overlap of overlap_days) is downloaded. If the
+    prices in the overlap differ from the stored prices (e.g., because a dividend
+    or split adjusted the history), the full history is downloaded instead.
+
     Parameters:
     -----------
     base_directory
@@ -33,6 +43,11 @@ def yf_pull_data(
         If True, export data to Pickle format.
     output_confirmation : bool
         If True, print confirmation message.
+    incremental : bool, optional
+        If True, only download data since the last date in the existing pickle file (default is False).
+    overlap_days : int, optional
+        Number of calendar days before the last stored date to download again and
+        compare with the stored data in incremental mode (default is 10).
 
     Returns:
     --------
@@ -40,43 +55,75 @@ def yf_pull_data(
         DataFrame containing the downloaded data.
     """
     
-    # Download data from YF
-    df = yf.download(ticker, start="1900-01-01")
+    def download(start):
+        # Download data from YF
+        df = yf.download(ticker, start=start)
 
-    # Drop the column level with the ticker symbol
-    df.columns = df.columns.droplevel(1)
+        if df.empty:
+            return df
 
-    # Reset index
-    df = df.reset_index()
+        # Drop the column level with the ticker symbol
+        df.columns = df.columns.droplevel(1)
 
-    # Remove the "Price" header from the index
-    df.columns.name = None
+        # Reset index
+        df = df.reset_index()
 
-    # Reset date column
-    df['Date'] = df['Date'].dt.tz_localize(None)
+        # Remove the "Price" header from the index
+        df.columns.name = None
 
-    # Set 'Date' column as index
-    df = df.set_index('Date', drop=True)
+        # Reset date column
+        df['Date'] = df['Date'].dt.tz_localize(None)
+
+        # Set 'Date' column as index
+        df = df.set_index('Date', drop=True)
+
+        # Drop data from last day because it's not accrate until end of day
+        df = df.drop(df.index[-1])
+
+        return df
 
-    # Drop data from last day because it's not accrate until end of day
-    df = df.drop(df.index[-1])
-    
     # Create directory
     directory = f"{base_directory}/{source}/{asset_class}/Daily"
     os.makedirs(directory, exist_ok=True)
 
-    # Export to excel
-    if excel_export == True:
-        df.to_excel(f"{directory}/{ticker}.xlsx", sheet_name="data")
-    else:
-        pass
+    full_refresh = True
 
-    # Export to pickle
-    if pickle_export == True:
-        df.to_pickle(f"{directory}/{ticker}.pkl")
+    if incremental == True:
+        try:
+            # Attempt to read existing pickle data file
+            existing_df = pd.read_pickle(f"{directory}/{ticker}.pkl")
+            last_date = existing_df.index.max()
+            print(f"File found...updating the {ticker} data from {last_date.date()}.")
+
+            # Download the tail with an overlap to compare against the stored data
+            new_df = download(start=(last_date - timedelta(days=overlap_days)).strftime("%Y-%m-%d"))
+
+            merged_df = yf_merge_incremental(existing_df, new_df)
+
+            if merged_df is None:
+                print(f"History was revised for {ticker}...downloading the full history.")
+            else:
+                df = merged_df
+                full_refresh = False
+                print(f"Number of rows added during update: {len(df) - len(existing_df)}")
+
+        except FileNotFoundError:
+            print(f"File not found...downloading the full {ticker} history.")
     else:
         pass
 
+    if full_refresh == True:
+        df = download(start="1900-01-01")
+
+    # Export to pickle and queue the export to excel in the background
+    export_data(
+        df=df,
+        directory=directory,
+        file_name=f"{ticker}",
+        excel_export=excel_export,
+        pickle_export=pickle_export,
+    )
+
     # Output confirmation
     if output_confirmation == True:
         print(f"The first and last date of data for {ticker} is: ")
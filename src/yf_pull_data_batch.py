@@ -0,0 +1,201 @@
+import os
+import pandas as pd
+import yfinance as yf
+
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from export_data import export_data
+from IPython.display import display
+from settings import config
+from yf_merge_incremental import yf_merge_incremental
+
+# Get the environment variable for where data is stored
+DATA_DIR = config("DATA_DIR")
+
+def yf_pull_data_batch(
+    base_directory,
+    tickers: list,
+    source: str,
+    asset_class: str,
+    excel_export: bool,
+    pickle_export: bool,
+    output_confirmation: bool,
+    incremental: bool = False,
+    overlap_days: int = 10,
+    group_size: int = 50,
+    max_workers: int = 4,
+) -> dict:
+
+    """
+    Download daily price data for many tickers from Yahoo Finance and export it.
+
+    Tickers are downloaded together in grouped requests (tickers that need data
+    from the same start date share a request), the combined result is split per
+    ticker in memory, and the Pickle files are written in parallel (the Excel
+    files are written in the background by export_data). The output for each
+    ticker is the same as yf_pull_data.
+
+    Parameters:
+    -----------
+    base_directory
+        Root path to store downloaded data.
+    tickers : list
+        Ticker symbols to download.
+    source : str
+        Name of the data source (e.g., 'Yahoo').
+    asset_class : str
+        Asset class name (e.g., 'Equities').
+    excel_export : bool
+        If True, export data to Excel format.
+    pickle_export : bool
+        If True, export data to Pickle format.
+    output_confirmation : bool
+        If True, print confirmation message.
+    incremental : bool, optional
+        If True, only download data since the last date in the existing pickle
+        files and fall back to the full history for tickers whose history was
+        revised (default is False).
+    overlap_days : int, optional
+        Number of calendar days before the last stored date to download again and
+        compare with the stored data in incremental mode (default is 10).
+    group_size : int, optional
+        Maximum number of tickers per download request (default is 50).
+    max_workers : int, optional
+        Number of threads writing the Pickle files (default is 4).
+
+    Returns:
+    --------
+    dict
+        Dictionary of ticker to DataFrame containing the downloaded data.
+    """
+
+    # Create directory
+    directory = f"{base_directory}/{source}/{asset_class}/Daily"
+    os.makedirs(directory, exist_ok=True)
+
+    def download(group, start):
+        # Download data from YF for the group of tickers
+        data = yf.download(group, start=start, group_by="column")
+
+        frames = {}
+        for ticker in group:
+            if data.empty or ticker not in data.columns.get_level_values(1):
+                frames[ticker] = pd.DataFrame()
+                continue
+
+            # Select the columns for the ticker and drop the dates without data for it
+            df = data.xs(ticker, axis=1, level=1).dropna(how="all")
+
+            if df.empty:
+                frames[ticker] = df
+                continue
+
+            # Remove the "Price" header from the columns
+            df.columns.name = None
+
+            # Restore integer volume (upcast to float by the dates missing for other tickers)
+            if "Volume" in df.columns and df["Volume"].notna().all():
+                df["Volume"] = df["Volume"].astype("int64")
+
+            # Reset date index
+            df.index = df.index.tz_localize(None)
+            df.index.name = "Date"
+
+            # Drop data from last day because it's not accrate until end of day
+            df = df.drop(df.index[-1])
+
+            frames[ticker] = df
+
+        return frames
+
+    def download_groups(starts):
+        # Group tickers by start date, then into requests of at most group_size tickers
+        frames = {}
+        for start in sorted(set(starts.values())):
+            start_tickers = [ticker for ticker in starts if starts[ticker] == start]
+            for i in range(0, len(start_tickers), group_size):
+                frames.update(download(start_tickers[i:i + group_size], start))
+        return frames
+
+    results = {}
+    full_refresh = list(tickers)
+
+    if incremental == True:
+        existing = {}
+        for ticker in tickers:
+            try:
+                # Attempt to read existing pickle data file
+                existing[ticker] = pd.read_pickle(f"{directory}/{ticker}.pkl")
+            except FileNotFoundError:
+                print(f"File not found...downloading the full {ticker} history.")
+
+        # Download the tail with an overlap to compare against the stored data
+        starts = {
+            ticker: (existing_df.index.max() - timedelta(days=overlap_days)).strftime("%Y-%m-%d")
+            for ticker, existing_df in existing.items()
+        }
+        new_frames = download_groups(starts)
+
+        full_refresh = [ticker for ticker in tickers if ticker not in existing]
+        for ticker, existing_df in existing.items():
+            merged_df = yf_merge_incremental(existing_df, new_frames[ticker])
+            if merged_df is None:
+                print(f"History was revised for {ticker}...downloading the full history.")
+                full_refresh.append(ticker)
+            else:
+                results[ticker] = merged_df
+    else:
+        pass
+
+    if full_refresh:
+        results.update(download_groups({ticker: "1900-01-01" for ticker in full_refresh}))
+
+    # Keep the order of the tickers
+    results = {ticker: results[ticker] for ticker in tickers}
+
+    def export(ticker):
+        df = results[ticker]
+
+        if df.empty:
+            print(f"No data available for {ticker}.")
+            return
+
+        # Export to pickle and queue the export to excel in the background
+        export_data(
+            df=df,
+            directory=directory,
+            file_name=f"{ticker}",
+            excel_export=excel_export,
+            pickle_export=pickle_export,
+        )
+
+    # Write the files in parallel
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        list(executor.map(export, tickers))
+
+    # Output confirmation
+    if output_confirmation == True:
+        for ticker, df in results.items():
+            print(f"The first and last date of data for {ticker} is: ")
+            display(df[:1])
+            display(df[-1:])
+            print(f"Yahoo Finance data complete for {ticker}")
+            print(f"--------------------")
+    else:
+        pass
+
+    return results
+
+if __name__ == "__main__":
+
+    # Example usage
+    yf_pull_data_batch(
+        base_directory=DATA_DIR,
+        tickers=["SPY", "TLT", "GLD"],
+        source="Yahoo_Finance",
+        asset_class="Exchange_Traded_Funds",
+        excel_export=True,
+        pickle_export=True,
+        output_confirmation=True,
+        incremental=True,
+    )
@@ -1,6 +1,7 @@
 import os
 import pandas as pd
 
+from export_data import export_data, export_data_wait
 from IPython.display import display
 
 def yf_quarter_end(
@@ -42,6 +43,9 @@ def yf_quarter_end(
     # Set location from where to read existing excel file
     location = f"{base_directory}/{source}/{asset_class}/Daily/{ticker}.xlsx"
 
+    # Wait for any queued export of the daily excel file
+    export_data_wait()
+
     # Read data from excel
     df = pd.read_excel(location, sheet_name="data", engine="calamine")
 
@@ -58,17 +62,14 @@ def yf_quarter_end(
     directory = f"{base_directory}/{source}/{asset_class}/Quarter_End"
     os.makedirs(directory, exist_ok=True)
 
-    # Export to excel
-    if excel_export == True:
-        df_quarter_end.to_excel(f"{directory}/{ticker}_QE.xlsx", sheet_name="data")
-    else:
-        pass
-
-    # Export to pickle
-    if pickle_export == True:
-        df_quarter_end.to_pickle(f"{directory}/{ticker}_QE.pkl")
-    else:
-        pass
+    # Export to pickle and queue the export to excel in the background
+    export_data(
+        df=df_quarter_end,
+        directory=directory,
+        file_name=f"{ticker}_QE",
+        excel_export=excel_export,
+        pickle_export=pickle_export,
+    )
 
     # Output confirmation
     if output_confirmation == True: